@@ -21,7 +21,9 @@ from .core import (
     CheckpointLevel,
     CheckpointCategory,
     CheckpointMetadata,
+    CheckpointHandle,
     RollbackResult,
+    VerificationReport,
     MultiAgentCoordinator,
     AgentCheckpointState,
     ConflictInfo,
@@ -42,7 +44,9 @@ __all__ = [
     "CheckpointLevel",
     "CheckpointCategory",
     "CheckpointMetadata",
+    "CheckpointHandle",
     "RollbackResult",
+    "VerificationReport",
 
     # Multi-Agent Coordination
     "MultiAgentCoordinator",
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Advanced Checkpoint System command line
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Usage (from the .ai-tools directory, so the checkpoint package is importable):
+    python -m checkpoint verify [--full] [--workers N]
+"""
+
+import json
+import logging
+import sys
+from dataclasses import asdict
+
+from .core.checkpoint_engine import CheckpointEngine
+
+
+def main():
+    """CLI entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Advanced Checkpoint System v3.7.0')
+    parser.add_argument('command', choices=['verify'])
+    parser.add_argument('--config', help='Configuration file path')
+    parser.add_argument('--full', action='store_true', help='Re-verify already verified checkpoints and blobs')
+    parser.add_argument('--workers', type=int, help='Hashing threads (default: one per CPU)')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    engine = CheckpointEngine(config_path=args.config)
+
+    if args.command == 'verify':
+        report = engine.verify(full=args.full, workers=args.workers)
+        print(json.dumps(dict(asdict(report), ok=report.ok), indent=2))
+        sys.exit(0 if report.ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+"""
+Advanced Checkpoint System - Benchmarks
+
+Part of Claude Code Multi-Agent Framework v3.7.0
+
+Performance and concurrency benchmarks for the checkpoint engine.
+Run from the .ai-tools directory, e.g.:
+
+    python -m checkpoint.benchmarks.concurrency_benchmark
+"""
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Benchmark Suite
+
+Generates synthetic projects (1k, 10k and 100k files by default), edits a
+configurable share of files between checkpoints, and measures the latency of
+the main checkpoint operations plus bytes on disk. Results are written as a
+JSON baseline that later runs can be compared against.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Usage (from the .ai-tools directory):
+    python -m checkpoint.benchmarks.checkpoint_benchmark --sizes 1000 10000 --output baseline.json
+    python -m checkpoint.benchmarks.checkpoint_benchmark --sizes 1000 --compare baseline.json
+"""
+
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from ..core.checkpoint_engine import CheckpointEngine, CheckpointLevel
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Every 200th file is large (lockfile/fixture sized)
+LARGE_FILE_INTERVAL = 200
+LARGE_FILE_LINES = 4000
+
+# Latency metrics compared against a baseline (lower is better)
+LATENCY_METRICS = [
+    "create_initial_seconds",
+    "create_incremental_seconds",
+    "list_checkpoints_seconds",
+    "rollback_seconds",
+    "rollback_checkpoint_seconds",
+    "semantic_rewind_seconds",
+    "retention_cleanup_seconds"
+]
+
+
+def create_project(root: Path, file_count: int, rng: random.Random) -> List[Path]:
+    """Create a synthetic project of mostly small source files"""
+    files = []
+    for i in range(file_count):
+        path = root / f"pkg_{i % 50}" / f"module_{(i // 50) % 40}" / f"file_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = LARGE_FILE_LINES if i % LARGE_FILE_INTERVAL == 0 else rng.randint(20, 200)
+        path.write_text(_source_text(i, lines, rng))
+        files.append(path)
+    return files
+
+
+def _source_text(seed: int, lines: int, rng: random.Random) -> str:
+    body = [f"# synthetic module {seed}\n", "import os\n", "import sys\n\n"]
+    body.extend(f"value_{n} = {rng.randint(0, 10 ** 6)}  # line {n}\n" for n in range(lines))
+    return "".join(body)
+
+
+def apply_edits(files: List[Path], edit_ratio: float, rng: random.Random, step: int) -> int:
+    """
+    Edit a share of the project's files (one line appended per file).
+
+    Returns:
+        Number of files edited
+    """
+    count = max(1, int(len(files) * edit_ratio))
+    for path in rng.sample(files, count):
+        with open(path, 'a') as f:
+            f.write(f"edited_step_{step} = {rng.randint(0, 10 ** 6)}\n")
+    return count
+
+
+def directory_size(path: Path) -> int:
+    """Total size of all files below a directory"""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+def timed(operation: Callable) -> float:
+    """Run an operation and return its duration in seconds"""
+    started = time.perf_counter()
+    operation()
+    return time.perf_counter() - started
+
+
+def summarize(samples: List[float]) -> Dict:
+    """Median / p95 / min / max of latency samples"""
+    ordered = sorted(samples)
+    return {
+        "median": round(statistics.median(ordered), 6),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+        "min": round(ordered[0], 6),
+        "max": round(ordered[-1], 6),
+        "samples": len(ordered)
+    }
+
+
+def benchmark_size(file_count: int, edit_ratio: float, iterations: int, seed: int = 42) -> Dict:
+    """
+    Benchmark checkpoint operations on one synthetic project.
+
+    Returns:
+        Metrics for this project size
+    """
+    rng = random.Random(seed)
+    root = Path(tempfile.mkdtemp(prefix="checkpoint-bench-"))
+    try:
+        project = root / "project"
+        files = create_project(project, file_count, rng)
+
+        config = {
+            "enabled": True,
+            # Storage outside the project, so snapshots do not have to skip it
+            "storage": {"base_path": str(root / "storage")}
+        }
+        config_path = root / "checkpoint-config.json"
+        config_path.write_text(json.dumps(config))
+        engine = CheckpointEngine(config_path=str(config_path), framework_root=project)
+
+        results: Dict = {"files": file_count, "project_bytes": directory_size(project)}
+
+        checkpoint_ids = []
+
+        def create(label: str):
+            checkpoint_ids.append(engine.create_checkpoint(
+                level=CheckpointLevel.AGENT_EXECUTION,
+                label=label,
+                description=f"{label} of the benchmark run",
+                agent_type="benchmark-agent"
+            ))
+
+        results["create_initial_seconds"] = summarize([timed(lambda: create("benchmark checkpoint 0"))])
+
+        create_samples = []
+        edited = 0
+        for step in range(1, iterations + 1):
+            edited += apply_edits(files, edit_ratio, rng, step)
+            create_samples.append(timed(lambda: create(f"benchmark checkpoint {step}")))
+        results["create_incremental_seconds"] = summarize(create_samples)
+        results["files_edited_per_step"] = edited // iterations
+        engine.retention_gc.wait()
+
+        results["list_checkpoints_seconds"] = summarize(
+            [timed(lambda: engine.list_checkpoints(limit=50)) for _ in range(iterations)]
+        )
+
+        # The pre-rollback checkpoint is timed on its own, so rollback_seconds is the restore only
+        rollback_samples = []
+        rollback_checkpoint_samples = []
+        for step in range(iterations):
+            apply_edits(files, edit_ratio, rng, iterations + step + 1)
+            target = checkpoint_ids[-1 - step % 2]
+            rollback_checkpoint_samples.append(timed(lambda: engine.create_checkpoint(
+                level=CheckpointLevel.MANUAL,
+                label=f"before_rollback_to_{target[:8]}",
+                tags=["rollback", "auto"]
+            )))
+            rollback_samples.append(timed(
+                lambda: engine.rollback_to_checkpoint(target, create_rollback_checkpoint=False)
+            ))
+        results["rollback_seconds"] = summarize(rollback_samples)
+        results["rollback_checkpoint_seconds"] = summarize(rollback_checkpoint_samples)
+
+        def rewind(command: str):
+            # A failed lookup returns in microseconds, so it must not pass as a fast rewind
+            result = engine.semantic_rewind(command)
+            if not result.success:
+                raise RuntimeError(f"Semantic rewind '{command}' failed: {result.message}")
+
+        # A description query (search index) and a step count (timeline)
+        rewind_samples = []
+        for command in ("rewind to 'benchmark checkpoint 1'", "rewind 2 steps"):
+            apply_edits(files, edit_ratio, rng, 0)
+            rewind_samples.append(timed(lambda: rewind(command)))
+        results["semantic_rewind_seconds"] = summarize(rewind_samples)
+
+        engine.flush()
+        engine.retention_gc.wait()
+        results["storage_bytes"] = directory_size(root / "storage")
+        results["checkpoints"] = len(engine.checkpoint_index["checkpoints"])
+
+        # Retention cleanup of all but the two newest checkpoints per level
+        engine.retention_gc.levels_config = {level.value: {"retention_count": 2} for level in CheckpointLevel}
+        results["retention_cleanup_seconds"] = summarize([timed(engine.run_retention_gc)])
+        results["storage_bytes_after_cleanup"] = directory_size(root / "storage")
+
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def run_benchmark(sizes: List[int], edit_ratio: float = 0.01, iterations: int = 5) -> Dict:
+    """Run the benchmark for each project size"""
+    return {
+        "version": 1,
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "edit_ratio": edit_ratio,
+        "iterations": iterations,
+        "results": {
+            str(size): benchmark_size(size, edit_ratio, iterations) for size in sizes
+        }
+    }
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.2) -> List[Dict]:
+    """
+    Compare median latencies and bytes on disk against a baseline.
+
+    Returns:
+        One row per metric present in both runs, with its relative change
+        and whether it regressed by more than ``threshold``
+    """
+    rows = []
+    for size, metrics in current["results"].items():
+        base_metrics = baseline.get("results", {}).get(size)
+        if not base_metrics:
+            continue
+        for metric in LATENCY_METRICS + ["storage_bytes"]:
+            if metric not in metrics or metric not in base_metrics:
+                continue
+            value = metrics[metric]
+            base_value = base_metrics[metric]
+            if isinstance(value, dict):
+                value, base_value = value["median"], base_value["median"]
+            change = (value - base_value) / base_value if base_value else 0.0
+            rows.append({
+                "files": int(size),
+                "metric": metric,
+                "baseline": base_value,
+                "current": value,
+                "change": round(change, 4),
+                "regressed": change > threshold
+            })
+    return rows
+
+
+def main():
+    """CLI entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Checkpoint Benchmark Suite')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Project sizes (files)')
+    parser.add_argument('--edit-ratio', type=float, default=0.01, help='Share of files edited per step')
+    parser.add_argument('--iterations', type=int, default=5, help='Samples per operation')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare against a baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Relative slowdown counted as regression')
+
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    results = run_benchmark(args.sizes, args.edit_ratio, args.iterations)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        rows = compare_results(baseline, results, args.threshold)
+        for row in rows:
+            marker = "REGRESSION" if row["regressed"] else ""
+            print(
+                f"{row['files']:>7} {row['metric']:<28} {row['baseline']:>14} -> {row['current']:<14} "
+                f"{row['change']:+.1%} {marker}"
+            )
+        if any(row["regressed"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Concurrency Benchmark
+
+Measures sustained checkpoint creations per second with several writer
+processes sharing one checkpoint storage, and verifies that no index
+entries or blobs are lost.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Usage (from the .ai-tools directory):
+    python -m checkpoint.benchmarks.concurrency_benchmark --processes 8 --checkpoints 25
+"""
+
+import json
+import logging
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from ..core.checkpoint_engine import CheckpointEngine, CheckpointLevel
+
+
+def create_project(root: Path, file_count: int, writers: int) -> Path:
+    """Create a synthetic project and benchmark configuration"""
+    for i in range(file_count):
+        path = root / "src" / f"module_{i % 20}" / f"file_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# file {i}\n" + "value = 1\n" * 50)
+
+    for writer in range(writers):
+        (root / f"writer_{writer}.txt").write_text("0\n")
+
+    config = {
+        "enabled": True,
+        "storage": {
+            "base_path": str(root / ".checkpoint-storage"),
+            "index_compaction_threshold": 50,
+            "background_gc": False
+        },
+        # Never evict during the benchmark, so every created entry must survive
+        "checkpointLevels": {
+            level.value: {"retention_count": 1_000_000} for level in CheckpointLevel
+        }
+    }
+    config_path = root / "checkpoint-config.json"
+    config_path.write_text(json.dumps(config))
+    return config_path
+
+
+def writer_process(writer: int, root: str, config_path: str, checkpoints: int, start_barrier, results):
+    """Create checkpoints from one process, each after a small file change"""
+    logging.disable(logging.INFO)
+    engine = CheckpointEngine(config_path=config_path, framework_root=Path(root))
+    marker = Path(root) / f"writer_{writer}.txt"
+
+    start_barrier.wait()
+    created = []
+    started = time.perf_counter()
+    for i in range(checkpoints):
+        marker.write_text(f"{i}\n")
+        checkpoint_id = engine.create_checkpoint(
+            level=CheckpointLevel.AGENT_EXECUTION,
+            label=f"writer_{writer}_step_{i}",
+            agent_type=f"writer-{writer}"
+        )
+        if checkpoint_id:
+            created.append(checkpoint_id)
+
+    results.put({
+        "writer": writer,
+        "created": created,
+        "elapsed_seconds": time.perf_counter() - started
+    })
+
+
+def run_benchmark(processes: int = 8, checkpoints: int = 25, file_count: int = 500) -> Dict:
+    """
+    Run the concurrency benchmark.
+
+    Returns:
+        Summary with throughput and lost entry/blob counts
+    """
+    root = Path(tempfile.mkdtemp(prefix="checkpoint-bench-"))
+    try:
+        config_path = create_project(root, file_count, processes)
+
+        # Initialize storage once, so workers race on checkpoints rather than setup
+        CheckpointEngine(config_path=str(config_path), framework_root=root)
+
+        context = multiprocessing.get_context("spawn")
+        start_barrier = context.Barrier(processes + 1)
+        results = context.Queue()
+        workers = [
+            context.Process(
+                target=writer_process,
+                args=(writer, str(root), str(config_path), checkpoints, start_barrier, results)
+            )
+            for writer in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        start_barrier.wait()
+        started = time.perf_counter()
+        reports: List[Dict] = [results.get() for _ in workers]
+        wall_seconds = time.perf_counter() - started
+        for worker in workers:
+            worker.join()
+
+        created = [checkpoint_id for report in reports for checkpoint_id in report["created"]]
+
+        # Verify from a fresh process view
+        engine = CheckpointEngine(config_path=str(config_path), framework_root=root)
+        indexed = engine.checkpoint_index["checkpoints"]
+        lost_entries = [checkpoint_id for checkpoint_id in created if checkpoint_id not in indexed]
+
+        missing_blobs = 0
+        for checkpoint_id in created:
+            manifest = engine._load_manifest(checkpoint_id) or {}
+            missing_blobs += sum(
+                1 for blob_hash in engine._manifest_blob_hashes(manifest)
+                if not engine.blob_store.has(blob_hash)
+            )
+
+        return {
+            "processes": processes,
+            "checkpoints_per_process": checkpoints,
+            "files": file_count,
+            "checkpoints_requested": processes * checkpoints,
+            "checkpoints_created": len(created),
+            "wall_seconds": round(wall_seconds, 3),
+            "checkpoints_per_second": round(len(created) / wall_seconds, 1) if wall_seconds else 0.0,
+            "lost_entries": len(lost_entries),
+            "missing_blobs": missing_blobs
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    """CLI entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Checkpoint Concurrency Benchmark')
+    parser.add_argument('--processes', type=int, default=8, help='Writer processes')
+    parser.add_argument('--checkpoints', type=int, default=25, help='Checkpoints per process')
+    parser.add_argument('--files', type=int, default=500, help='Files in the synthetic project')
+
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    summary = run_benchmark(args.processes, args.checkpoints, args.files)
+    print(json.dumps(summary, indent=2))
+
+    if summary["lost_entries"] or summary["missing_blobs"] or summary["checkpoints_created"] != summary["checkpoints_requested"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,12 @@ from .checkpoint_engine import (
     CheckpointLevel,
     CheckpointCategory,
     CheckpointMetadata,
+    CheckpointHandle,
     RollbackResult
 )
 
+from .storage_verifier import VerificationReport
+
 from .multi_agent_coordinator import (
     MultiAgentCoordinator,
     AgentCheckpointState,
@@ -33,7 +36,9 @@ __all__ = [
     "CheckpointLevel",
     "CheckpointCategory",
     "CheckpointMetadata",
+    "CheckpointHandle",
     "RollbackResult",
+    "VerificationReport",
 
     # Multi-Agent Coordinator
     "MultiAgentCoordinator",
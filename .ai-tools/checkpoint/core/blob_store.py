@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Blob Store for Advanced Checkpoint System
+
+Stores checkpoint file contents once per unique content hash.
+Checkpoints only keep a small manifest of path -> blob hash.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- SHA-256 content addressing with automatic deduplication
+- Gzip-compressed objects fanned out by hash prefix
+- Atomic object writes (temp file + rename)
+- Streaming reads for restore
+- Chunk-level deduplication for large files (content-defined chunks)
+- Zero-copy raw objects (reflink clone or hardlink) for the link backend
+- Recompression of cold objects at maximum level with a preset dictionary
+"""
+
+import errno
+import gzip
+import hashlib
+import io
+import logging
+import mmap
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .chunker import iter_chunk_boundaries
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Read buffer for hashing and compression
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Linux ioctl sharing all extents of one file with another (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Suffix of uncompressed (cloned or hardlinked) objects
+RAW_SUFFIX = ".raw"
+
+# Cold objects: COLD_MAGIC + dictionary ID + zlib stream compressed with that preset dictionary
+COLD_SUFFIX = ".zd"
+COLD_MAGIC = b"CPZD1"
+DICTIONARY_ID_LENGTH = 16
+
+# Errors meaning "this filesystem cannot clone/link here", not real failures
+_UNSUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.EPERM, errno.EMLINK}
+
+
+def clone_file(src: Path, dst: Path) -> bool:
+    """
+    Create ``dst`` as a copy-on-write clone of ``src``.
+
+    Returns:
+        True if cloned, False if the filesystem does not support cloning
+    """
+    if not FCNTL_AVAILABLE:
+        return False
+
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            return True
+        except OSError as e:
+            if e.errno in _UNSUPPORTED_ERRNOS:
+                return False
+            raise
+
+
+class BlobStore:
+    """
+    Deduplicating object store for checkpoint file contents.
+
+    Objects live under ``<objects_dir>/<hash[:2]>/<hash[2:]>`` and are
+    immutable once written, so identical content is stored exactly once
+    no matter how many checkpoints reference it.
+    """
+
+    def __init__(self, objects_dir: Path, compression_level: int = 1):
+        """
+        Initialize blob store.
+
+        Args:
+            objects_dir: Directory holding blob objects
+            compression_level: Gzip compression level for new objects (favor speed;
+                cold objects are recompressed later)
+        """
+        self.objects_dir = Path(objects_dir)
+        self.compression_level = compression_level
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+        # Preset dictionaries of cold objects (next to the objects directory)
+        self.dictionaries_dir = self.objects_dir.parent / "dictionaries"
+        self._dictionaries: Dict[str, bytes] = {}
+
+        # Learned on first failure, so unsupported filesystems are not retried per file
+        self.reflink_supported = True
+        self.hardlink_supported = True
+
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """Compute content hash of a file"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(READ_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        """Compute content hash of in-memory data"""
+        return hashlib.sha256(data).hexdigest()
+
+    def object_path(self, blob_hash: str) -> Path:
+        """Get storage path for a blob hash"""
+        return self.objects_dir / blob_hash[:2] / blob_hash[2:]
+
+    def raw_object_path(self, blob_hash: str) -> Path:
+        """Get storage path of an uncompressed (cloned or hardlinked) blob"""
+        return self.objects_dir / blob_hash[:2] / (blob_hash[2:] + RAW_SUFFIX)
+
+    def cold_object_path(self, blob_hash: str) -> Path:
+        """Get storage path of a recompressed (cold) blob"""
+        return self.objects_dir / blob_hash[:2] / (blob_hash[2:] + COLD_SUFFIX)
+
+    def _object_paths(self, blob_hash: str) -> Tuple[Path, Path, Path]:
+        return self.object_path(blob_hash), self.cold_object_path(blob_hash), self.raw_object_path(blob_hash)
+
+    def has(self, blob_hash: str) -> bool:
+        """Check whether a blob is stored (hot, cold or raw)"""
+        return any(path.exists() for path in self._object_paths(blob_hash))
+
+    def put_file(self, path: Path, blob_hash: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Store a file's content.
+
+        Args:
+            path: File to store
+            blob_hash: Content hash if already known (skips rehashing)
+
+        Returns:
+            (blob_hash, bytes_written) - bytes_written is 0 for deduplicated content
+        """
+        if blob_hash is None:
+            blob_hash = self.hash_file(path)
+
+        if self.has(blob_hash):
+            return blob_hash, 0
+
+        with open(path, 'rb') as src:
+            written = self._write_object(self.object_path(blob_hash), src)
+        return blob_hash, written
+
+    def link_file(self, path: Path, blob_hash: str, allow_hardlink: bool = False) -> Optional[int]:
+        """
+        Store a file's content without reading it, as a reflink clone or
+        (opt-in) a hardlink.
+
+        A hardlinked object shares the working tree file's inode, so in-place
+        writes to that file would alter the stored checkpoint; files replaced
+        via rename (as editors and git do) are safe.
+
+        Args:
+            path: File to store
+            blob_hash: Content hash of the file
+            allow_hardlink: Fall back to a hardlink where cloning is unsupported
+
+        Returns:
+            Bytes newly allocated (0 for clones, links and deduplicated content),
+            or None if neither cloning nor linking is possible here
+        """
+        if self.has(blob_hash):
+            return 0
+
+        raw_path = self.raw_object_path(blob_hash)
+        raw_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.reflink_supported:
+            fd, tmp_name = tempfile.mkstemp(dir=raw_path.parent, prefix=".tmp_")
+            os.close(fd)
+            try:
+                if clone_file(path, Path(tmp_name)):
+                    os.replace(tmp_name, raw_path)
+                    return 0
+                self.reflink_supported = False
+                logger.info("Reflinks unsupported on checkpoint storage filesystem")
+            finally:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+
+        if allow_hardlink and self.hardlink_supported:
+            try:
+                os.link(path, raw_path)
+                return 0
+            except FileExistsError:
+                return 0
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                self.hardlink_supported = False
+                logger.info("Hardlinks unsupported between project and checkpoint storage")
+
+        return None
+
+    def clone_blob(self, blob_hash: str, dst: Path) -> bool:
+        """
+        Materialize a raw blob at ``dst`` as a reflink clone.
+
+        Returns:
+            True if cloned, False if the blob is compressed or cloning is unsupported
+        """
+        raw_path = self.raw_object_path(blob_hash)
+        if not self.reflink_supported or not raw_path.exists():
+            return False
+        return clone_file(raw_path, dst)
+
+    def put_bytes(self, data: bytes, blob_hash: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Store in-memory content.
+
+        Args:
+            data: Content to store
+            blob_hash: Content hash if already known (skips rehashing)
+
+        Returns:
+            (blob_hash, bytes_written) - bytes_written is 0 for deduplicated content
+        """
+        if blob_hash is None:
+            blob_hash = self.hash_bytes(data)
+        if self.has(blob_hash):
+            return blob_hash, 0
+
+        written = self._write_object(self.object_path(blob_hash), io.BytesIO(data))
+        return blob_hash, written
+
+    def put_file_chunked(self, path: Path) -> Tuple[str, List[str], int]:
+        """
+        Store a large file as content-defined chunks.
+
+        Each chunk is its own blob, so after a local edit only the chunks
+        around the edit are new.
+
+        Returns:
+            (file_hash, chunk_hashes, bytes_written) - file_hash covers the whole content;
+            chunk_hashes is empty for an empty file, which is stored as a plain blob
+        """
+        chunk_hashes = []
+        written = 0
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap cannot map an empty file
+                file_hash, written = self.put_bytes(b"")
+                return file_hash, chunk_hashes, written
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                file_hash = hashlib.sha256(data).hexdigest()
+                for start, end in iter_chunk_boundaries(data):
+                    chunk_hash, chunk_written = self.put_bytes(data[start:end])
+                    chunk_hashes.append(chunk_hash)
+                    written += chunk_written
+        return file_hash, chunk_hashes, written
+
+    def _write_object(self, object_path: Path, src: BinaryIO) -> int:
+        """Compress a stream into a new object atomically"""
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=object_path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, 'wb') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=self.compression_level, mtime=0) as gz:
+                    for block in iter(lambda: src.read(READ_BLOCK_SIZE), b""):
+                        gz.write(block)
+            os.replace(tmp_name, object_path)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        return object_path.stat().st_size
+
+    def open_blob(self, blob_hash: str) -> BinaryIO:
+        """Open a blob for streaming reads"""
+        try:
+            return open(self.raw_object_path(blob_hash), 'rb')
+        except FileNotFoundError:
+            pass
+        try:
+            return gzip.open(self.object_path(blob_hash), 'rb')
+        except FileNotFoundError:
+            # Recompressed since (or before) this lookup
+            return self._open_cold(self.cold_object_path(blob_hash))
+
+    def _open_cold(self, path: Path) -> BinaryIO:
+        """Open a cold object, checking its header"""
+        f = open(path, 'rb')
+        try:
+            header = f.read(len(COLD_MAGIC) + DICTIONARY_ID_LENGTH)
+            if not header.startswith(COLD_MAGIC):
+                raise ValueError(f"Not a cold checkpoint object: {path}")
+            dictionary = self.load_dictionary(header[len(COLD_MAGIC):].decode("ascii"))
+        except Exception:
+            f.close()
+            raise
+        return io.BufferedReader(ColdBlobReader(f, dictionary), READ_BLOCK_SIZE)
+
+    def save_dictionary(self, dictionary: bytes) -> str:
+        """
+        Store a preset dictionary (immutable, content-addressed).
+
+        Returns:
+            Dictionary ID
+        """
+        dictionary_id = hashlib.sha256(dictionary).hexdigest()[:DICTIONARY_ID_LENGTH]
+        path = self.dictionaries_dir / f"{dictionary_id}.zdict"
+        if not path.exists():
+            self.dictionaries_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.dictionaries_dir, prefix=".tmp_")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(dictionary)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, path)
+        self._dictionaries[dictionary_id] = dictionary
+        return dictionary_id
+
+    def load_dictionary(self, dictionary_id: str) -> bytes:
+        """Load a preset dictionary by ID"""
+        dictionary = self._dictionaries.get(dictionary_id)
+        if dictionary is None:
+            with open(self.dictionaries_dir / f"{dictionary_id}.zdict", 'rb') as f:
+                dictionary = f.read()
+            self._dictionaries[dictionary_id] = dictionary
+        return dictionary
+
+    def recompress(self, blob_hash: str, dictionary_id: str, level: int = 9) -> int:
+        """
+        Rewrite a hot (gzip) object as a cold object.
+
+        The cold object is renamed into place before the hot one is removed,
+        so concurrent readers always find one of them.
+
+        Returns:
+            Bytes saved (negative if the cold object is larger)
+        """
+        hot_path = self.object_path(blob_hash)
+        cold_path = self.cold_object_path(blob_hash)
+        dictionary = self.load_dictionary(dictionary_id)
+
+        fd, tmp_name = tempfile.mkstemp(dir=hot_path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, 'wb') as dst, gzip.open(hot_path, 'rb') as src:
+                dst.write(COLD_MAGIC + dictionary_id.encode("ascii"))
+                compressor = zlib.compressobj(level, zdict=dictionary)
+                for block in iter(lambda: src.read(READ_BLOCK_SIZE), b""):
+                    dst.write(compressor.compress(block))
+                dst.write(compressor.flush())
+            os.replace(tmp_name, cold_path)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        hot_size = hot_path.stat().st_size
+        hot_path.unlink()
+        return hot_size - cold_path.stat().st_size
+
+    def read_blob(self, blob_hash: str) -> bytes:
+        """Read a blob fully into memory"""
+        with self.open_blob(blob_hash) as f:
+            return f.read()
+
+    def open_chunks(self, chunk_hashes: List[str]) -> BinaryIO:
+        """Open a chunked file for streaming reads (chunks are concatenated)"""
+        return io.BufferedReader(ChunkedBlobReader(self, chunk_hashes), READ_BLOCK_SIZE)
+
+    def delete(self, blob_hash: str) -> int:
+        """
+        Delete a blob.
+
+        Returns:
+            Number of bytes freed
+        """
+        freed = 0
+        for object_path in self._object_paths(blob_hash):
+            try:
+                size = object_path.stat().st_size
+                object_path.unlink()
+                freed += size
+            except FileNotFoundError:
+                pass
+        return freed
+
+    def iter_hashes(self) -> Iterator[str]:
+        """Iterate over all stored blob hashes"""
+        for blob_hash, _, _ in self.iter_objects():
+            yield blob_hash
+
+    def iter_objects(self) -> Iterator[Tuple[str, int, float]]:
+        """
+        Iterate over all stored objects.
+
+        Yields:
+            (blob_hash, size_on_disk, mtime)
+        """
+        for blob_hash, _, size, mtime in self.iter_object_files():
+            yield blob_hash, size, mtime
+
+    def iter_object_files(self) -> Iterator[Tuple[str, str, int, float]]:
+        """
+        Iterate over all stored object files.
+
+        Yields:
+            (blob_hash, suffix, size_on_disk, mtime) - suffix is "" for hot objects,
+            COLD_SUFFIX or RAW_SUFFIX otherwise
+        """
+        if not self.objects_dir.exists():
+            return
+        with os.scandir(self.objects_dir) as prefix_entries:
+            for prefix_entry in prefix_entries:
+                if not prefix_entry.is_dir() or len(prefix_entry.name) != 2:
+                    continue
+                with os.scandir(prefix_entry.path) as object_entries:
+                    for object_entry in object_entries:
+                        if object_entry.name.startswith(".tmp_"):
+                            continue
+                        st = object_entry.stat()
+                        name, suffix = object_entry.name, ""
+                        for object_suffix in (RAW_SUFFIX, COLD_SUFFIX):
+                            if name.endswith(object_suffix):
+                                name, suffix = name[:-len(object_suffix)], object_suffix
+                        yield prefix_entry.name + name, suffix, st.st_size, st.st_mtime
+
+
+class ChunkedBlobReader(io.RawIOBase):
+    """
+    Raw stream over a sequence of chunk blobs.
+
+    Opens one chunk at a time, so reassembling a large file needs no more
+    memory than a single read buffer.
+    """
+
+    def __init__(self, blob_store: BlobStore, chunk_hashes: List[str]):
+        self.blob_store = blob_store
+        self._chunk_hashes = iter(chunk_hashes)
+        self._current: Optional[BinaryIO] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while True:
+            if self._current is None:
+                chunk_hash = next(self._chunk_hashes, None)
+                if chunk_hash is None:
+                    return 0
+                self._current = self.blob_store.open_blob(chunk_hash)
+
+            read = self._current.readinto(buffer)
+            if read:
+                return read
+            self._current.close()
+            self._current = None
+
+    def close(self):
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        super().close()
+
+
+class ColdBlobReader(io.RawIOBase):
+    """
+    Raw stream decompressing a cold object (past its header).
+    """
+
+    def __init__(self, raw: BinaryIO, dictionary: bytes):
+        self._raw = raw
+        self._decompressor = zlib.decompressobj(zdict=dictionary)
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            if self._eof:
+                return 0
+            data = self._decompressor.unconsumed_tail or self._raw.read(READ_BLOCK_SIZE)
+            if data:
+                self._buffer = memoryview(self._decompressor.decompress(data, READ_BLOCK_SIZE))
+            else:
+                self._buffer = memoryview(self._decompressor.flush())
+                self._eof = True
+
+        read = min(len(buffer), len(self._buffer))
+        buffer[:read] = self._buffer[:read]
+        self._buffer = self._buffer[read:]
+        return read
+
+    def close(self):
+        self._raw.close()
+        super().close()
@@ -22,13 +22,36 @@ import os
 import shutil
 import gzip
 import hashlib
-from dataclasses import dataclass, asdict, field
+import fnmatch
+import stat
+import copy
+import difflib
+import io
+from dataclasses import MISSING, dataclass, asdict, field, fields
 from datetime import datetime
-from typing import Dict, List, Optional, Set, Tuple
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from pathlib import Path
 from enum import Enum
 import logging
 import subprocess
+import tempfile
+import threading
+from bisect import bisect_left, insort
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .blob_store import BlobStore
+from .git_backend import GitSnapshotBackend
+from .checkpoint_writer import CheckpointHandle, CheckpointWriter
+from .stat_cache import StatCache
+from .storage_verifier import StorageVerifier, VerificationReport
+from .file_lock import FileLock
+from .journal import AppendOnlyJournal, atomic_write_bytes, atomic_write_json
+from .git_state import GitStateReader
+from .memory_tier import MemoryTier
+from .metadata_cache import MetadataCache
+from .pack_store import PackStore
+from .retention_gc import RetentionGC
+from .search_index import SearchIndex
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -93,6 +116,50 @@ class CheckpointMetadata:
     searchable_text: str = ""
 
 
+# Fields kept in the checkpoint index; everything else is loaded on demand
+INDEX_SUMMARY_FIELDS = ("timestamp", "level", "category", "label", "tags", "agent_type", "searchable_text")
+
+
+class LazyCheckpointMetadata(CheckpointMetadata):
+    """
+    Checkpoint metadata materialized from the index summary.
+
+    Detail fields (agent_state, changed_files, git_status, ...) are read from
+    the metadata file on first access.
+    """
+
+    def __init__(self, checkpoint_id: str, summary: Dict, loader: Callable[[str], Optional[Dict]]):
+        self.checkpoint_id = checkpoint_id
+        for name in INDEX_SUMMARY_FIELDS:
+            value = summary.get(name)
+            self.__dict__[name] = list(value) if isinstance(value, list) else value
+        self._loader = loader
+
+    def __getattribute__(self, name):
+        if name in _LAZY_DETAIL_FIELDS and name not in object.__getattribute__(self, "__dict__"):
+            object.__getattribute__(self, "_load_details")()
+        return object.__getattribute__(self, name)
+
+    def _load_details(self):
+        """Populate detail fields from the metadata file"""
+        data = self._loader(self.checkpoint_id) or {}
+        for name, default in _LAZY_DETAIL_FIELDS.items():
+            if name in self.__dict__:
+                continue
+            if name in data:
+                self.__dict__[name] = copy.deepcopy(data[name])
+            else:
+                self.__dict__[name] = default()
+
+
+# Detail field name -> default value factory
+_LAZY_DETAIL_FIELDS = {
+    f.name: (f.default_factory if f.default_factory is not MISSING else (lambda value=f.default: value))
+    for f in fields(CheckpointMetadata)
+    if f.name != "checkpoint_id" and f.name not in INDEX_SUMMARY_FIELDS
+}
+
+
 @dataclass
 class RollbackResult:
     """Result of rollback operation"""
@@ -104,6 +171,34 @@ class RollbackResult:
     warnings: List[str]
     rollback_checkpoint_created: Optional[str] = None
     message: str = ""
+    changed_files: List[str] = field(default_factory=list)
+
+
+@dataclass
+class CheckpointDiff:
+    """File-level differences between two checkpoints (None = working tree)"""
+    source_id: Optional[str]
+    target_id: Optional[str]
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+
+    # Manifest entries of changed paths: path -> (source entry, target entry)
+    entries: Dict[str, Tuple[Optional[Dict], Optional[Dict]]] = field(default_factory=dict, repr=False)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+@dataclass
+class PendingCheckpoint:
+    """Checkpoint captured in memory but not yet written"""
+    metadata: CheckpointMetadata
+    level: CheckpointLevel
+    include_files: bool = True
+    files_data: Optional[bytes] = None
+    holds_gc_lock: bool = False
 
 
 class CheckpointEngine:
@@ -126,7 +221,8 @@ class CheckpointEngine:
         self.config = self._load_config()
 
         # Storage paths
-        self.storage_base = Path(self.config["storage"]["base_path"])
+        # A relative base_path is relative to the framework root, not the working directory
+        self.storage_base = self.framework_root / self.config["storage"]["base_path"]
         self.checkpoints_dir = self.storage_base / "checkpoints"
         self.metadata_dir = self.storage_base / "metadata"
         self.index_file = self.storage_base / "checkpoint_index.json"
@@ -134,8 +230,64 @@ class CheckpointEngine:
         # Ensure directories exist
         self._ensure_storage_structure()
 
-        # Load checkpoint index
-        self.checkpoint_index = self._load_checkpoint_index()
+        # Index mutations may come from the background GC; snapshots and
+        # blob sweeps must not interleave
+        self._index_lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+
+        # Cross-process locks: index mutations are exclusive; captures hold the
+        # GC lock shared until committed, blob sweeps hold it exclusively
+        self._storage_lock = FileLock(self.storage_base / ".index.lock")
+        self._gc_lock = FileLock(self.storage_base / ".gc.lock")
+
+        # Index changes are journaled; the JSON snapshot is only rewritten on compaction
+        self.index_journal = AppendOnlyJournal(self.storage_base / "checkpoint_index.journal")
+
+        # Content-addressed file store (shared by all checkpoints)
+        self.blob_store = BlobStore(
+            self.checkpoints_dir / "objects",
+            compression_level=self.config["storage"].get("compression_level", 1)
+        )
+        # storage.backend "git": snapshots are trees in the project's git object database
+        self.git_backend = GitSnapshotBackend(self.framework_root, self.storage_base)
+        self.git_snapshots = False
+        if self.config["storage"].get("backend", "blob") == "git":
+            self.git_snapshots = GitSnapshotBackend.is_available(self.framework_root)
+            if not self.git_snapshots:
+                logger.warning("storage.backend 'git' requires a git working tree - using the blob store")
+        self._last_manifest: Optional[Dict] = None
+        self._last_manifest_id: Optional[str] = None
+        # Manifests captured but not yet indexed (protected from blob sweeps)
+        self._pending_manifests: Dict[str, Dict] = {}
+
+        # Stat index for incremental snapshots (next to checkpoint_index.json)
+        self.stat_cache = StatCache(self.storage_base / "stat_index.json")
+
+        # Cold metadata and manifests are consolidated into packfiles by the GC
+        self.pack_store = PackStore(self.storage_base / "packs")
+
+        # Parsed metadata LRU (bounded by storage.metadata_cache_mb)
+        cache_mb = self.config["storage"].get("metadata_cache_mb", 16)
+        self.metadata_cache = MetadataCache(self._read_metadata_bytes, int(cache_mb * 1024 * 1024))
+
+        # Changed-file contents of recent checkpoints, for rollbacks without disk reads
+        storage_config = self.config["storage"]
+        self.memory_tier = MemoryTier(
+            int(storage_config.get("memory_tier_mb", 64) * 1024 * 1024),
+            storage_config.get("memory_tier_checkpoints", 20),
+            int(storage_config.get("memory_tier_min_available_mb", 256) * 1024 * 1024)
+        )
+
+        # Git state capture (one subprocess per cache miss)
+        git_cache_seconds = self.config.get("integrations", {}).get("git", {}).get("state_cache_seconds", 2.0)
+        self.git_state = GitStateReader(self.framework_root, cache_seconds=git_cache_seconds)
+
+        # Load checkpoint index (and build in-memory lookup structures)
+        with self._storage_lock.exclusive():
+            self._reload_index()
+
+        self.retention_gc = RetentionGC(self)
+        self.checkpoint_writer = CheckpointWriter(self)
 
         logger.info(f"Checkpoint Engine initialized (storage: {self.storage_base})")
 
@@ -163,7 +315,25 @@ class CheckpointEngine:
             "storage": {
                 "base_path": ".ai-tools/checkpoint/storage",
                 "compression": "gzip",
-                "max_checkpoint_size_mb": 100
+                "compression_level": 1,
+                "cold_compression_level": 9,
+                "recompress_after_hours": 24,
+                "max_checkpoint_size_mb": 100,
+                "exclude_patterns": [],
+                "restore_workers": 8,
+                "index_compaction_threshold": 1000,
+                "background_gc": True,
+                "gc_grace_seconds": 3600,
+                "metadata_cache_mb": 16,
+                "chunking_threshold_mb": 1,
+                "backend": "blob",
+                "memory_tier_mb": 64,
+                "memory_tier_checkpoints": 20,
+                "memory_tier_min_available_mb": 256,
+                "allow_hardlinks": False,
+                "pack_after_hours": 24,
+                "pack_min_checkpoints": 50,
+                "pack_max_mb": 256
             },
             "checkpointLevels": {
                 "manual": {
@@ -179,29 +349,193 @@ class CheckpointEngine:
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
 
     def _load_checkpoint_index(self) -> Dict:
-        """Load checkpoint index"""
+        """Load checkpoint index (snapshot plus journaled changes)"""
+        index = None
         if self.index_file.exists():
             try:
                 with open(self.index_file, 'r') as f:
-                    return json.load(f)
+                    index = json.load(f)
             except Exception as e:
                 logger.warning(f"Error loading checkpoint index: {e}")
 
-        return {
-            "version": "3.7.0",
-            "checkpoints": {},
-            "categories": {},
-            "tags": {},
-            "timeline": []
-        }
+        if index is None:
+            index = {
+                "version": "3.7.0",
+                "checkpoints": {},
+                "categories": {},
+                "agents": {},
+                "tags": {},
+                "timeline": []
+            }
+        index.setdefault("agents", {})
+
+        for record in self.index_journal.replay():
+            self._apply_index_record(index, record)
+
+        return index
 
     def _save_checkpoint_index(self):
-        """Save checkpoint index"""
+        """Compact the index: write a fresh snapshot atomically and reset the journal"""
+        with self._index_lock, self._storage_lock.exclusive():
+            try:
+                self._refresh_index_locked()
+                atomic_write_json(self.index_file, self.checkpoint_index)
+                self.index_journal.truncate()
+                self._index_snapshot_identity = self._snapshot_identity()
+            except Exception as e:
+                logger.error(f"Error saving checkpoint index: {e}")
+
+    def _snapshot_identity(self) -> Optional[Tuple[int, int, int]]:
+        """Identity of the index snapshot file (changes when any process compacts)"""
         try:
-            with open(self.index_file, 'w') as f:
-                json.dump(self.checkpoint_index, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving checkpoint index: {e}")
+            st = self.index_file.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _reload_index(self):
+        """Load the index from disk and rebuild lookup structures (storage lock held)"""
+        self._index_snapshot_identity = self._snapshot_identity()
+        self.checkpoint_index = self._load_checkpoint_index()
+
+        self.search_index = SearchIndex()
+        self._time_index: List[Tuple[float, str]] = []
+        self._time_by_id: Dict[str, float] = {}
+        self._build_secondary_indexes()
+
+    def refresh_index(self):
+        """Pick up index changes made by other processes"""
+        with self._index_lock, self._storage_lock.exclusive():
+            self._refresh_index_locked()
+
+    def _refresh_index_locked(self):
+        """Apply other processes' index changes (index and storage locks held)"""
+        if self._snapshot_identity() != self._index_snapshot_identity:
+            # Another process compacted the journal into a new snapshot
+            self._reload_index()
+            self.metadata_cache.clear()
+            return
+
+        if self.index_journal.size() > self.index_journal.offset:
+            for record in self.index_journal.replay(self.index_journal.offset):
+                self._apply_index_record(self.checkpoint_index, record)
+                self._update_secondary_indexes(record)
+
+    def _build_secondary_indexes(self):
+        """Build lookup structures from index entries"""
+        agents: Dict[str, List[Tuple[str, str]]] = {}
+
+        for cp_id, cp_data in self.checkpoint_index["checkpoints"].items():
+            if "searchable_text" not in cp_data or "agent_type" not in cp_data:
+                # Entries written before these indexes existed: backfill once from metadata
+                try:
+                    data = json.loads(self._read_metadata_bytes(cp_id))
+                except Exception:
+                    data = {"searchable_text": self._create_searchable_text(cp_data["label"], None, cp_data.get("tags"))}
+                cp_data.setdefault("searchable_text", data.get("searchable_text", ""))
+                cp_data.setdefault("agent_type", data.get("agent_type"))
+
+            self.search_index.add(cp_id, cp_data["searchable_text"], cp_data["timestamp"])
+            self._time_by_id[cp_id] = self._timestamp_to_epoch(cp_data["timestamp"])
+            if cp_data["agent_type"]:
+                agents.setdefault(cp_data["agent_type"], []).append((cp_data["timestamp"], cp_id))
+
+        self._time_index = sorted((epoch, cp_id) for cp_id, epoch in self._time_by_id.items())
+        self.checkpoint_index["agents"] = {
+            agent_type: [cp_id for _, cp_id in sorted(entries)]
+            for agent_type, entries in agents.items()
+        }
+
+    def _update_secondary_indexes(self, record: Dict):
+        """Keep lookup structures in sync with an applied index record"""
+        if record["op"] == "add":
+            cp_id = record["checkpoint_id"]
+            entry = record["entry"]
+            self.search_index.add(cp_id, entry.get("searchable_text", ""), entry["timestamp"])
+            self._remove_from_time_index(cp_id)
+            epoch = self._timestamp_to_epoch(entry["timestamp"])
+            self._time_by_id[cp_id] = epoch
+            insort(self._time_index, (epoch, cp_id))
+        elif record["op"] == "delete":
+            for cp_id in record["checkpoint_ids"]:
+                self.search_index.remove(cp_id)
+                self._remove_from_time_index(cp_id)
+                self.metadata_cache.invalidate(cp_id)
+
+    def _remove_from_time_index(self, checkpoint_id: str):
+        """Remove a checkpoint from the sorted time index"""
+        epoch = self._time_by_id.pop(checkpoint_id, None)
+        if epoch is None:
+            return
+        position = bisect_left(self._time_index, (epoch, checkpoint_id))
+        if position < len(self._time_index) and self._time_index[position] == (epoch, checkpoint_id):
+            del self._time_index[position]
+
+    @staticmethod
+    def _timestamp_to_epoch(timestamp: str) -> float:
+        """Convert an ISO timestamp to epoch seconds"""
+        return datetime.fromisoformat(timestamp).timestamp()
+
+    def _journal_index_record(self, record: Dict, sync: bool = True):
+        """Apply an index change in memory and append it to the journal"""
+        with self._index_lock, self._storage_lock.exclusive():
+            # Catch up with other processes first so the journal stays ordered
+            self._refresh_index_locked()
+            self._apply_index_record(self.checkpoint_index, record)
+            self._update_secondary_indexes(record)
+
+            try:
+                self.index_journal.append(record, sync=sync)
+            except Exception as e:
+                logger.error(f"Error writing checkpoint index journal: {e}")
+                return
+
+            threshold = self.config["storage"].get("index_compaction_threshold", 1000)
+            if self.index_journal.entry_count >= threshold:
+                self._save_checkpoint_index()
+
+    @staticmethod
+    def _apply_index_record(index: Dict, record: Dict):
+        """
+        Apply a journal record to an index structure.
+
+        Records are idempotent, so replaying a journal over a snapshot that
+        already contains some of its changes is safe.
+        """
+        op = record.get("op")
+
+        if op == "add":
+            checkpoint_id = record["checkpoint_id"]
+            entry = record["entry"]
+            if checkpoint_id in index["checkpoints"]:
+                CheckpointEngine._apply_index_record(index, {"op": "delete", "checkpoint_ids": [checkpoint_id]})
+
+            index["checkpoints"][checkpoint_id] = entry
+            index["categories"].setdefault(entry["category"], []).append(checkpoint_id)
+            if entry.get("agent_type"):
+                index["agents"].setdefault(entry["agent_type"], []).append(checkpoint_id)
+
+            # Timeline is newest first; new checkpoints almost always go on top
+            timeline = index["timeline"]
+            item = {
+                "checkpoint_id": checkpoint_id,
+                "timestamp": entry["timestamp"],
+                "label": entry["label"]
+            }
+            position = 0
+            while position < len(timeline) and timeline[position]["timestamp"] > item["timestamp"]:
+                position += 1
+            timeline.insert(position, item)
+
+        elif op == "delete":
+            removed = {cp_id for cp_id in record["checkpoint_ids"] if index["checkpoints"].pop(cp_id, None) is not None}
+            if not removed:
+                return
+            for category, cp_ids in index["categories"].items():
+                index["categories"][category] = [cp_id for cp_id in cp_ids if cp_id not in removed]
+            for agent_type, cp_ids in index["agents"].items():
+                index["agents"][agent_type] = [cp_id for cp_id in cp_ids if cp_id not in removed]
+            index["timeline"] = [item for item in index["timeline"] if item["checkpoint_id"] not in removed]
 
     def create_checkpoint(
         self,
@@ -230,6 +564,82 @@ class CheckpointEngine:
             logger.warning("Checkpoint system is disabled")
             return None
 
+        pending = self._begin_checkpoint(level, label, description, agent_type, include_files, tags)
+        try:
+            self._capture_checkpoint_state(pending)
+            return self._commit_checkpoint(pending)
+        except Exception:
+            self._abandon_checkpoint(pending)
+            raise
+
+    def create_checkpoint_async(
+        self,
+        level: CheckpointLevel = CheckpointLevel.MANUAL,
+        label: Optional[str] = None,
+        description: Optional[str] = None,
+        agent_type: Optional[str] = None,
+        include_files: bool = True,
+        tags: Optional[List[str]] = None,
+        snapshot_now: bool = True
+    ) -> CheckpointHandle:
+        """
+        Create a checkpoint without waiting for it to be written.
+
+        Metadata, manifest and index record are committed by a single
+        background writer. Use ``flush()`` (or ``handle.result()``) when the
+        checkpoint must be durable.
+
+        Args:
+            level: Checkpoint level (agent/quality/commit/manual)
+            label: Human-readable label
+            description: Optional description
+            agent_type: Agent type if agent execution checkpoint
+            include_files: Whether to include file snapshots
+            tags: Optional tags for organization
+            snapshot_now: Capture git, agent and file state before returning,
+                so the checkpoint reflects this moment. If False, state is
+                captured later on the writer thread.
+
+        Returns:
+            CheckpointHandle with the assigned checkpoint ID
+        """
+        if not self.config.get("enabled", True):
+            logger.warning("Checkpoint system is disabled")
+            future = Future()
+            future.set_result(None)
+            return CheckpointHandle(None, future)
+
+        pending = self._begin_checkpoint(level, label, description, agent_type, include_files, tags)
+        if snapshot_now:
+            try:
+                self._capture_checkpoint_state(pending)
+            except Exception:
+                self._abandon_checkpoint(pending)
+                raise
+
+        future = self.checkpoint_writer.submit(pending, capture=not snapshot_now)
+        return CheckpointHandle(pending.metadata.checkpoint_id, future)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Durability barrier: wait until all asynchronously created checkpoints
+        are written and their index records are on disk.
+
+        Returns:
+            True if everything was flushed, False on timeout
+        """
+        return self.checkpoint_writer.flush(timeout)
+
+    def _begin_checkpoint(
+        self,
+        level: CheckpointLevel,
+        label: Optional[str],
+        description: Optional[str],
+        agent_type: Optional[str],
+        include_files: bool,
+        tags: Optional[List[str]]
+    ) -> PendingCheckpoint:
+        """Assign ID, timestamp, label and category for a new checkpoint"""
         # Generate checkpoint ID
         checkpoint_id = self._generate_checkpoint_id()
         timestamp = datetime.now().isoformat()
@@ -243,22 +653,6 @@ class CheckpointEngine:
 
         logger.info(f"Creating checkpoint: {label} ({level.value})")
 
-        # Capture state
-        git_state = self._capture_git_state()
-        session_state = self._capture_session_state()
-        todo_state = self._capture_todo_state()
-        agent_state = self._capture_agent_state(agent_type) if agent_type else None
-
-        # Capture files if requested
-        files_data = None
-        files_count = 0
-        total_size = 0
-        changed_files = []
-
-        if include_files:
-            files_data, files_count, total_size, changed_files = self._capture_files()
-
-        # Create metadata
         metadata = CheckpointMetadata(
             checkpoint_id=checkpoint_id,
             timestamp=timestamp,
@@ -266,40 +660,117 @@ class CheckpointEngine:
             category=category.value,
             label=label,
             description=description,
-            git_commit=git_state.get("commit"),
-            git_branch=git_state.get("branch"),
-            git_status=git_state.get("status"),
             agent_type=agent_type,
-            agent_state=agent_state,
-            session_state=session_state,
-            todo_state=todo_state,
-            files_count=files_count,
-            total_size_bytes=total_size,
-            changed_files=changed_files,
             tags=tags or [],
             searchable_text=self._create_searchable_text(label, description, tags)
         )
+        return PendingCheckpoint(metadata=metadata, level=level, include_files=include_files)
+
+    def _capture_checkpoint_state(self, pending: PendingCheckpoint):
+        """Capture git, session, agent and file state into a pending checkpoint"""
+        metadata = pending.metadata
+
+        # Capture state
+        git_state = self._capture_git_state()
+        metadata.git_commit = git_state.get("commit")
+        metadata.git_branch = git_state.get("branch")
+        metadata.git_status = git_state.get("status")
+        metadata.session_state = self._capture_session_state()
+        metadata.todo_state = self._capture_todo_state()
+        metadata.agent_state = self._capture_agent_state(metadata.agent_type) if metadata.agent_type else None
+
+        # Capture files if requested
+        if pending.include_files:
+            # Held until the checkpoint is indexed, so no process sweeps its blobs
+            self._gc_lock.acquire_shared()
+            pending.holds_gc_lock = True
+            # The previous manifest must still be live in the latest index
+            self.refresh_index()
+            # Changed-file contents read during the capture, for the memory tier
+            memory_contents = {} if self.memory_tier.enabled else None
+            with self._snapshot_lock:
+                files_data, files_count, total_size, changed_files = self._capture_files(
+                    git_state.get("status"), memory_contents
+                )
+                pending.files_data = files_data
+                metadata.files_count = files_count
+                metadata.total_size_bytes = total_size
+                metadata.changed_files = changed_files
+
+                # Blobs referenced by this snapshot must not be swept before it is indexed
+                manifest = self._last_manifest
+                self._pending_manifests[metadata.checkpoint_id] = manifest
+                self._last_manifest_id = metadata.checkpoint_id
+
+            if memory_contents is not None:
+                self._promote_to_memory_tier(metadata.checkpoint_id, changed_files, manifest, memory_contents)
+
+    def _promote_to_memory_tier(self, checkpoint_id: str, changed_files: List[str], manifest: Dict,
+                                memory_contents: Dict[str, bytes]):
+        """Keep the contents of files changed by a new checkpoint in the memory tier"""
+        manifest_files = manifest.get("files", {})
+        contents = {}
+        for rel_path in changed_files:
+            blob_hash = manifest_files[rel_path]["hash"]
+            if blob_hash in memory_contents:
+                contents[blob_hash] = memory_contents[blob_hash]
+
+        self.memory_tier.add_checkpoint(checkpoint_id, contents)
+
+    def _commit_checkpoint(self, pending: PendingCheckpoint, sync: bool = True) -> Optional[str]:
+        """
+        Write a captured checkpoint and add it to the index.
+
+        Args:
+            pending: Captured checkpoint
+            sync: fsync the index journal record (the writer batches syncs instead)
+
+        Returns:
+            Checkpoint ID if successful, None otherwise
+        """
+        metadata = pending.metadata
+        checkpoint_id = metadata.checkpoint_id
 
         # Save checkpoint data
-        success = self._save_checkpoint_data(checkpoint_id, files_data, metadata)
+        success = self._save_checkpoint_data(checkpoint_id, pending.files_data, metadata)
 
         if success:
-            # Update index
-            self._add_to_index(checkpoint_id, metadata)
+            with self._snapshot_lock:
+                # Update index
+                self._add_to_index(checkpoint_id, metadata, sync=sync)
+                self._pending_manifests.pop(checkpoint_id, None)
+            self._release_gc_lock(pending)
 
-            # Clean up old checkpoints if needed
-            self._cleanup_old_checkpoints(level)
+            # Clean up old checkpoints if needed (in the background)
+            self._cleanup_old_checkpoints(pending.level)
 
-            logger.info(f"✅ Checkpoint created: {checkpoint_id} ({label})")
+            logger.info(f"✅ Checkpoint created: {checkpoint_id} ({metadata.label})")
 
             if self.config.get("notifications", {}).get("checkpoint_created", {}).get("enabled"):
-                self._notify_checkpoint_created(checkpoint_id, label)
+                self._notify_checkpoint_created(checkpoint_id, metadata.label)
 
             return checkpoint_id
         else:
-            logger.error(f"Failed to create checkpoint: {label}")
+            self._abandon_checkpoint(pending)
+            logger.error(f"Failed to create checkpoint: {metadata.label}")
             return None
 
+    def _abandon_checkpoint(self, pending: PendingCheckpoint):
+        """Forget a captured checkpoint that will not be committed"""
+        checkpoint_id = pending.metadata.checkpoint_id
+        with self._snapshot_lock:
+            self._pending_manifests.pop(checkpoint_id, None)
+            if self._last_manifest_id == checkpoint_id:
+                self._last_manifest = None
+                self._last_manifest_id = None
+        self._release_gc_lock(pending)
+
+    def _release_gc_lock(self, pending: PendingCheckpoint):
+        """Drop a pending checkpoint's shared hold on the GC lock"""
+        if pending.holds_gc_lock:
+            pending.holds_gc_lock = False
+            self._gc_lock.release_shared()
+
     def _generate_checkpoint_id(self) -> str:
         """Generate unique checkpoint ID"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -331,50 +802,8 @@ class CheckpointEngine:
         return CheckpointCategory.UNKNOWN
 
     def _capture_git_state(self) -> Dict:
-        """Capture current git state"""
-        git_state = {}
-
-        try:
-            # Get current commit
-            result = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                cwd=self.framework_root,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                git_state["commit"] = result.stdout.strip()
-
-            # Get current branch
-            result = subprocess.run(
-                ["git", "branch", "--show-current"],
-                cwd=self.framework_root,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                git_state["branch"] = result.stdout.strip()
-
-            # Get git status
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=self.framework_root,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                git_state["status"] = {
-                    "clean": len(result.stdout.strip()) == 0,
-                    "changes": result.stdout.strip().split("\n") if result.stdout.strip() else []
-                }
-
-        except Exception as e:
-            logger.warning(f"Error capturing git state: {e}")
-
-        return git_state
+        """Capture current git state (cached between checkpoints)"""
+        return self.git_state.capture()
 
     def _capture_session_state(self) -> Optional[Dict]:
         """Capture session manager state"""
@@ -391,16 +820,310 @@ class CheckpointEngine:
         # TODO: Capture agent execution state
         return {"agent_type": agent_type}
 
-    def _capture_files(self) -> Tuple[Optional[bytes], int, int, List[str]]:
+    def _capture_files(
+        self, git_status: Optional[Dict] = None, memory_contents: Optional[Dict[str, bytes]] = None
+    ) -> Tuple[Optional[bytes], int, int, List[str]]:
         """
         Capture file snapshots.
 
+        File contents go to the shared blob store (one copy per unique content);
+        the checkpoint itself only stores a manifest of path -> blob hash.
+        Files of at least ``chunking_threshold_mb`` are stored as
+        content-defined chunks, listed in the entry's ``chunks``. With the git
+        backend, the manifest also records the snapshot ``tree`` and each
+        entry its ``git`` blob ID instead.
+        Only files whose stat tuple changed since the last snapshot (or that
+        git reports as dirty) are rehashed.
+
+        Args:
+            git_status: Git status captured for this checkpoint (seeds the dirty set)
+            memory_contents: Collects content hash -> content of the small files
+                read while storing, up to the memory tier's byte budget
+
         Returns:
-            (compressed_data, files_count, total_size, changed_files)
+            (manifest_data, files_count, total_size, changed_files)
+        """
+        previous_files = (self._get_previous_manifest() or {}).get("files", {})
+        dirty_paths = self._dirty_paths_from_git_status(git_status)
+        root = str(self.framework_root)
+        manifest_files = {}
+        total_size = 0
+        new_bytes = 0
+        rehashed = 0
+        memory_budget = self.memory_tier.max_bytes if memory_contents is not None else 0
+
+        snapshot_files = self._list_snapshot_files()
+        for rel_path in snapshot_files:
+            file_path = os.path.join(root, rel_path)
+            try:
+                file_stat = os.stat(file_path)
+                if not self._is_snapshot_file(file_stat):
+                    continue
+
+                blob_hash = None if rel_path in dirty_paths else self.stat_cache.lookup(rel_path, file_stat)
+                previous_entry = previous_files.get(rel_path, {})
+                chunks = None
+                if blob_hash is not None and previous_entry.get("hash") == blob_hash and "git" not in previous_entry:
+                    # Referenced by the previous manifest, so already stored
+                    written = 0
+                    chunks = previous_entry.get("chunks")
+                else:
+                    data = None
+                    if memory_contents is not None and file_stat.st_size <= min(
+                        memory_budget, self.memory_tier.max_entry_bytes
+                    ):
+                        # Read once: the same bytes are hashed, stored and kept in memory
+                        with open(file_path, 'rb') as f:
+                            data = f.read()
+                        if blob_hash is None:
+                            blob_hash = self.blob_store.hash_bytes(data)
+                            rehashed += 1
+                        memory_contents[blob_hash] = data
+                        memory_budget -= len(data)
+
+                    if self.git_snapshots:
+                        # Content is written by the git snapshot after the file walk
+                        if blob_hash is None:
+                            blob_hash = self.blob_store.hash_file(Path(file_path))
+                            rehashed += 1
+                        written = 0
+                    else:
+                        if blob_hash is None:
+                            rehashed += 1
+                        blob_hash, chunks, written = self._store_file(
+                            Path(file_path), file_stat.st_size, blob_hash, data
+                        )
+                    self.stat_cache.update(rel_path, file_stat, blob_hash)
+            except OSError as e:
+                logger.debug(f"Skipping unreadable file {rel_path}: {e}")
+                continue
+
+            manifest_files[rel_path] = {
+                "hash": blob_hash,
+                "size": file_stat.st_size,
+                "mode": stat.S_IMODE(file_stat.st_mode)
+            }
+            if chunks:
+                manifest_files[rel_path]["chunks"] = chunks
+            total_size += file_stat.st_size
+            new_bytes += written
+
+        changed_files = sorted(
+            path for path, entry in manifest_files.items()
+            if previous_files.get(path, {}).get("hash") != entry["hash"]
+        )
+
+        manifest = {"version": 1, "files": manifest_files}
+        if self.git_snapshots:
+            new_bytes += self._snapshot_to_git(manifest)
+        self._last_manifest = manifest
+
+        self.stat_cache.retain(manifest_files.keys())
+        self.stat_cache.save()
+
+        logger.debug(
+            f"Captured {len(manifest_files)} files ({rehashed} rehashed, "
+            f"{len(changed_files)} changed, {new_bytes} new bytes stored)"
+        )
+
+        return json.dumps(manifest, separators=(",", ":")).encode("utf-8"), len(manifest_files), total_size, changed_files
+
+    def _store_file(
+        self, path: Path, size: int, blob_hash: Optional[str], data: Optional[bytes] = None
+    ) -> Tuple[str, Optional[List[str]], int]:
+        """
+        Store one file's content in the blob store.
+
+        The link backend clones (or hardlinks) the file as a raw object and
+        falls back to compressed storage where the filesystem cannot; large
+        files are otherwise stored as content-defined chunks. Content already
+        read into ``data`` is stored without reading the file again.
+
+        Returns:
+            (blob_hash, chunk_hashes or None, bytes_written)
+        """
+        storage_config = self.config["storage"]
+
+        if storage_config.get("backend", "blob") == "link":
+            if blob_hash is None:
+                blob_hash = self.blob_store.hash_file(path)
+            written = self.blob_store.link_file(path, blob_hash, storage_config.get("allow_hardlinks", False))
+            if written is not None:
+                return blob_hash, None, written
+
+        chunking_threshold_mb = storage_config.get("chunking_threshold_mb", 1)
+        if chunking_threshold_mb is not None and size >= chunking_threshold_mb * 1024 * 1024:
+            return self.blob_store.put_file_chunked(path)
+
+        if data is not None:
+            blob_hash, written = self.blob_store.put_bytes(data, blob_hash)
+        else:
+            blob_hash, written = self.blob_store.put_file(path, blob_hash)
+        return blob_hash, None, written
+
+    def _snapshot_to_git(self, manifest: Dict) -> int:
+        """
+        Record a manifest's files as a git tree.
+
+        Falls back to the blob store if git fails, so the checkpoint is
+        still complete.
+
+        Returns:
+            Bytes written to the blob store by the fallback
+        """
+        manifest_files = manifest["files"]
+        try:
+            snapshot = self.git_backend.snapshot(manifest_files.keys())
+        except Exception as e:
+            logger.warning(f"Git snapshot failed, storing files in the blob store: {e}")
+            written = 0
+            for rel_path, entry in manifest_files.items():
+                _, chunks, file_written = self._store_file(self.framework_root / rel_path, entry["size"], entry["hash"])
+                if chunks:
+                    entry["chunks"] = chunks
+                written += file_written
+            return written
+
+        manifest["tree"] = snapshot["tree"]
+        for rel_path, entry in manifest_files.items():
+            entry["git"] = snapshot["blobs"][rel_path]
+        return 0
+
+    def _dirty_paths_from_git_status(self, git_status: Optional[Dict]) -> Set[str]:
+        """Extract paths reported as changed by `git status --porcelain`"""
+        dirty = set()
+        for line in (git_status or {}).get("changes", []):
+            if len(line) < 4:
+                continue
+            path = line[3:]
+            if " -> " in path:
+                path = path.split(" -> ", 1)[1]
+            dirty.add(path.strip('"'))
+        return dirty
+
+    def _list_snapshot_files(self) -> List[str]:
+        """List project files to snapshot (relative POSIX paths)"""
+        files = None
+
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                cwd=self.framework_root,
+                capture_output=True,
+                timeout=30
+            )
+            if result.returncode == 0:
+                files = [p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p]
+        except Exception as e:
+            logger.debug(f"git ls-files unavailable, walking directory tree: {e}")
+
+        storage_prefix = self._storage_prefix()
+        if files is None:
+            files = []
+            root = str(self.framework_root)
+            for dirpath, dirnames, filenames in os.walk(root):
+                rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+                prefix = "" if rel_dir == "." else rel_dir + "/"
+                # Prune .git and the (growing) checkpoint storage instead of filtering later
+                dirnames[:] = [
+                    d for d in dirnames
+                    if d != ".git" and not (storage_prefix and f"{prefix}{d}/" == storage_prefix)
+                ]
+                files.extend(prefix + name for name in filenames)
+
+        return self._filter_snapshot_paths(files)
+
+    def _storage_prefix(self) -> Optional[str]:
+        """Project-relative POSIX prefix of the checkpoint storage ("dir/"), None if outside the project"""
+        try:
+            return self.storage_base.resolve().relative_to(self.framework_root.resolve()).as_posix() + "/"
+        except ValueError:
+            return None
+
+    def _filter_snapshot_paths(self, paths: Iterable[str]) -> List[str]:
+        """Drop checkpoint storage files and paths matching ``exclude_patterns``"""
+        # Never snapshot the checkpoint storage itself
+        storage_prefix = self._storage_prefix()
+        exclude_patterns = self.config["storage"].get("exclude_patterns", [])
+
+        return [
+            path for path in paths
+            if not (storage_prefix and path.startswith(storage_prefix))
+            and not any(fnmatch.fnmatch(path, pattern) for pattern in exclude_patterns)
+        ]
+
+    def _load_manifest(self, checkpoint_id: str) -> Optional[Dict]:
+        """Load a checkpoint's file manifest"""
+        data = self._read_storage_file(f"checkpoints/{checkpoint_id}.dat.gz")
+        if data is None:
+            return None
+
+        try:
+            return json.loads(gzip.decompress(data))
+        except Exception as e:
+            logger.warning(f"Error loading manifest for {checkpoint_id}: {e}")
+            return None
+
+    def _read_metadata_bytes(self, checkpoint_id: str) -> Optional[bytes]:
+        """Read a checkpoint's serialized metadata (loose file or packfile)"""
+        return self._read_storage_file(f"metadata/{checkpoint_id}.json")
+
+    def _read_storage_file(self, key: str) -> Optional[bytes]:
         """
-        # TODO: Implement file capture with delta compression
-        # For now, return placeholder
-        return None, 0, 0, []
+        Read a per-checkpoint storage file.
+
+        Recent checkpoints are loose files; older ones live in packfiles.
+        The loose file is tried first, since the packer removes it only after
+        the pack holding its content is in place.
+        """
+        try:
+            with open(self.storage_base / key, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return self.pack_store.read(key)
+
+    @staticmethod
+    def _manifest_blob_hashes(manifest: Dict) -> Set[str]:
+        """Get all blob hashes referenced by a manifest (chunk hashes for chunked files)"""
+        hashes = set()
+        for entry in manifest.get("files", {}).values():
+            if "git" in entry:
+                # Stored in the git object database
+                continue
+            chunks = entry.get("chunks")
+            if chunks:
+                hashes.update(chunks)
+            else:
+                hashes.add(entry["hash"])
+        return hashes
+
+    def _open_manifest_entry(self, entry: Dict) -> BinaryIO:
+        """Open the stored content of a manifest entry (reassembling chunks)"""
+        data = self.memory_tier.get(entry["hash"])
+        if data is not None:
+            return io.BytesIO(data)
+        if "git" in entry:
+            return self.git_backend.open_blob(entry["git"])
+        chunks = entry.get("chunks")
+        if chunks:
+            return self.blob_store.open_chunks(chunks)
+        return self.blob_store.open_blob(entry["hash"])
+
+    def _get_previous_manifest(self) -> Optional[Dict]:
+        """Get manifest of the most recent checkpoint with captured files"""
+        # A cached manifest is only trusted while its checkpoint (and so its blobs) survives
+        last_id = self._last_manifest_id
+        if last_id not in self.checkpoint_index["checkpoints"] and last_id not in self._pending_manifests:
+            self._last_manifest = None
+            self._last_manifest_id = None
+            for entry in list(self.checkpoint_index.get("timeline", [])):
+                manifest = self._load_manifest(entry["checkpoint_id"])
+                if manifest is not None:
+                    self._last_manifest = manifest
+                    self._last_manifest_id = entry["checkpoint_id"]
+                    break
+
+        return self._last_manifest
 
     def _create_searchable_text(self, label: str, description: Optional[str], tags: Optional[List[str]]) -> str:
         """Create searchable text for quick rewind"""
@@ -415,15 +1138,28 @@ class CheckpointEngine:
         """Save checkpoint data and metadata"""
         try:
             # Save metadata
+            # Files are written to a temp name and renamed, so concurrent
+            # readers never see partial data
             metadata_file = self.metadata_dir / f"{checkpoint_id}.json"
-            with open(metadata_file, 'w') as f:
-                json.dump(asdict(metadata), f, indent=2)
+
+            # Git snapshot trees are kept reachable by a per-checkpoint ref
+            manifest = self._pending_manifests.get(checkpoint_id)
+            if manifest and manifest.get("tree"):
+                self.git_backend.save_ref(checkpoint_id, manifest["tree"])
+
+            metadata_dict = asdict(metadata)
+            metadata_json = json.dumps(metadata_dict, indent=2)
+            atomic_write_bytes(metadata_file, metadata_json.encode("utf-8"), fsync=False)
+            self.metadata_cache.put(checkpoint_id, metadata_dict, len(metadata_json))
 
             # Save files data if present
             if files_data:
                 checkpoint_file = self.checkpoints_dir / f"{checkpoint_id}.dat.gz"
-                with gzip.open(checkpoint_file, 'wb') as f:
-                    f.write(files_data)
+                atomic_write_bytes(
+                    checkpoint_file,
+                    gzip.compress(files_data, compresslevel=self.blob_store.compression_level, mtime=0),
+                    fsync=False
+                )
 
             return True
 
@@ -431,76 +1167,93 @@ class CheckpointEngine:
             logger.error(f"Error saving checkpoint data: {e}")
             return False
 
-    def _add_to_index(self, checkpoint_id: str, metadata: CheckpointMetadata):
+    def _add_to_index(self, checkpoint_id: str, metadata: CheckpointMetadata, sync: bool = True):
         """Add checkpoint to index"""
-        self.checkpoint_index["checkpoints"][checkpoint_id] = {
-            "timestamp": metadata.timestamp,
-            "level": metadata.level,
-            "category": metadata.category,
-            "label": metadata.label,
-            "tags": metadata.tags
-        }
-
-        # Add to category index
-        category = metadata.category
-        if category not in self.checkpoint_index["categories"]:
-            self.checkpoint_index["categories"][category] = []
-        self.checkpoint_index["categories"][category].append(checkpoint_id)
-
-        # Add to timeline
-        self.checkpoint_index["timeline"].append({
+        self._journal_index_record({
+            "op": "add",
             "checkpoint_id": checkpoint_id,
-            "timestamp": metadata.timestamp,
-            "label": metadata.label
-        })
+            "entry": {
+                "timestamp": metadata.timestamp,
+                "level": metadata.level,
+                "category": metadata.category,
+                "label": metadata.label,
+                "tags": metadata.tags,
+                "agent_type": metadata.agent_type,
+                "searchable_text": metadata.searchable_text
+            }
+        }, sync=sync)
 
-        # Sort timeline by timestamp
-        self.checkpoint_index["timeline"].sort(key=lambda x: x["timestamp"], reverse=True)
+    def _cleanup_old_checkpoints(self, level: CheckpointLevel):
+        """
+        Clean up old checkpoints based on retention policy.
 
-        self._save_checkpoint_index()
+        Count, age (retention_days) and byte quota (storage.max_checkpoint_size_mb)
+        are enforced by the retention GC, which runs off the caller's thread.
+        """
+        self.retention_gc.maybe_schedule(level.value)
 
-    def _cleanup_old_checkpoints(self, level: CheckpointLevel):
-        """Clean up old checkpoints based on retention policy"""
-        level_config = self.config.get("checkpointLevels", {}).get(level.value, {})
-        retention_count = level_config.get("retention_count", 100)
-
-        # Get checkpoints for this level
-        level_checkpoints = [
-            (cp_id, cp_data)
-            for cp_id, cp_data in self.checkpoint_index["checkpoints"].items()
-            if cp_data["level"] == level.value
-        ]
+    def run_retention_gc(self) -> Dict:
+        """Run a retention/GC pass synchronously and return its statistics"""
+        return self.retention_gc.run()
 
-        # Sort by timestamp (newest first)
-        level_checkpoints.sort(key=lambda x: x[1]["timestamp"], reverse=True)
+    def verify(self, full: bool = False, workers: Optional[int] = None) -> VerificationReport:
+        """
+        Verify checkpoint storage integrity.
+
+        Args:
+            full: Re-verify everything instead of only data not verified before
+            workers: Hashing threads (default: one per CPU)
 
-        # Delete old checkpoints
-        if len(level_checkpoints) > retention_count:
-            to_delete = level_checkpoints[retention_count:]
-            for cp_id, _ in to_delete:
-                self._delete_checkpoint(cp_id)
+        Returns:
+            VerificationReport listing missing or corrupted data
+        """
+        return StorageVerifier(self).run(full=full, workers=workers)
 
     def _delete_checkpoint(self, checkpoint_id: str):
         """Delete a checkpoint"""
-        try:
-            # Delete metadata
-            metadata_file = self.metadata_dir / f"{checkpoint_id}.json"
-            if metadata_file.exists():
-                metadata_file.unlink()
+        self._delete_checkpoints([checkpoint_id])
 
-            # Delete checkpoint data
-            checkpoint_file = self.checkpoints_dir / f"{checkpoint_id}.dat.gz"
-            if checkpoint_file.exists():
-                checkpoint_file.unlink()
+    def _delete_checkpoints(self, checkpoint_ids: List[str]) -> int:
+        """
+        Delete checkpoints in a single index transaction.
 
-            # Remove from index
-            if checkpoint_id in self.checkpoint_index["checkpoints"]:
-                del self.checkpoint_index["checkpoints"][checkpoint_id]
+        Blobs are left for the retention GC sweep, since other checkpoints
+        may still reference them.
 
-            self._save_checkpoint_index()
+        Returns:
+            Number of bytes freed
+        """
+        freed = 0
+        try:
+            # Remove from index first; files left by a crash are swept as orphans
+            indexed = [cp_id for cp_id in checkpoint_ids if cp_id in self.checkpoint_index["checkpoints"]]
+            if indexed:
+                self._journal_index_record({"op": "delete", "checkpoint_ids": indexed})
+
+            for checkpoint_id in checkpoint_ids:
+                self.metadata_cache.invalidate(checkpoint_id)
+                self.memory_tier.discard(checkpoint_id)
+                for path in (self.metadata_dir / f"{checkpoint_id}.json", self.checkpoints_dir / f"{checkpoint_id}.dat.gz"):
+                    try:
+                        freed += path.stat().st_size
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+
+            # Packed copies are reclaimed when the GC rewrites their pack
+            self.pack_store.discard(
+                key for checkpoint_id in checkpoint_ids
+                for key in (f"metadata/{checkpoint_id}.json", f"checkpoints/{checkpoint_id}.dat.gz")
+            )
+
+            # Trees become unreachable and are pruned by git gc
+            if self.git_snapshots:
+                self.git_backend.delete_refs(checkpoint_ids)
 
         except Exception as e:
-            logger.error(f"Error deleting checkpoint {checkpoint_id}: {e}")
+            logger.error(f"Error deleting checkpoints {checkpoint_ids}: {e}")
+
+        return freed
 
     def _notify_checkpoint_created(self, checkpoint_id: str, label: str):
         """Send notification about checkpoint creation"""
@@ -526,7 +1279,7 @@ class CheckpointEngine:
         """
         checkpoints = []
 
-        for cp_id, cp_data in self.checkpoint_index["checkpoints"].items():
+        for cp_id, cp_data in list(self.checkpoint_index["checkpoints"].items()):
             # Apply filters
             if level and cp_data["level"] != level.value:
                 continue
@@ -544,21 +1297,193 @@ class CheckpointEngine:
         return checkpoints[:limit]
 
     def get_checkpoint_metadata(self, checkpoint_id: str) -> Optional[CheckpointMetadata]:
-        """Get detailed checkpoint metadata"""
-        metadata_file = self.metadata_dir / f"{checkpoint_id}.json"
+        """
+        Get detailed checkpoint metadata.
+
+        Indexed checkpoints are materialized from the index summary; detail
+        fields are loaded (through the metadata cache) on first access.
+        """
+        summary = self.checkpoint_index["checkpoints"].get(checkpoint_id)
+        if summary is not None:
+            return LazyCheckpointMetadata(checkpoint_id, summary, self._load_metadata_details)
 
-        if not metadata_file.exists():
-            logger.warning(f"Checkpoint not found: {checkpoint_id}")
+        try:
+            data = self.metadata_cache.get(checkpoint_id)
+            if data is None:
+                logger.warning(f"Checkpoint not found: {checkpoint_id}")
+                return None
+            return CheckpointMetadata(**copy.deepcopy(data))
+        except Exception as e:
+            logger.error(f"Error loading checkpoint metadata: {e}")
             return None
 
+    def _load_metadata_details(self, checkpoint_id: str) -> Optional[Dict]:
+        """Load full metadata for lazy detail fields"""
         try:
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return CheckpointMetadata(**data)
+            data = self.metadata_cache.get(checkpoint_id)
+            if data is None:
+                logger.warning(f"Checkpoint metadata file missing: {checkpoint_id}")
+            return data
         except Exception as e:
             logger.error(f"Error loading checkpoint metadata: {e}")
             return None
 
+    def diff(self, checkpoint_a: Optional[str], checkpoint_b: Optional[str] = None) -> Optional[CheckpointDiff]:
+        """
+        Compare two checkpoints by manifest (no file contents are read).
+
+        Args:
+            checkpoint_a: Source checkpoint ID (None = working tree)
+            checkpoint_b: Target checkpoint ID (None = working tree)
+
+        Returns:
+            CheckpointDiff describing changes from a to b, or None if a
+            checkpoint has no file snapshot
+        """
+        manifests = []
+        for checkpoint_id in (checkpoint_a, checkpoint_b):
+            if checkpoint_id is None:
+                manifests.append(self._working_tree_manifest())
+                continue
+            manifest = self._load_manifest(checkpoint_id)
+            if manifest is None:
+                logger.warning(f"No file snapshot for checkpoint: {checkpoint_id}")
+                return None
+            manifests.append(manifest)
+
+        source_files = manifests[0].get("files", {})
+        target_files = manifests[1].get("files", {})
+        result = CheckpointDiff(source_id=checkpoint_a, target_id=checkpoint_b)
+
+        for rel_path, target_entry in target_files.items():
+            source_entry = source_files.get(rel_path)
+            if source_entry is None:
+                result.added.append(rel_path)
+            elif (
+                source_entry["hash"] != target_entry["hash"]
+                or source_entry.get("mode", 0o644) != target_entry.get("mode", 0o644)
+            ):
+                result.modified.append(rel_path)
+            else:
+                continue
+            result.entries[rel_path] = (source_entry, target_entry)
+
+        for rel_path, source_entry in source_files.items():
+            if rel_path not in target_files:
+                result.removed.append(rel_path)
+                result.entries[rel_path] = (source_entry, None)
+
+        result.added.sort()
+        result.removed.sort()
+        result.modified.sort()
+        return result
+
+    def diff_working_tree(self, checkpoint_id: str) -> Optional[CheckpointDiff]:
+        """
+        Compare a checkpoint with the current working tree.
+
+        Only files whose stat changed since the last snapshot are rehashed.
+        """
+        return self.diff(checkpoint_id, None)
+
+    def working_tree_fingerprint(self) -> str:
+        """
+        Content fingerprint of the working tree (paths, content hashes and modes).
+
+        Only files whose stat changed since the last snapshot are rehashed.
+        """
+        digest = hashlib.sha256()
+        for rel_path, entry in sorted(self._working_tree_manifest()["files"].items()):
+            digest.update(f"{rel_path}\0{entry['hash']}\0{entry['mode']:o}\n".encode("utf-8", "surrogateescape"))
+        return digest.hexdigest()
+
+    def unified_diff(self, checkpoint_diff: CheckpointDiff, path: Optional[str] = None, context_lines: int = 3) -> str:
+        """
+        Render unified diffs for changed files.
+
+        Only the blobs of the requested paths are read.
+
+        Args:
+            checkpoint_diff: Result of diff() / diff_working_tree()
+            path: Single path to render (default: all changed paths)
+            context_lines: Lines of context around changes
+
+        Returns:
+            Unified diff text
+        """
+        paths = [path] if path is not None else sorted(checkpoint_diff.entries)
+        source_label = checkpoint_diff.source_id or "working-tree"
+        target_label = checkpoint_diff.target_id or "working-tree"
+        chunks = []
+
+        for rel_path in paths:
+            if rel_path not in checkpoint_diff.entries:
+                continue
+            source_entry, target_entry = checkpoint_diff.entries[rel_path]
+            source_data = self._read_diff_side(rel_path, source_entry, checkpoint_diff.source_id)
+            target_data = self._read_diff_side(rel_path, target_entry, checkpoint_diff.target_id)
+
+            from_file = f"{source_label}/{rel_path}" if source_entry else "/dev/null"
+            to_file = f"{target_label}/{rel_path}" if target_entry else "/dev/null"
+
+            if b"\0" in source_data or b"\0" in target_data:
+                chunks.append(f"Binary files {from_file} and {to_file} differ\n")
+                continue
+
+            lines = difflib.unified_diff(
+                source_data.decode("utf-8", "replace").splitlines(keepends=True),
+                target_data.decode("utf-8", "replace").splitlines(keepends=True),
+                fromfile=from_file,
+                tofile=to_file,
+                n=context_lines
+            )
+            text = "".join(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n" for line in lines)
+            if not text and source_entry and target_entry:
+                text = f"--- {from_file}\n+++ {to_file}\nmode {source_entry.get('mode', 0o644):o} -> {target_entry.get('mode', 0o644):o}\n"
+            chunks.append(text)
+
+        return "".join(chunks)
+
+    def _read_diff_side(self, rel_path: str, entry: Optional[Dict], checkpoint_id: Optional[str]) -> bytes:
+        """Read one side of a file diff (checkpoint blob or working tree file)"""
+        if entry is None:
+            return b""
+        if checkpoint_id is None:
+            try:
+                with open(self.framework_root / rel_path, 'rb') as f:
+                    return f.read()
+            except OSError:
+                return b""
+        with self._open_manifest_entry(entry) as f:
+            return f.read()
+
+    def _working_tree_manifest(self) -> Dict:
+        """Build a manifest of the working tree without storing any blobs"""
+        root = str(self.framework_root)
+        manifest_files = {}
+
+        for rel_path in self._list_snapshot_files():
+            file_path = os.path.join(root, rel_path)
+            try:
+                file_stat = os.stat(file_path)
+                if not self._is_snapshot_file(file_stat):
+                    continue
+                blob_hash = self.stat_cache.lookup(rel_path, file_stat)
+                if blob_hash is None:
+                    blob_hash = self.blob_store.hash_file(Path(file_path))
+                    self.stat_cache.update(rel_path, file_stat, blob_hash)
+            except OSError:
+                continue
+
+            manifest_files[rel_path] = {
+                "hash": blob_hash,
+                "size": file_stat.st_size,
+                "mode": stat.S_IMODE(file_stat.st_mode)
+            }
+
+        self.stat_cache.save()
+        return {"version": 1, "files": manifest_files}
+
     def rollback_to_checkpoint(
         self,
         checkpoint_id: str,
@@ -578,6 +1503,11 @@ class CheckpointEngine:
         """
         logger.info(f"{'Dry-run: ' if dry_run else ''}Rolling back to checkpoint: {checkpoint_id}")
 
+        # Checkpoints created asynchronously (or by other processes) must be
+        # on disk and indexed before files are rewritten
+        self.flush()
+        self.refresh_index()
+
         # Validate checkpoint exists
         metadata = self.get_checkpoint_metadata(checkpoint_id)
         if not metadata:
@@ -611,15 +1541,27 @@ class CheckpointEngine:
             warnings.extend(validation_result.get("warnings", []))
 
         if dry_run:
-            # Dry run - just report what would happen
+            # Dry run - report exactly which files a rollback would rewrite
+            tree_diff = self.diff(None, checkpoint_id)
+            if tree_diff is None:
+                changed_files = []
+            else:
+                changed_files = sorted(tree_diff.added + tree_diff.modified)
+                if tree_diff.removed:
+                    if self.config.get("rollbackPolicies", {}).get("delete_files_not_in_checkpoint", False):
+                        changed_files = sorted(changed_files + tree_diff.removed)
+                    else:
+                        warnings.append(f"{len(tree_diff.removed)} files not present in checkpoint would be left untouched")
+
             return RollbackResult(
                 success=True,
                 checkpoint_id=checkpoint_id,
                 checkpoint_label=metadata.label,
-                files_restored=metadata.files_count,
+                files_restored=len(changed_files),
                 conflicts=conflicts,
                 warnings=warnings,
-                message=f"Dry run: Would restore {metadata.files_count} files from '{metadata.label}'"
+                message=f"Dry run: Would restore {len(changed_files)} files from '{metadata.label}'",
+                changed_files=changed_files
             )
 
         # Create rollback checkpoint to preserve current state
@@ -636,14 +1578,11 @@ class CheckpointEngine:
         # Restore files
         files_restored = 0
         try:
-            checkpoint_file = self.checkpoints_dir / f"{checkpoint_id}.dat.gz"
-            if checkpoint_file.exists():
-                # Load checkpoint data
-                with gzip.open(checkpoint_file, 'rb') as f:
-                    checkpoint_data = f.read()
-
-                # Restore files from checkpoint
-                restore_result = self._restore_files_from_checkpoint(checkpoint_data, metadata)
+            manifest = self._load_manifest(checkpoint_id)
+            if manifest is not None:
+                # Restore only files that differ from the working tree
+                restore_result = self._restore_files_from_checkpoint(manifest, metadata)
+                self.git_state.invalidate()
                 files_restored = restore_result["files_restored"]
                 conflicts.extend(restore_result.get("conflicts", []))
                 warnings.extend(restore_result.get("warnings", []))
@@ -723,16 +1662,183 @@ class CheckpointEngine:
             "message": "Validation passed" if not warnings else "; ".join(warnings)
         }
 
-    def _restore_files_from_checkpoint(self, checkpoint_data: bytes, metadata: CheckpointMetadata) -> Dict:
-        """Restore files from checkpoint data"""
-        # TODO: Implement file restoration from compressed checkpoint data
-        # This will depend on how files are stored in _capture_files()
+    def _restore_files_from_checkpoint(self, manifest: Dict, metadata: CheckpointMetadata) -> Dict:
+        """
+        Restore files from a checkpoint manifest.
+
+        Only files whose current content differs from the manifest are written.
+        Blobs are streamed straight to disk by a thread pool; fsyncs are deferred
+        until all writes complete and then issued as one parallel batch.
+        Git-backed snapshots check out all changed paths with one
+        ``checkout-index`` call instead.
+        """
+        manifest_files = manifest.get("files", {})
+        git_tree = manifest.get("tree")
+        max_workers = self.config["storage"].get("restore_workers", 8)
+        conflicts = []
+        warnings = []
+        restored = []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            restore = self._file_differs if git_tree else self._restore_file_if_changed
+            # Stat-cache hits are settled here; only candidates reach the pool
+            futures = {
+                executor.submit(restore, rel_path, entry): rel_path
+                for rel_path, entry in manifest_files.items()
+                if not self._is_unchanged_by_stat(rel_path, entry)
+            }
+            for future, rel_path in futures.items():
+                try:
+                    if future.result():
+                        restored.append(rel_path)
+                except Exception as e:
+                    conflicts.append(rel_path)
+                    warnings.append(f"Could not restore {rel_path}: {e}")
+
+            if git_tree and restored:
+                try:
+                    self._checkout_git_paths(git_tree, restored, manifest_files)
+                except Exception as e:
+                    conflicts.extend(restored)
+                    warnings.append(f"Could not check out files from git snapshot: {e}")
+                    restored = []
+
+            # Flush file data, then each touched directory once
+            targets = [self.framework_root / rel_path for rel_path in restored]
+            list(executor.map(self._fsync_path, targets))
+            list(executor.map(self._fsync_path, {target.parent for target in targets}))
+
+        # Files created after the checkpoint are left in place (and reported).
+        # Files a capture would not store (oversized, not regular) are never
+        # extra: their absence from the manifest says nothing about the checkpoint
+        extra_files = []
+        for rel_path in self._list_snapshot_files():
+            if rel_path in manifest_files:
+                continue
+            try:
+                file_stat = os.stat(os.path.join(str(self.framework_root), rel_path))
+            except OSError:
+                continue
+            if self._is_snapshot_file(file_stat):
+                extra_files.append(rel_path)
+        if extra_files:
+            if self.config.get("rollbackPolicies", {}).get("delete_files_not_in_checkpoint", False):
+                for rel_path in extra_files:
+                    try:
+                        os.unlink(self.framework_root / rel_path)
+                    except OSError as e:
+                        warnings.append(f"Could not remove {rel_path}: {e}")
+            else:
+                warnings.append(f"{len(extra_files)} files not present in checkpoint were left untouched")
+
+        self.stat_cache.save()
+        logger.info(f"Restored {len(restored)} of {len(manifest_files)} files from '{metadata.label}'")
+
         return {
-            "files_restored": 0,
-            "conflicts": [],
-            "warnings": ["File restoration not yet implemented - placeholder"]
+            "files_restored": len(restored),
+            "conflicts": conflicts,
+            "warnings": warnings
         }
 
+    @staticmethod
+    def _is_snapshot_file(file_stat: os.stat_result) -> bool:
+        """Check whether a capture stores a file (regular files only)"""
+        return stat.S_ISREG(file_stat.st_mode)
+
+    def _is_unchanged_by_stat(self, rel_path: str, entry: Dict) -> bool:
+        """Check via the stat cache alone whether a file matches a manifest entry"""
+        try:
+            file_stat = os.stat(os.path.join(str(self.framework_root), rel_path))
+        except OSError:
+            return False
+
+        return (
+            self.stat_cache.lookup(rel_path, file_stat) == entry["hash"]
+            and stat.S_IMODE(file_stat.st_mode) == entry.get("mode", 0o644)
+        )
+
+    def _current_file_hash(self, rel_path: str) -> Optional[str]:
+        """Get content hash of a working tree file (None if missing)"""
+        file_path = os.path.join(str(self.framework_root), rel_path)
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+
+        blob_hash = self.stat_cache.lookup(rel_path, file_stat)
+        if blob_hash is None:
+            blob_hash = self.blob_store.hash_file(Path(file_path))
+            self.stat_cache.update(rel_path, file_stat, blob_hash)
+        return blob_hash
+
+    def _file_differs(self, rel_path: str, entry: Dict) -> bool:
+        """Check whether a working tree file differs from a manifest entry (content or mode)"""
+        if self._current_file_hash(rel_path) != entry["hash"]:
+            return True
+        file_stat = os.stat(self.framework_root / rel_path)
+        return stat.S_IMODE(file_stat.st_mode) != entry.get("mode", 0o644)
+
+    def _checkout_git_paths(self, tree: str, paths: List[str], manifest_files: Dict):
+        """Write changed paths from a git snapshot tree and restore their exact modes"""
+        self.git_backend.checkout(tree, paths)
+
+        for rel_path in paths:
+            target = self.framework_root / rel_path
+            entry = manifest_files[rel_path]
+            os.chmod(target, entry.get("mode", 0o644))
+            self.stat_cache.update(rel_path, os.stat(target), entry["hash"])
+
+    def _restore_file_if_changed(self, rel_path: str, entry: Dict) -> bool:
+        """
+        Restore a single file if it differs from the manifest entry.
+
+        Returns:
+            True if the file (or its mode) was changed
+        """
+        target = self.framework_root / rel_path
+        mode = entry.get("mode", 0o644)
+
+        if self._current_file_hash(rel_path) == entry["hash"]:
+            if stat.S_IMODE(target.stat().st_mode) != mode:
+                os.chmod(target, mode)
+                return True
+            return False
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".cp_restore_")
+        try:
+            os.close(fd)
+            data = self.memory_tier.get(entry["hash"])
+            if data is not None:
+                with open(tmp_name, 'wb') as dst:
+                    dst.write(data)
+            # Raw objects of the link backend are cloned back without copying data
+            elif entry.get("chunks") or not self.blob_store.clone_blob(entry["hash"], Path(tmp_name)):
+                with open(tmp_name, 'wb') as dst, self._open_manifest_entry(entry) as src:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.chmod(tmp_name, mode)
+            os.replace(tmp_name, target)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        self.stat_cache.update(rel_path, os.stat(target), entry["hash"])
+        return True
+
+    @staticmethod
+    def _fsync_path(path: Path):
+        """Flush a file or directory to disk (best effort)"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            # Directory fsync is unsupported on some platforms
+            logger.debug(f"fsync failed for {path}: {e}")
+
     def _restore_git_state(self, metadata: CheckpointMetadata) -> Optional[str]:
         """Restore git state from checkpoint"""
         # Note: We generally don't want to force git checkout as it's dangerous
@@ -778,31 +1884,8 @@ class CheckpointEngine:
         Returns:
             Checkpoint ID if found, None otherwise
         """
-        search_lower = search_text.lower()
-        best_match = None
-        best_score = 0
-
-        for cp_id, cp_data in self.checkpoint_index["checkpoints"].items():
-            metadata = self.get_checkpoint_metadata(cp_id)
-            if not metadata:
-                continue
-
-            # Exact match in searchable text
-            if search_lower in metadata.searchable_text:
-                return cp_id
-
-            # Fuzzy matching
-            if fuzzy:
-                score = self._calculate_fuzzy_score(search_lower, metadata.searchable_text)
-                if score > best_score:
-                    best_score = score
-                    best_match = cp_id
-
-        # Return best fuzzy match if score is high enough
-        if best_match and best_score > 0.3:
-            return best_match
-
-        return None
+        # Ranked lookup in the inverted index (BM25, trigram fuzzy matching)
+        return self.search_index.best_match(search_text, fuzzy=fuzzy)
 
     def find_checkpoint_by_time(self, hours_ago: float) -> Optional[str]:
         """
@@ -816,22 +1899,16 @@ class CheckpointEngine:
         """
         from datetime import timedelta
 
-        target_time = datetime.now() - timedelta(hours=hours_ago)
-        target_iso = target_time.isoformat()
-
-        # Find checkpoint closest to target time
-        closest_cp = None
-        min_diff = float('inf')
+        target_epoch = (datetime.now() - timedelta(hours=hours_ago)).timestamp()
 
-        for cp_id, cp_data in self.checkpoint_index["checkpoints"].items():
-            cp_time = cp_data["timestamp"]
-            time_diff = abs((datetime.fromisoformat(cp_time) - target_time).total_seconds())
-
-            if time_diff < min_diff:
-                min_diff = time_diff
-                closest_cp = cp_id
+        # Find checkpoint closest to target time (bisect on the sorted time index)
+        time_index = self._time_index
+        if not time_index:
+            return None
 
-        return closest_cp
+        position = bisect_left(time_index, (target_epoch, ""))
+        neighbours = time_index[max(position - 1, 0):position + 1]
+        return min(neighbours, key=lambda item: abs(item[0] - target_epoch))[1]
 
     def find_checkpoint_by_agent(self, agent_type: str, last_n: int = 1) -> Optional[str]:
         """
@@ -844,24 +1921,29 @@ class CheckpointEngine:
         Returns:
             Checkpoint ID if found, None otherwise
         """
-        agent_checkpoints = []
+        agent_checkpoints = self.checkpoint_index["agents"].get(agent_type, [])
 
-        for cp_id in self.checkpoint_index["checkpoints"].keys():
-            metadata = self.get_checkpoint_metadata(cp_id)
-            if metadata and metadata.agent_type == agent_type:
-                agent_checkpoints.append((cp_id, metadata.timestamp))
+        # Return nth-last checkpoint (agent index is oldest first)
+        if last_n >= 1 and len(agent_checkpoints) >= last_n:
+            return agent_checkpoints[-last_n]
 
-        if not agent_checkpoints:
-            return None
+        return None
 
-        # Sort by timestamp (newest first)
-        agent_checkpoints.sort(key=lambda x: x[1], reverse=True)
+    def get_agent_checkpoint_ids(self, agent_type: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Get checkpoint IDs created for an agent type.
 
-        # Return nth-last checkpoint
-        if len(agent_checkpoints) >= last_n:
-            return agent_checkpoints[last_n - 1][0]
+        Args:
+            agent_type: Agent type
+            limit: Optional maximum number of (most recent) IDs
 
-        return None
+        Returns:
+            Checkpoint IDs, oldest first
+        """
+        agent_checkpoints = self.checkpoint_index["agents"].get(agent_type, [])
+        if limit is not None:
+            return agent_checkpoints[-limit:] if limit > 0 else []
+        return list(agent_checkpoints)
 
     def find_checkpoint_by_category(self, category: CheckpointCategory) -> Optional[str]:
         """
@@ -878,8 +1960,8 @@ class CheckpointEngine:
         if not category_checkpoints:
             return None
 
-        # Get most recent
-        return category_checkpoints[0] if category_checkpoints else None
+        # Get most recent (category index is oldest first)
+        return category_checkpoints[-1]
 
     def rewind_by_steps(self, steps: int = 1) -> Optional[str]:
         """
@@ -898,21 +1980,6 @@ class CheckpointEngine:
 
         return None
 
-    def _calculate_fuzzy_score(self, search_text: str, target_text: str) -> float:
-        """Calculate fuzzy matching score (0.0 to 1.0)"""
-        if not search_text or not target_text:
-            return 0.0
-
-        # Simple fuzzy matching based on word overlap
-        search_words = set(search_text.split())
-        target_words = set(target_text.split())
-
-        if not search_words:
-            return 0.0
-
-        overlap = len(search_words.intersection(target_words))
-        return overlap / len(search_words)
-
     def semantic_rewind(self, rewind_command: str, dry_run: bool = False) -> RollbackResult:
         """
         Perform semantic rewind using natural language.
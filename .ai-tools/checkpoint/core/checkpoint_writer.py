@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Checkpoint Writer for Advanced Checkpoint System
+
+Commits asynchronously created checkpoints (metadata, manifest and index
+record) on a single background thread, so checkpoint creation stays off
+the agent's critical path.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Single writer thread serializes index updates
+- Coalesced journal fsync per drained batch
+- Flush barrier for durability before rollback and at exit
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of checkpoints committed per journal fsync
+MAX_BATCH_SIZE = 64
+
+
+class CheckpointHandle:
+    """
+    Handle of an asynchronously created checkpoint.
+
+    The checkpoint ID is assigned immediately; ``result()`` returns it once
+    the checkpoint is durably committed (or None if creation failed).
+    """
+
+    def __init__(self, checkpoint_id: Optional[str], future: Future):
+        self.checkpoint_id = checkpoint_id
+        self.future = future
+
+    def done(self) -> bool:
+        """Check whether the checkpoint has been committed (or failed)"""
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Wait for the commit and return the checkpoint ID (None on failure)"""
+        return self.future.result(timeout)
+
+
+class CheckpointWriter:
+    """
+    Background committer for pending checkpoints.
+    """
+
+    def __init__(self, checkpoint_engine):
+        """
+        Initialize checkpoint writer.
+
+        Args:
+            checkpoint_engine: CheckpointEngine instance
+        """
+        self.checkpoint_engine = checkpoint_engine
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, pending, capture: bool) -> Future:
+        """
+        Queue a pending checkpoint for commit.
+
+        Args:
+            pending: PendingCheckpoint from the engine
+            capture: Capture state on the writer thread before committing
+
+        Returns:
+            Future resolving to the checkpoint ID (None on failure)
+        """
+        future = Future()
+        with self._lock:
+            self._outstanding += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+                self._thread.start()
+                # Do not lose queued checkpoints when the process exits normally
+                atexit.register(self.flush)
+        self._queue.put((pending, capture, future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued checkpoint is committed and its index record
+        is on disk.
+
+        Returns:
+            True if the writer is idle, False on timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._outstanding == 0, timeout)
+
+    def on_writer_thread(self) -> bool:
+        """Check whether the caller is the writer thread"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    @property
+    def pending_count(self) -> int:
+        """Number of checkpoints queued or being committed"""
+        return self._outstanding
+
+    def _run(self):
+        """Writer loop: commit queued checkpoints in batches"""
+        engine = self.checkpoint_engine
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            results = []
+            for pending, capture, future in batch:
+                checkpoint_id = None
+                try:
+                    if capture:
+                        engine._capture_checkpoint_state(pending)
+                    checkpoint_id = engine._commit_checkpoint(pending, sync=False)
+                except Exception as e:
+                    logger.error(f"Error committing checkpoint {pending.metadata.checkpoint_id}: {e}")
+                    engine._abandon_checkpoint(pending)
+                results.append((future, checkpoint_id))
+
+            # One fsync makes the whole batch of index records durable
+            try:
+                engine.index_journal.sync()
+            except Exception as e:
+                logger.error(f"Error syncing checkpoint index journal: {e}")
+
+            for future, checkpoint_id in results:
+                future.set_result(checkpoint_id)
+
+            with self._idle:
+                self._outstanding -= len(batch)
+                if self._outstanding == 0:
+                    self._idle.notify_all()
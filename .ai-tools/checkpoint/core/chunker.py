@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Content-Defined Chunker for Advanced Checkpoint System
+
+Splits large files into chunks whose boundaries depend only on nearby
+content, so an edit in one place of a large file changes only the chunks
+around it and every other chunk deduplicates against earlier checkpoints.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Rolling window hash evaluated at line ends (text files resynchronize after
+  insertions and deletions)
+- Minimum and maximum chunk sizes (max-size cuts for files without newlines)
+- Operates on any buffer (bytes or mmap) without copying the file
+
+Limitation: only line ends are boundary candidates, so files without
+newlines (most binary files, minified assets) are cut every
+``DEFAULT_MAX_CHUNK_SIZE`` bytes. Those chunks still deduplicate unchanged
+data at the same offsets, but an insertion or deletion shifts every
+following chunk. Hashing at every byte position would fix that, at a cost
+this pure Python chunker cannot pay on large files.
+"""
+
+import zlib
+from typing import Iterator, Tuple
+
+# Bytes before a candidate boundary that decide whether to cut there
+WINDOW_SIZE = 48
+
+DEFAULT_MIN_CHUNK_SIZE = 2 * 1024
+DEFAULT_AVG_CHUNK_SIZE = 8 * 1024
+DEFAULT_MAX_CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunk_boundaries(
+    data,
+    min_size: int = DEFAULT_MIN_CHUNK_SIZE,
+    avg_size: int = DEFAULT_AVG_CHUNK_SIZE,
+    max_size: int = DEFAULT_MAX_CHUNK_SIZE
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) offsets of content-defined chunks.
+
+    A newline at least ``min_size`` bytes into a chunk ends it when the hash
+    of the ``WINDOW_SIZE`` bytes before it matches the cut mask. Assuming
+    lines of roughly 80 bytes, the mask is chosen so chunks average about
+    ``avg_size`` bytes. Chunks never exceed ``max_size``.
+
+    Args:
+        data: bytes-like object supporting find() and slicing (bytes, mmap)
+        min_size: Minimum chunk size
+        avg_size: Target average chunk size
+        max_size: Maximum chunk size
+    """
+    length = len(data)
+    # Candidate boundaries are line ends, so cut with probability 1/mask per line
+    lines_per_chunk = max(1, (avg_size - min_size) // 80)
+    mask = (1 << max(0, lines_per_chunk.bit_length() - 1)) - 1
+
+    start = 0
+    while start < length:
+        limit = min(start + max_size, length)
+        end = limit
+        pos = start + min_size - 1
+
+        while pos < limit:
+            pos = data.find(b"\n", pos, limit)
+            if pos < 0:
+                break
+            cut = pos + 1
+            if zlib.crc32(data[max(start, cut - WINDOW_SIZE):cut]) & mask == 0:
+                end = cut
+                break
+            pos = cut
+
+        yield start, end
+        start = end
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Conflict Index for Advanced Checkpoint System
+
+Inverted index of the files each agent has modified, so conflict detection
+only looks at the paths touched by the agent being checked instead of
+intersecting its file set with every other agent's.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- path -> {agents} map for exact file overlap
+- Path trie with per-agent subtree counts for directory-level overlap
+- Per-directory file counts, so sibling files of different agents overlap too
+- Incremental updates; a check costs O(paths of the agent x path depth)
+"""
+
+import posixpath
+from typing import Dict, Iterable, Set
+
+
+class _TrieNode:
+    __slots__ = ("children", "subtree", "files")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # agent -> number of that agent's paths at or below this node
+        self.subtree: Dict[str, int] = {}
+        # agent -> number of that agent's paths directly in this directory
+        self.files: Dict[str, int] = {}
+
+
+class FileConflictIndex:
+    """
+    Index of agent-modified paths.
+
+    A path registered by one agent overlaps another agent's path if they are
+    equal (file overlap), or one is a directory containing the other or both
+    are in the same (non-root) directory (directory overlap).
+    """
+
+    def __init__(self):
+        self.paths: Dict[str, Set[str]] = {}
+        self._root = _TrieNode()
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """Normalize a relative path ("./src//api/" -> "src/api")"""
+        return posixpath.normpath(path.replace("\\", "/")).strip("/")
+
+    def add(self, agent_type: str, paths: Iterable[str]):
+        """Register paths modified by an agent"""
+        for path in paths:
+            path = self.normalize(path)
+            if not path or path == ".":
+                continue
+            agents = self.paths.setdefault(path, set())
+            if agent_type in agents:
+                continue
+            agents.add(agent_type)
+
+            parts = path.split("/")
+            node = self._root
+            for depth, part in enumerate(parts):
+                if depth == len(parts) - 1 and depth > 0:
+                    node.files[agent_type] = node.files.get(agent_type, 0) + 1
+                node = node.children.setdefault(part, _TrieNode())
+                node.subtree[agent_type] = node.subtree.get(agent_type, 0) + 1
+
+    def find_overlaps(self, agent_type: str, paths: Iterable[str]) -> Dict[str, Dict[str, Set[str]]]:
+        """
+        Find other agents' paths overlapping the given ones.
+
+        Args:
+            agent_type: Agent the paths belong to (its own paths never conflict)
+            paths: Paths to check
+
+        Returns:
+            {"files": {other_agent: paths}, "directories": {other_agent: paths}},
+            listing the checked paths involved in each overlap
+        """
+        files: Dict[str, Set[str]] = {}
+        directories: Dict[str, Set[str]] = {}
+
+        for original in paths:
+            path = self.normalize(original)
+            if not path or path == ".":
+                continue
+
+            parts = path.split("/")
+            exact = self.paths.get(path, ())
+            node = self._root
+            prefix = ""
+            for depth, part in enumerate(parts):
+                if depth == len(parts) - 1 and depth > 0:
+                    # Another agent registered files in the same directory
+                    for other, count in node.files.items():
+                        if other != agent_type and count > (1 if other in exact else 0):
+                            directories.setdefault(other, set()).add(original)
+                node = node.children.get(part)
+                if node is None:
+                    break
+                prefix = f"{prefix}/{part}" if prefix else part
+                if depth < len(parts) - 1:
+                    # Another agent registered a directory containing this path
+                    for other in self.paths.get(prefix, ()):
+                        if other != agent_type:
+                            directories.setdefault(other, set()).add(original)
+            else:
+                for other in exact:
+                    if other != agent_type:
+                        files.setdefault(other, set()).add(original)
+                # Another agent registered paths below this one (it is a directory)
+                for other, count in node.subtree.items():
+                    if other != agent_type and count > (1 if other in exact else 0):
+                        directories.setdefault(other, set()).add(original)
+
+        return {"files": files, "directories": directories}
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Cross-Process File Lock for Advanced Checkpoint System
+
+Advisory locks (fcntl.flock) that serialize checkpoint storage mutations
+between processes: parallel agents, git hooks and the auto-trigger system.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Exclusive and shared lock modes on one lock file
+- Reentrant within a process (counted acquisitions)
+- Falls back to in-process locking where fcntl is unavailable
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """
+    Advisory lock on a lock file.
+
+    Exclusive and shared holders use separate file descriptors, so they
+    exclude each other inside one process exactly as they do across
+    processes. Shared acquisitions are counted rather than thread-owned and
+    may be released from a different thread.
+    """
+
+    def __init__(self, lock_file: Path):
+        """
+        Initialize file lock.
+
+        Args:
+            lock_file: Path of the lock file (created on first use)
+        """
+        self.lock_file = Path(lock_file)
+
+        self._exclusive_lock = threading.RLock()
+        self._exclusive_fd: Optional[int] = None
+        self._exclusive_depth = 0
+
+        self._shared_mutex = threading.Lock()
+        self._shared_fd: Optional[int] = None
+        self._shared_count = 0
+
+        if not FCNTL_AVAILABLE:
+            logger.warning("fcntl unavailable - checkpoint storage is only safe for a single process")
+
+    def _open(self) -> int:
+        return os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the lock exclusively (reentrant for the owning thread)"""
+        with self._exclusive_lock:
+            if self._exclusive_depth == 0 and FCNTL_AVAILABLE:
+                fd = self._open()
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except Exception:
+                    os.close(fd)
+                    raise
+                self._exclusive_fd = fd
+            self._exclusive_depth += 1
+            try:
+                yield
+            finally:
+                self._exclusive_depth -= 1
+                if self._exclusive_depth == 0 and self._exclusive_fd is not None:
+                    fcntl.flock(self._exclusive_fd, fcntl.LOCK_UN)
+                    os.close(self._exclusive_fd)
+                    self._exclusive_fd = None
+
+    def acquire_shared(self):
+        """Take a shared hold (blocks while another holder is exclusive)"""
+        with self._shared_mutex:
+            if self._shared_count == 0 and FCNTL_AVAILABLE:
+                fd = self._open()
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_SH)
+                except Exception:
+                    os.close(fd)
+                    raise
+                self._shared_fd = fd
+            self._shared_count += 1
+
+    def release_shared(self):
+        """Drop a shared hold"""
+        with self._shared_mutex:
+            if self._shared_count == 0:
+                return
+            self._shared_count -= 1
+            if self._shared_count == 0 and self._shared_fd is not None:
+                fcntl.flock(self._shared_fd, fcntl.LOCK_UN)
+                os.close(self._shared_fd)
+                self._shared_fd = None
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """Hold the lock in shared mode"""
+        self.acquire_shared()
+        try:
+            yield
+        finally:
+            self.release_shared()
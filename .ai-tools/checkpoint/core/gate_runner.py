@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Gate Command Runner for Advanced Checkpoint System
+
+Runs quality gate commands concurrently, so a gate takes about as long as
+its slowest command instead of the sum of all of them.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Bounded number of concurrently running commands
+- Per-command timeouts
+- Optional fail-fast: the first failure kills all running commands
+- Each command runs in its own process group, so its children are killed too
+"""
+
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 300
+
+
+@dataclass
+class GateCommand:
+    """A quality gate command"""
+    command: str
+    timeout: float = DEFAULT_TIMEOUT_SECONDS
+    # Glob patterns selecting the files passed to a {files} command
+    file_patterns: List[str] = field(default_factory=list)
+    # Files the command was expanded with, and the unexpanded command
+    files: Optional[List[str]] = None
+    template: Optional[str] = None
+    # Content hashes of the files, taken before the command runs
+    file_hashes: Optional[Dict[str, str]] = None
+    # HEAD when the files were selected (the next run diffs against it if this one passes)
+    revision: Optional[str] = None
+
+
+@dataclass
+class CommandResult:
+    """Result of one gate command"""
+    command: str
+    success: bool
+    returncode: Optional[int] = None
+    errors: List[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+    timed_out: bool = False
+    cancelled: bool = False
+
+
+def _kill_process_group(process: subprocess.Popen):
+    """Kill a command and every process it started"""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        # Already exited
+        pass
+
+
+class GateCommandRunner:
+    """
+    Concurrent runner of shell commands.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, fail_fast: bool = False, cwd: Optional[str] = None):
+        """
+        Initialize runner.
+
+        Args:
+            max_workers: Commands run at the same time (default: one per CPU)
+            fail_fast: Kill the remaining commands once one fails
+            cwd: Working directory of the commands
+        """
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.fail_fast = fail_fast
+        self.cwd = cwd
+
+        self._failed = threading.Event()
+        self._running: Dict[int, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+
+    def run(self, commands: List[GateCommand]) -> List[CommandResult]:
+        """
+        Run commands concurrently.
+
+        Returns:
+            One result per command, in the order given
+        """
+        self._failed.clear()
+        if not commands:
+            return []
+
+        workers = min(self.max_workers, len(commands))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quality-gate") as executor:
+            return list(executor.map(self._run_command, commands))
+
+    def _run_command(self, gate_command: GateCommand) -> CommandResult:
+        command = gate_command.command
+        if self._failed.is_set():
+            return CommandResult(command=command, success=False, cancelled=True)
+
+        started = time.perf_counter()
+        try:
+            process = subprocess.Popen(
+                command,
+                shell=True,
+                cwd=self.cwd,
+                # Gates are non-interactive (a command given no files must not wait for input)
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                # Own process group, so a kill also reaches the shell's children
+                start_new_session=(os.name == "posix")
+            )
+        except Exception as e:
+            return self._finish(CommandResult(
+                command=command, success=False, errors=[f"Error executing gate command: {str(e)}"]
+            ))
+
+        with self._lock:
+            self._running[process.pid] = process
+            cancelled = self._failed.is_set()
+        if cancelled:
+            # Fail-fast triggered while this command was starting
+            _kill_process_group(process)
+
+        try:
+            _, stderr = process.communicate(timeout=gate_command.timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(process)
+            process.communicate()
+            return self._finish(CommandResult(
+                command=command,
+                success=False,
+                errors=[f"Quality gate command timed out ({gate_command.timeout:g}s): {command}"],
+                duration_seconds=time.perf_counter() - started,
+                timed_out=True
+            ))
+        finally:
+            with self._lock:
+                self._running.pop(process.pid, None)
+
+        duration = time.perf_counter() - started
+        if process.returncode == 0:
+            return CommandResult(command=command, success=True, returncode=0, duration_seconds=duration)
+
+        if self._failed.is_set() and process.returncode < 0:
+            # Killed because another command failed
+            return CommandResult(
+                command=command, success=False, returncode=process.returncode,
+                duration_seconds=duration, cancelled=True
+            )
+
+        return self._finish(CommandResult(
+            command=command,
+            success=False,
+            returncode=process.returncode,
+            errors=stderr.strip().split("\n") if stderr and stderr.strip() else ["Command failed"],
+            duration_seconds=duration
+        ))
+
+    def _finish(self, result: CommandResult) -> CommandResult:
+        """Record a failure and, in fail-fast mode, kill the other commands"""
+        if self.fail_fast and not self._failed.is_set():
+            self._failed.set()
+            with self._lock:
+                running = list(self._running.values())
+            if running:
+                logger.info(f"Gate command failed - cancelling {len(running)} running commands")
+            for process in running:
+                _kill_process_group(process)
+        return result
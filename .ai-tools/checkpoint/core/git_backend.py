@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Git Snapshot Backend for Advanced Checkpoint System
+
+Records checkpoint file snapshots as git tree objects in the project's own
+object database, under a hidden ref namespace, so snapshots get git's
+delta compression and packing without a second copy of the repository.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Trees built with `git write-tree` over a private index (never the user's)
+- Private index keeps git's stat cache, so unchanged files are not rehashed
+- One ref per checkpoint (refs/checkpoints/<id>) keeps trees reachable
+- Restore of only the changed paths via `read-tree` + `checkout-index`
+"""
+
+import io
+import logging
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Set
+
+from .file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+# Ref namespace of checkpoint trees (not fetched or pushed by default)
+REF_NAMESPACE = "refs/checkpoints/"
+
+
+class GitSnapshotBackend:
+    """
+    Snapshot storage in a git object database.
+
+    Paths are relative to the work tree directory, as elsewhere in the engine.
+    """
+
+    def __init__(self, work_tree: Path, storage_base: Path):
+        """
+        Initialize git backend.
+
+        Args:
+            work_tree: Project directory (inside a git working tree)
+            storage_base: Checkpoint storage directory (holds the private index)
+        """
+        self.work_tree = Path(work_tree)
+        self.index_file = Path(storage_base) / "git_snapshot_index"
+        # git's own index.lock would fail a concurrent writer instead of waiting
+        self._lock = FileLock(Path(storage_base) / ".git_snapshot.lock")
+
+    @staticmethod
+    def is_available(work_tree: Path) -> bool:
+        """Check whether the directory is inside a git working tree"""
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "--is-inside-work-tree"],
+                cwd=work_tree,
+                capture_output=True,
+                timeout=10
+            )
+            return result.returncode == 0 and result.stdout.strip() == b"true"
+        except Exception:
+            return False
+
+    def _git(self, args: List[str], index_file: Optional[Path] = None, stdin: Optional[bytes] = None) -> bytes:
+        """Run a git command in the work tree and return its stdout"""
+        env = None
+        if index_file is not None:
+            env = dict(os.environ, GIT_INDEX_FILE=str(index_file))
+        result = subprocess.run(
+            ["git", *args],
+            cwd=self.work_tree,
+            input=stdin,
+            capture_output=True,
+            env=env,
+            timeout=300
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout
+
+    def snapshot(self, paths: Iterable[str]) -> Dict:
+        """
+        Write a tree of the given work tree files.
+
+        Args:
+            paths: Files to include (relative POSIX paths); all others are dropped
+
+        Returns:
+            {"tree": tree_id, "blobs": {path: blob_id}}
+        """
+        wanted = set(paths)
+        with self._lock.exclusive():
+            staged = self._list_index(self.index_file)
+            removed = [path for path in staged if path not in wanted]
+
+            if removed:
+                self._git(
+                    ["update-index", "-z", "--force-remove", "--stdin"],
+                    self.index_file, self._nul_join(removed)
+                )
+            # Only files whose stat data changed since the last snapshot are rehashed
+            self._git(
+                ["update-index", "-z", "--add", "--remove", "--stdin"],
+                self.index_file, self._nul_join(sorted(wanted))
+            )
+
+            tree = self._git(["write-tree"], self.index_file).decode().strip()
+            blobs = self._list_index(self.index_file)
+
+        return {"tree": tree, "blobs": {path: blobs[path] for path in wanted if path in blobs}}
+
+    def _list_index(self, index_file: Path) -> Dict[str, str]:
+        """List path -> blob id of an index file"""
+        if not index_file.exists():
+            return {}
+
+        blobs = {}
+        for record in self._git(["ls-files", "-s", "-z"], index_file).split(b"\0"):
+            if not record:
+                continue
+            info, path = record.split(b"\t", 1)
+            blobs[path.decode("utf-8", "surrogateescape")] = info.split()[1].decode()
+        return blobs
+
+    @staticmethod
+    def _nul_join(paths: Iterable[str]) -> bytes:
+        return b"".join(path.encode("utf-8", "surrogateescape") + b"\0" for path in paths)
+
+    def save_ref(self, checkpoint_id: str, tree: str):
+        """Point the checkpoint's ref at its tree (keeps it reachable for git gc)"""
+        self._git(["update-ref", REF_NAMESPACE + checkpoint_id, tree])
+
+    def delete_refs(self, checkpoint_ids: Iterable[str]):
+        """Drop checkpoint refs; git gc later prunes trees no longer reachable"""
+        commands = "".join(f"delete {REF_NAMESPACE}{checkpoint_id}\n" for checkpoint_id in checkpoint_ids)
+        if commands:
+            self._git(["update-ref", "--stdin"], stdin=commands.encode())
+
+    def open_blob(self, blob_id: str) -> BinaryIO:
+        """Open a blob's content for reading"""
+        return io.BytesIO(self._git(["cat-file", "blob", blob_id]))
+
+    def missing_objects(self, object_ids: Iterable[str]) -> Set[str]:
+        """Get the object IDs not present in the object database"""
+        object_ids = list(object_ids)
+        output = self._git(["cat-file", "--batch-check"], stdin="".join(f"{oid}\n" for oid in object_ids).encode())
+        return {
+            line.split()[0] for line in output.decode().splitlines()
+            if line.endswith(" missing")
+        }
+
+    def checkout(self, tree: str, paths: List[str]):
+        """
+        Write the given paths of a tree into the work tree.
+
+        Uses a throwaway index, so neither the user's index nor the snapshot
+        index is touched.
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=self.index_file.parent, prefix=".tmp_git_index_")
+        os.close(fd)
+        os.unlink(tmp_name)
+        index_file = Path(tmp_name)
+        try:
+            self._git(["read-tree", tree], index_file)
+            self._git(["checkout-index", "-f", "-z", "--stdin"], index_file, self._nul_join(paths))
+        finally:
+            if index_file.exists():
+                index_file.unlink()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Git State Reader for Advanced Checkpoint System
+
+Captures commit, branch and working tree status for checkpoints with a
+single git subprocess, and caches the result between checkpoints.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- HEAD and branch read directly from .git (loose refs, packed-refs, worktrees)
+- One `git status --porcelain=v2 --branch -z` call for the working tree status
+- Cache keyed on .git/HEAD and .git/index mtimes with a short TTL
+"""
+
+import copy
+import logging
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class GitStateReader:
+    """
+    Cached git state capture for a working tree.
+
+    Status entries are reported in `git status --porcelain` (v1) line format
+    ("XY path", "XY orig -> path", "?? path") for compatibility with stored
+    checkpoint metadata.
+    """
+
+    def __init__(self, work_tree: Path, cache_seconds: float = 2.0):
+        """
+        Initialize git state reader.
+
+        Args:
+            work_tree: Directory inside the repository working tree
+            cache_seconds: Maximum age of a cached state (0 disables caching)
+        """
+        self.work_tree = Path(work_tree)
+        self.cache_seconds = cache_seconds
+        self.git_dir, self.common_dir = self._find_git_dirs(self.work_tree)
+
+        self._lock = threading.Lock()
+        self._cached_state: Optional[Dict] = None
+        self._cached_key: Optional[Tuple] = None
+        self._cached_at = 0.0
+
+    @staticmethod
+    def _find_git_dirs(work_tree: Path) -> Tuple[Optional[Path], Optional[Path]]:
+        """Locate the git directory (and common directory for linked worktrees)"""
+        for directory in [work_tree, *work_tree.parents]:
+            dot_git = directory / ".git"
+            if dot_git.is_dir():
+                return dot_git, dot_git
+            if dot_git.is_file():
+                # Linked worktree or submodule: "gitdir: <path>"
+                try:
+                    content = dot_git.read_text().strip()
+                except OSError:
+                    return None, None
+                if not content.startswith("gitdir:"):
+                    return None, None
+                git_dir = Path(content[len("gitdir:"):].strip())
+                if not git_dir.is_absolute():
+                    git_dir = (directory / git_dir).resolve()
+
+                common_dir = git_dir
+                commondir_file = git_dir / "commondir"
+                if commondir_file.exists():
+                    common_dir = Path(commondir_file.read_text().strip())
+                    if not common_dir.is_absolute():
+                        common_dir = (git_dir / common_dir).resolve()
+                return git_dir, common_dir
+        return None, None
+
+    def invalidate(self):
+        """Drop the cached state (e.g. after the working tree was rewritten)"""
+        with self._lock:
+            self._cached_state = None
+            self._cached_key = None
+
+    def capture(self) -> Dict:
+        """
+        Capture current git state.
+
+        Returns:
+            Dict with optional "commit", "branch" and "status" ({"clean", "changes"}) keys
+        """
+        with self._lock:
+            key = self._cache_key()
+            if (
+                self._cached_state is not None
+                and key == self._cached_key
+                and time.monotonic() - self._cached_at < self.cache_seconds
+            ):
+                return copy.deepcopy(self._cached_state)
+
+            git_state = self._read_state()
+
+            self._cached_state = git_state
+            # git status may refresh the index, so key on the state after the call
+            self._cached_key = self._cache_key()
+            self._cached_at = time.monotonic()
+            return copy.deepcopy(git_state)
+
+    def _cache_key(self) -> Optional[Tuple]:
+        """Mtimes of HEAD and index (None if the repository layout is unknown)"""
+        if self.git_dir is None:
+            return None
+        key = []
+        for name in ("HEAD", "index"):
+            try:
+                key.append((self.git_dir / name).stat().st_mtime_ns)
+            except OSError:
+                key.append(None)
+        return tuple(key)
+
+    def _read_state(self) -> Dict:
+        """Read commit, branch and status"""
+        git_state = {}
+
+        head = self._read_head()
+        if head is not None:
+            commit, branch = head
+            if commit:
+                git_state["commit"] = commit
+            git_state["branch"] = branch
+
+        try:
+            result = subprocess.run(
+                ["git", "--no-optional-locks", "status", "--porcelain=v2", "--branch", "-z"],
+                cwd=self.work_tree,
+                capture_output=True,
+                timeout=5
+            )
+            if result.returncode == 0:
+                headers, changes = self._parse_status_v2(result.stdout.decode("utf-8", "surrogateescape"))
+                if head is None:
+                    # Fall back to the branch headers when .git could not be read
+                    oid = headers.get("branch.oid")
+                    if oid and oid != "(initial)":
+                        git_state["commit"] = oid
+                    branch_head = headers.get("branch.head")
+                    git_state["branch"] = "" if branch_head in (None, "(detached)") else branch_head
+
+                git_state["status"] = {
+                    "clean": len(changes) == 0,
+                    "changes": changes
+                }
+        except Exception as e:
+            logger.warning(f"Error capturing git state: {e}")
+
+        return git_state
+
+    def _read_head(self) -> Optional[Tuple[Optional[str], str]]:
+        """
+        Read HEAD from the git directory.
+
+        Returns:
+            (commit or None if unborn, branch or "" if detached), or None if unreadable
+        """
+        if self.git_dir is None:
+            return None
+
+        try:
+            head = (self.git_dir / "HEAD").read_text().strip()
+        except OSError:
+            return None
+
+        if not head.startswith("ref:"):
+            return head, ""
+
+        ref = head[len("ref:"):].strip()
+        branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ""
+        return self._resolve_ref(ref), branch
+
+    def _resolve_ref(self, ref: str) -> Optional[str]:
+        """Resolve a ref to a commit hash (loose refs first, then packed-refs)"""
+        for directory in (self.git_dir, self.common_dir):
+            try:
+                value = (directory / ref).read_text().strip()
+            except OSError:
+                continue
+            if value.startswith("ref:"):
+                return self._resolve_ref(value[len("ref:"):].strip())
+            return value
+
+        try:
+            with open(self.common_dir / "packed-refs", 'r') as f:
+                for line in f:
+                    if line.startswith(("#", "^")):
+                        continue
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+        except OSError:
+            pass
+
+        return None
+
+    @staticmethod
+    def _parse_status_v2(output: str) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Parse `git status --porcelain=v2 --branch -z` output.
+
+        Returns:
+            (branch headers, changes as porcelain v1 lines)
+        """
+        headers = {}
+        changes = []
+        tokens = output.split("\0")
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            i += 1
+            if not token:
+                continue
+
+            kind = token[0]
+            if kind == "#":
+                parts = token[2:].split(" ", 1)
+                if len(parts) == 2:
+                    headers[parts[0]] = parts[1]
+            elif kind == "1":
+                fields = token.split(" ", 8)
+                changes.append(f"{fields[1].replace('.', ' ')} {fields[8]}")
+            elif kind == "2":
+                fields = token.split(" ", 9)
+                # Rename/copy entries are followed by the original path
+                orig_path = tokens[i] if i < len(tokens) else ""
+                i += 1
+                changes.append(f"{fields[1].replace('.', ' ')} {orig_path} -> {fields[9]}")
+            elif kind == "u":
+                fields = token.split(" ", 10)
+                changes.append(f"{fields[1]} {fields[10]}")
+            elif kind == "?":
+                changes.append(f"?? {token[2:]}")
+            elif kind == "!":
+                changes.append(f"!! {token[2:]}")
+
+        return headers, changes
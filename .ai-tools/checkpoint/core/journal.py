@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Append-Only Journal for Advanced Checkpoint System
+
+Crash-safe JSON-lines journal used to persist incremental state changes
+without rewriting whole state files. State owners periodically compact the
+journal into an atomically written snapshot.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- O(1) appends (single O_APPEND write per record)
+- Torn-write tolerant replay
+- Atomic snapshot writes (temp file + fsync + rename)
+- Incremental tail replay of records appended by other processes
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+def fsync_directory(directory: Path):
+    """Flush a directory entry to disk (best effort)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        # Directory fsync is unsupported on some platforms
+        pass
+
+
+def atomic_write_json(path: Path, data: Any, fsync: bool = True):
+    """
+    Write JSON to a file atomically.
+
+    The data is written to a temporary file in the same directory and renamed
+    over the target, so readers never observe a partially written file.
+    """
+    atomic_write_bytes(path, json.dumps(data, separators=(",", ":")).encode("utf-8"), fsync=fsync)
+
+
+def atomic_write_bytes(path: Path, data: bytes, fsync: bool = True):
+    """Write bytes to a file atomically (temp file + rename)"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except Exception:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    if fsync:
+        fsync_directory(path.parent)
+
+
+class AppendOnlyJournal:
+    """
+    JSON-lines journal of state change records.
+    """
+
+    def __init__(self, journal_file: Path):
+        """
+        Initialize journal.
+
+        Args:
+            journal_file: Path of the journal file
+        """
+        self.journal_file = Path(journal_file)
+        self.entry_count = 0
+        # Bytes of the journal already applied by this process
+        self.offset = 0
+
+    def append(self, record: Dict, sync: bool = True):
+        """
+        Append a record.
+
+        Args:
+            record: JSON-serializable record
+            sync: fsync after writing (set False to batch several appends)
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        fd = os.open(self.journal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            if sync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.entry_count += 1
+        self.offset += len(line)
+
+    def size(self) -> int:
+        """Current journal size in bytes"""
+        try:
+            return self.journal_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def sync(self):
+        """Flush previously appended records to disk"""
+        if not self.journal_file.exists():
+            return
+        fd = os.open(self.journal_file, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def replay(self, start_offset: int = 0) -> Iterator[Dict]:
+        """
+        Iterate over journal records in append order.
+
+        A torn final line (crash during append) is skipped and cut off so
+        later appends start on a clean line. Callers sharing the journal with
+        other processes must hold the storage lock.
+
+        Args:
+            start_offset: Byte offset to resume from (records appended by
+                other processes since the last replay)
+        """
+        if start_offset == 0:
+            self.entry_count = 0
+        self.offset = start_offset
+        if not self.journal_file.exists():
+            return
+
+        good_offset = start_offset
+        torn = False
+        with open(self.journal_file, 'rb') as f:
+            f.seek(start_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    torn = True
+                    break
+                good_offset += len(line)
+                self.offset = good_offset
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping corrupt journal record in {self.journal_file.name}")
+                    continue
+                self.entry_count += 1
+                yield record
+
+        if torn:
+            logger.warning(f"Discarding torn journal record in {self.journal_file.name}")
+            os.truncate(self.journal_file, good_offset)
+
+    def truncate(self):
+        """Discard all records (after their state has been compacted)"""
+        with open(self.journal_file, 'wb') as f:
+            os.fsync(f.fileno())
+        self.entry_count = 0
+        self.offset = 0
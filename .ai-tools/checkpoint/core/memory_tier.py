@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Memory Tier for Advanced Checkpoint System
+
+Keeps the contents of files changed by the most recent checkpoints in RAM,
+so rolling back a few steps within a session restores them without any
+disk read or decompression. The tier is write-through: every checkpoint is
+also fully stored on disk, so demoting a checkpoint just drops its contents
+from memory.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Bounded by checkpoint count and total bytes (oldest checkpoints demoted first)
+- Contents shared between checkpoints by content hash
+- Demotion under system memory pressure (when psutil is installed)
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryTier:
+    """
+    In-memory tier of recent checkpoint file contents, keyed by content hash.
+    """
+
+    def __init__(self, max_bytes: int, max_checkpoints: int, min_available_bytes: int = 0):
+        """
+        Initialize memory tier.
+
+        Args:
+            max_bytes: Total content size limit (0 disables the tier)
+            max_checkpoints: Number of most recent checkpoints kept
+            min_available_bytes: Demote checkpoints while system available memory is below this
+        """
+        self.max_bytes = max_bytes
+        self.max_checkpoints = max_checkpoints
+        self.min_available_bytes = min_available_bytes
+        # A single file may take at most this share of the tier
+        self.max_entry_bytes = max_bytes // 8
+
+        self.checkpoints: "OrderedDict[str, Set[str]]" = OrderedDict()
+        # content hash -> [data, number of checkpoints referencing it]
+        self.contents: Dict[str, list] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.max_checkpoints > 0
+
+    def add_checkpoint(self, checkpoint_id: str, contents: Dict[str, bytes]):
+        """
+        Promote a new checkpoint's changed-file contents.
+
+        Contents beyond the tier's byte limit are left on disk, so the new
+        checkpoint itself is never demoted to make room.
+
+        Args:
+            checkpoint_id: Checkpoint ID
+            contents: Content hash -> file content
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._discard_locked(checkpoint_id)
+            hashes = set()
+            promoted_bytes = 0
+            for blob_hash, data in contents.items():
+                if len(data) > self.max_entry_bytes or promoted_bytes + len(data) > self.max_bytes:
+                    continue
+                promoted_bytes += len(data)
+                entry = self.contents.get(blob_hash)
+                if entry is None:
+                    self.contents[blob_hash] = [data, 1]
+                    self.total_bytes += len(data)
+                else:
+                    entry[1] += 1
+                hashes.add(blob_hash)
+            self.checkpoints[checkpoint_id] = hashes
+
+            while len(self.checkpoints) > 1 and (
+                len(self.checkpoints) > self.max_checkpoints or self.total_bytes > self.max_bytes
+            ):
+                self._demote_oldest_locked()
+
+        self._relieve_memory_pressure()
+
+    def get(self, blob_hash: str) -> Optional[bytes]:
+        """Get content by hash (None if not held in memory)"""
+        entry = self.contents.get(blob_hash)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def discard(self, checkpoint_id: str):
+        """Drop a deleted checkpoint's contents"""
+        with self._lock:
+            self._discard_locked(checkpoint_id)
+
+    def clear(self):
+        """Demote all checkpoints"""
+        with self._lock:
+            self.checkpoints.clear()
+            self.contents.clear()
+            self.total_bytes = 0
+
+    def _demote_oldest_locked(self):
+        checkpoint_id = next(iter(self.checkpoints))
+        self._discard_locked(checkpoint_id)
+
+    def _discard_locked(self, checkpoint_id: str):
+        for blob_hash in self.checkpoints.pop(checkpoint_id, ()):
+            entry = self.contents[blob_hash]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.contents[blob_hash]
+                self.total_bytes -= len(entry[0])
+
+    def _relieve_memory_pressure(self):
+        """Demote the older half of the tier while the system is short of memory"""
+        if not PSUTIL_AVAILABLE or not self.min_available_bytes:
+            return
+
+        try:
+            available = psutil.virtual_memory().available
+        except Exception as e:
+            logger.debug(f"Could not read available memory: {e}")
+            return
+
+        if available < self.min_available_bytes:
+            with self._lock:
+                keep = len(self.checkpoints) // 2
+                while len(self.checkpoints) > keep:
+                    self._demote_oldest_locked()
+            logger.info("Low system memory - demoted in-memory checkpoint contents to disk")
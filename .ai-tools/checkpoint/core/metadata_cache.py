@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Metadata Cache for Advanced Checkpoint System
+
+Bounded LRU cache of parsed checkpoint metadata, so repeated rollback,
+search and coordinator lookups do not re-read and re-parse metadata files.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Least-recently-used eviction
+- Memory ceiling based on serialized metadata size
+- Explicit invalidation on checkpoint deletion
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataCache:
+    """
+    LRU cache of parsed checkpoint metadata dictionaries.
+
+    Entry sizes are measured by their serialized (file) size, which keeps the
+    accounting cheap and proportional to the parsed object's footprint.
+    """
+
+    def __init__(self, reader: Callable[[str], Optional[bytes]], max_bytes: int):
+        """
+        Initialize metadata cache.
+
+        Args:
+            reader: Returns a checkpoint's serialized metadata (None if missing)
+            max_bytes: Memory ceiling (0 disables caching)
+        """
+        self.reader = reader
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, checkpoint_id: str) -> Optional[Dict]:
+        """
+        Get parsed metadata, loading it from disk on a miss.
+
+        Returns:
+            Metadata dictionary (shared - callers must not mutate it), or None if missing
+        """
+        with self._lock:
+            entry = self.entries.get(checkpoint_id)
+            if entry is not None:
+                self.entries.move_to_end(checkpoint_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        raw = self.reader(checkpoint_id)
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        self.put(checkpoint_id, data, len(raw))
+        return data
+
+    def put(self, checkpoint_id: str, data: Dict, size: int):
+        """Cache parsed metadata of the given serialized size"""
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self.entries.pop(checkpoint_id, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+
+            self.entries[checkpoint_id] = (data, size)
+            self.total_bytes += size
+
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def invalidate(self, checkpoint_id: str):
+        """Drop a checkpoint's cached metadata"""
+        with self._lock:
+            entry = self.entries.pop(checkpoint_id, None)
+            if entry is not None:
+                self.total_bytes -= entry[1]
+
+    def clear(self):
+        """Drop all cached metadata"""
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
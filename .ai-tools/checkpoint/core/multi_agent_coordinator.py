@@ -13,10 +13,13 @@ Features:
 - Conflict detection and resolution
 - Agent state synchronization
 - Coordinated rollback across agents
+- Debounced write-behind of state changes to an append-only journal
 """
 
+import atexit
 import json
 import logging
+import threading
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set
 from pathlib import Path
@@ -24,6 +27,9 @@ from datetime import datetime
 from enum import Enum
 
 from .checkpoint_engine import CheckpointEngine, CheckpointLevel, CheckpointMetadata
+from .conflict_index import FileConflictIndex
+from .file_lock import FileLock
+from .journal import AppendOnlyJournal, atomic_write_json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -86,8 +92,20 @@ class MultiAgentCoordinator:
         # Conflict tracking
         self.detected_conflicts: List[ConflictInfo] = []
 
-        # Coordination lock (file-based for simplicity)
+        # path -> agents index over all agents' modified files
+        self.conflict_index = FileConflictIndex()
+
+        # State snapshot; changes are journaled and folded into it on compaction
         self.coordination_file = checkpoint_engine.storage_base / "agent_coordination.json"
+        self.coordination_journal = AppendOnlyJournal(checkpoint_engine.storage_base / "agent_coordination.journal")
+        self._coordination_lock = FileLock(checkpoint_engine.storage_base / ".coordination.lock")
+        self._snapshot_identity: Optional[tuple] = None
+
+        # Write-behind: changes are buffered and appended once the debounce interval elapses
+        self._pending_records: List[Dict] = []
+        self._pending_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._atexit_registered = False
 
         # Load coordination state
         self._load_coordination_state()
@@ -95,7 +113,11 @@ class MultiAgentCoordinator:
         logger.info("Multi-Agent Coordinator initialized")
 
     def _load_coordination_state(self):
-        """Load coordination state from storage"""
+        """Load coordination state from storage (snapshot plus journaled changes)"""
+        self.agent_states = {}
+        self.conflict_index = FileConflictIndex()
+        self._snapshot_identity = self._coordination_snapshot_identity()
+
         if self.coordination_file.exists():
             try:
                 with open(self.coordination_file, 'r') as f:
@@ -111,12 +133,108 @@ class MultiAgentCoordinator:
                         modified_files=set(state_data.get("modified_files", [])),
                         execution_count=state_data.get("execution_count", 0)
                     )
+                    self.conflict_index.add(agent_type, self.agent_states[agent_type].modified_files)
 
             except Exception as e:
                 logger.warning(f"Error loading coordination state: {e}")
 
+        try:
+            for record in self.coordination_journal.replay():
+                self._apply_coordination_record(record)
+        except Exception as e:
+            logger.warning(f"Error replaying coordination journal: {e}")
+
+    def _coordination_snapshot_identity(self) -> Optional[tuple]:
+        """Identity of the state snapshot file (changes when any process compacts)"""
+        try:
+            st = self.coordination_file.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _apply_coordination_record(self, record: Dict):
+        """Apply one journaled agent state change in memory"""
+        agent_type = record["agent"]
+        if agent_type not in self.agent_states:
+            self.agent_states[agent_type] = AgentCheckpointState(agent_type=agent_type)
+        state = self.agent_states[agent_type]
+
+        checkpoint_id = record.get("checkpoint_id")
+        if checkpoint_id:
+            state.active_checkpoints.append(checkpoint_id)
+            state.last_checkpoint_id = checkpoint_id
+            state.last_checkpoint_timestamp = record.get("timestamp")
+
+        modified_files = record.get("modified_files")
+        if modified_files:
+            self.conflict_index.add(agent_type, modified_files)
+            state.modified_files.update(modified_files)
+
+        if "execution_count" in record:
+            state.execution_count = record["execution_count"]
+
+    def _schedule_save(self):
+        """Persist buffered state changes after the debounce interval"""
+        debounce = self.config.get("state_save_debounce_seconds", 1.0)
+        if not debounce or debounce <= 0:
+            self.flush()
+            return
+
+        with self._pending_lock:
+            if not self._atexit_registered:
+                # Do not lose buffered changes when the process exits normally
+                atexit.register(self.flush)
+                self._atexit_registered = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(debounce, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """Append buffered state changes to the journal (compacting it when it grows large)"""
+        with self._pending_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            records, self._pending_records = self._pending_records, []
+
+        if not records:
+            return
+
+        try:
+            with self._coordination_lock.exclusive():
+                self._refresh_coordination_state_locked(unwritten=records)
+                for record in records:
+                    self.coordination_journal.append(record, sync=False)
+                self.coordination_journal.sync()
+
+                threshold = self.config.get("state_compaction_threshold", 500)
+                if self.coordination_journal.entry_count >= threshold:
+                    self._save_coordination_state()
+        except Exception as e:
+            logger.error(f"Error saving coordination state: {e}")
+
+    def _refresh_coordination_state_locked(self, unwritten: List[Dict]):
+        """
+        Pick up state changes journaled by other processes (coordination lock held).
+
+        Args:
+            unwritten: Records being flushed by this process, already applied in memory
+        """
+        with self._pending_lock:
+            if self._coordination_snapshot_identity() != self._snapshot_identity:
+                # Another process compacted; reload and re-apply the still unwritten changes
+                self._load_coordination_state()
+                for record in unwritten + self._pending_records:
+                    self._apply_coordination_record(record)
+                return
+
+            if self.coordination_journal.size() > self.coordination_journal.offset:
+                for record in self.coordination_journal.replay(self.coordination_journal.offset):
+                    self._apply_coordination_record(record)
+
     def _save_coordination_state(self):
-        """Save coordination state to storage"""
+        """Compact coordination state: write a full snapshot atomically and reset the journal"""
         try:
             data = {
                 "version": "3.7.0",
@@ -124,18 +242,22 @@ class MultiAgentCoordinator:
                 "agent_states": {}
             }
 
-            # Serialize agent states
-            for agent_type, state in self.agent_states.items():
-                data["agent_states"][agent_type] = {
-                    "active_checkpoints": state.active_checkpoints,
-                    "last_checkpoint_id": state.last_checkpoint_id,
-                    "last_checkpoint_timestamp": state.last_checkpoint_timestamp,
-                    "modified_files": list(state.modified_files),
-                    "execution_count": state.execution_count
-                }
-
-            with open(self.coordination_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            with self._coordination_lock.exclusive(), self._pending_lock:
+                # Serialize agent states
+                for agent_type, state in self.agent_states.items():
+                    data["agent_states"][agent_type] = {
+                        "active_checkpoints": list(state.active_checkpoints),
+                        "last_checkpoint_id": state.last_checkpoint_id,
+                        "last_checkpoint_timestamp": state.last_checkpoint_timestamp,
+                        "modified_files": list(state.modified_files),
+                        "execution_count": state.execution_count
+                    }
+                # Changes buffered meanwhile are already part of the snapshot
+                self._pending_records = []
+
+                atomic_write_json(self.coordination_file, data)
+                self.coordination_journal.truncate()
+                self._snapshot_identity = self._coordination_snapshot_identity()
 
         except Exception as e:
             logger.error(f"Error saving coordination state: {e}")
@@ -169,19 +291,22 @@ class MultiAgentCoordinator:
                 logger.warning(f"Detected {len(conflicts)} conflicts before {agent_type} execution")
                 self.detected_conflicts.extend(conflicts)
 
+                # Low-severity (directory) overlaps are informational and never block an agent
+                blocking = [conflict for conflict in conflicts if conflict.severity != "low"]
+
                 # Handle conflicts based on strategy
-                if not self._resolve_conflicts(conflicts):
+                if blocking and not self._resolve_conflicts(blocking):
                     logger.error(f"Could not resolve conflicts for {agent_type}")
                     return None
 
         # Create checkpoint
-        checkpoint_id = self.checkpoint_engine.create_checkpoint(
+        checkpoint_id = self.checkpoint_engine.create_checkpoint_async(
             level=CheckpointLevel.AGENT_EXECUTION,
             label=f"before_{agent_type}_{datetime.now().strftime('%H%M%S')}",
             description=description or f"Before {agent_type} execution",
             agent_type=agent_type,
             tags=(tags or []) + ["pre-agent", agent_type]
-        )
+        ).checkpoint_id
 
         if checkpoint_id:
             # Update agent state
@@ -221,13 +346,13 @@ class MultiAgentCoordinator:
         logger.info(f"Creating post-execution checkpoint for {agent_type} ({status})")
 
         # Create checkpoint
-        checkpoint_id = self.checkpoint_engine.create_checkpoint(
+        checkpoint_id = self.checkpoint_engine.create_checkpoint_async(
             level=CheckpointLevel.AGENT_EXECUTION,
             label=f"after_{agent_type}_{status}_{datetime.now().strftime('%H%M%S')}",
             description=description or f"After {agent_type} execution ({status})",
             agent_type=agent_type,
             tags=(tags or []) + ["post-agent", agent_type, status]
-        )
+        ).checkpoint_id
 
         if checkpoint_id:
             # Update agent state with modified files
@@ -247,23 +372,22 @@ class MultiAgentCoordinator:
         execution_count: Optional[int] = None
     ):
         """Update agent state tracking"""
-        if agent_type not in self.agent_states:
-            self.agent_states[agent_type] = AgentCheckpointState(agent_type=agent_type)
-
-        state = self.agent_states[agent_type]
-
+        # Only the change is recorded, so saving does not grow with total state size
+        record: Dict = {"agent": agent_type}
         if checkpoint_id:
-            state.active_checkpoints.append(checkpoint_id)
-            state.last_checkpoint_id = checkpoint_id
-            state.last_checkpoint_timestamp = datetime.now().isoformat()
-
+            record["checkpoint_id"] = checkpoint_id
+            record["timestamp"] = datetime.now().isoformat()
         if modified_files is not None:
-            state.modified_files.update(modified_files)
-
+            known = self.agent_states[agent_type].modified_files if agent_type in self.agent_states else set()
+            record["modified_files"] = sorted(modified_files - known)
         if execution_count is not None:
-            state.execution_count = execution_count
+            record["execution_count"] = execution_count
 
-        self._save_coordination_state()
+        with self._pending_lock:
+            self._apply_coordination_record(record)
+            self._pending_records.append(record)
+
+        self._schedule_save()
 
     def _detect_conflicts(self, agent_type: str) -> List[ConflictInfo]:
         """
@@ -280,26 +404,33 @@ class MultiAgentCoordinator:
 
         conflicts = []
 
+        # Check for file conflicts
+        if not self.config.get("agent_isolation", True):
+            return conflicts
+
         # Get modified files for this agent (predicted or known)
         current_agent_files = self.agent_states.get(agent_type, AgentCheckpointState(agent_type)).modified_files
 
-        # Check against other active agents
-        for other_agent_type, other_state in self.agent_states.items():
-            if other_agent_type == agent_type:
-                continue
-
-            # Check for file conflicts
-            if self.config.get("agent_isolation", True):
-                overlapping_files = current_agent_files.intersection(other_state.modified_files)
-
-                if overlapping_files:
-                    conflicts.append(ConflictInfo(
-                        conflict_type="file_overlap",
-                        agents_involved=[agent_type, other_agent_type],
-                        conflicting_files=list(overlapping_files),
-                        description=f"{agent_type} and {other_agent_type} are modifying the same files",
-                        severity="medium"
-                    ))
+        # Only this agent's paths are looked up, other agents' file sets are never scanned
+        overlaps = self.conflict_index.find_overlaps(agent_type, current_agent_files)
+
+        for other_agent_type, overlapping_files in sorted(overlaps["files"].items()):
+            conflicts.append(ConflictInfo(
+                conflict_type="file_overlap",
+                agents_involved=[agent_type, other_agent_type],
+                conflicting_files=sorted(overlapping_files),
+                description=f"{agent_type} and {other_agent_type} are modifying the same files",
+                severity="medium"
+            ))
+
+        for other_agent_type, overlapping_files in sorted(overlaps["directories"].items()):
+            conflicts.append(ConflictInfo(
+                conflict_type="directory_overlap",
+                agents_involved=[agent_type, other_agent_type],
+                conflicting_files=sorted(overlapping_files),
+                description=f"{agent_type} and {other_agent_type} are modifying files in the same directories",
+                severity="low"
+            ))
 
         return conflicts
 
@@ -358,12 +489,8 @@ class MultiAgentCoordinator:
         Returns:
             List of checkpoint metadata
         """
-        agent_state = self.agent_states.get(agent_type)
-        if not agent_state:
-            return []
-
         checkpoints = []
-        for cp_id in agent_state.active_checkpoints[-limit:]:
+        for cp_id in self.checkpoint_engine.get_agent_checkpoint_ids(agent_type, limit=limit):
             metadata = self.checkpoint_engine.get_checkpoint_metadata(cp_id)
             if metadata:
                 checkpoints.append(metadata)
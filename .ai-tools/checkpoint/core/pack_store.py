@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Pack Store for Advanced Checkpoint System
+
+Consolidates cold per-checkpoint files (metadata JSON and file manifests)
+into append-only segment files with an offset index, similar to git
+packfiles, so storage holds a few large files instead of tens of thousands
+of tiny ones.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Segment (.pack) plus offset index (.idx) per pack, written atomically
+- O(1) reads through an in-memory offset table
+- Persistent tombstones for records of deleted checkpoints
+- Picks up packs and tombstones of other processes (reload only when the pack directory changed)
+- Repacking of packs dominated by deleted checkpoints
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .journal import AppendOnlyJournal, atomic_write_bytes, atomic_write_json, fsync_directory
+
+logger = logging.getLogger(__name__)
+
+
+class PackStore:
+    """
+    Read-optimized store of immutable records keyed by name.
+
+    Keys are storage-relative names such as ``metadata/<id>.json`` or
+    ``checkpoints/<id>.dat.gz``; values are the original file bytes.
+    """
+
+    def __init__(self, packs_dir: Path):
+        """
+        Initialize pack store.
+
+        Args:
+            packs_dir: Directory holding pack-<n>.pack / pack-<n>.idx pairs
+        """
+        self.packs_dir = Path(packs_dir)
+        self.packs_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # key -> (pack name, offset, length), without tombstoned keys
+        self.offsets: Dict[str, Tuple[str, int, int]] = {}
+        # pack name -> {key: (offset, length)}
+        self.packs: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        # Keys of deleted records still present in some pack
+        self.tombstones: Set[str] = set()
+        self.tombstone_journal = AppendOnlyJournal(self.packs_dir / "tombstones.journal")
+        # Pack directory mtime the tables were loaded at (changes when packs
+        # are written or removed, or tombstones compacted, by any process)
+        self._directory_mtime: Optional[int] = None
+        self._load_indexes()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.offsets
+
+    def _current_directory_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.packs_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self):
+        """Pick up packs and tombstones written by other processes since the last load"""
+        if self._current_directory_mtime() != self._directory_mtime:
+            self._load_indexes()
+            return
+
+        journal = self.tombstone_journal
+        if journal.size() > journal.offset:
+            with self._lock:
+                for record in journal.replay(journal.offset):
+                    self._apply_tombstones_locked(record.get("keys", []))
+
+    def _apply_tombstones_locked(self, keys: Iterable[str]):
+        for key in keys:
+            self.tombstones.add(key)
+            self.offsets.pop(key, None)
+
+    def _load_indexes(self):
+        """(Re)load the offset table from all pack index files and tombstones"""
+        # Read before loading, so changes made meanwhile trigger another reload
+        directory_mtime = self._current_directory_mtime()
+        packs = {}
+        for idx_file in sorted(self.packs_dir.glob("pack-*.idx")):
+            pack_name = idx_file.stem
+            if not (self.packs_dir / f"{pack_name}.pack").exists():
+                continue
+            try:
+                with open(idx_file, 'r') as f:
+                    entries = json.load(f).get("entries", {})
+            except Exception as e:
+                logger.warning(f"Skipping unreadable pack index {idx_file.name}: {e}")
+                continue
+            packs[pack_name] = {key: (offset, length) for key, (offset, length) in entries.items()}
+
+        offsets = {}
+        for pack_name, entries in packs.items():
+            for key, (offset, length) in entries.items():
+                offsets[key] = (pack_name, offset, length)
+
+        with self._lock:
+            self.packs = packs
+            self.offsets = offsets
+            self.tombstones = set()
+            for record in self.tombstone_journal.replay():
+                self._apply_tombstones_locked(record.get("keys", []))
+            self._directory_mtime = directory_mtime
+
+    def read(self, key: str) -> Optional[bytes]:
+        """
+        Read a packed record.
+
+        Returns:
+            Record bytes, or None if the key is not packed (or was deleted)
+        """
+        # Two stats; indexes are only reloaded if the pack directory changed
+        self._refresh()
+
+        for attempt in range(2):
+            location = self.offsets.get(key)
+            if location is None:
+                return None
+
+            pack_name, offset, length = location
+            try:
+                with open(self.packs_dir / f"{pack_name}.pack", 'rb') as f:
+                    f.seek(offset)
+                    data = f.read(length)
+                if len(data) == length:
+                    return data
+            except FileNotFoundError:
+                pass
+
+            if attempt == 0:
+                # Repacked by another process since the refresh
+                self._load_indexes()
+
+        return None
+
+    def length(self, key: str) -> int:
+        """Stored size of a packed record (0 if not packed)"""
+        location = self.offsets.get(key)
+        return location[2] if location else 0
+
+    def write_pack(self, records: Iterable[Tuple[str, bytes]]) -> Optional[str]:
+        """
+        Write records into a new pack.
+
+        Records are streamed, so callers can pass a generator. The segment is
+        written and renamed into place before its index, so a pack is only
+        visible once complete.
+
+        Returns:
+            Name of the new pack, or None if there was nothing to write
+        """
+        pack_name = f"pack-{time.time_ns()}-{os.getpid()}"
+        entries = {}
+        fd, tmp_name = tempfile.mkstemp(dir=self.packs_dir, prefix=".tmp_pack_")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                offset = 0
+                for key, data in records:
+                    f.write(data)
+                    entries[key] = (offset, len(data))
+                    offset += len(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if not entries:
+                os.unlink(tmp_name)
+                return None
+            os.replace(tmp_name, self.packs_dir / f"{pack_name}.pack")
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        atomic_write_json(self.packs_dir / f"{pack_name}.idx", {"version": 1, "entries": entries})
+        fsync_directory(self.packs_dir)
+
+        with self._lock:
+            self.packs[pack_name] = entries
+            for key, (offset, length) in entries.items():
+                self.offsets[key] = (pack_name, offset, length)
+
+        return pack_name
+
+    def discard(self, keys: Iterable[str]):
+        """
+        Delete records.
+
+        A tombstone is persisted for each packed key, so reloading the pack
+        indexes does not resurrect it; the bytes are reclaimed when the pack
+        is rewritten.
+        """
+        self._refresh()
+        with self._lock:
+            packed = [key for key in keys if key in self.offsets]
+            if not packed:
+                return
+            self.tombstone_journal.append({"keys": packed})
+            self._apply_tombstones_locked(packed)
+
+    def remove_pack(self, pack_name: str) -> int:
+        """
+        Delete a pack whose live records have been rewritten elsewhere.
+
+        Returns:
+            Number of bytes freed
+        """
+        freed = 0
+        with self._lock:
+            entries = self.packs.pop(pack_name, {})
+            for key in entries:
+                location = self.offsets.get(key)
+                if location is not None and location[0] == pack_name:
+                    del self.offsets[key]
+
+        # Index first, so no reader resolves keys into a missing segment
+        for suffix in (".idx", ".pack"):
+            path = self.packs_dir / f"{pack_name}{suffix}"
+            try:
+                freed += path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+        self._compact_tombstones()
+        return freed
+
+    def _compact_tombstones(self):
+        """Drop tombstones of keys no longer present in any pack"""
+        with self._lock:
+            packed = set()
+            for entries in self.packs.values():
+                packed.update(entries)
+            live = self.tombstones & packed
+            if live == self.tombstones:
+                return
+            self.tombstones = live
+
+            # Atomic rewrite (renaming changes the directory mtime, so other processes reload)
+            data = (json.dumps({"keys": sorted(live)}, separators=(",", ":")) + "\n").encode("utf-8") if live else b""
+            atomic_write_bytes(self.tombstone_journal.journal_file, data)
+            self.tombstone_journal.offset = len(data)
+            self.tombstone_journal.entry_count = 1 if live else 0
+
+    def list_packs(self) -> List[Tuple[str, Dict[str, Tuple[int, int]]]]:
+        """List packs with their entries"""
+        with self._lock:
+            return list(self.packs.items())
+
+    def total_size(self) -> int:
+        """Total size of all pack files"""
+        total = 0
+        with os.scandir(self.packs_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.startswith("pack-"):
+                    total += entry.stat().st_size
+        return total
@@ -13,10 +13,17 @@ Features:
 - Optional rollback on gate failure
 - Quality gate execution tracking
 - Checkpoint-based gate history
+- Concurrent gate commands with per-command timeouts and optional fail-fast
+- Cached passes keyed on gate, commands and working tree fingerprint
+- Incremental mode: {files} commands only get files changed since they last passed
 """
 
+import fnmatch
+import hashlib
 import json
 import logging
+import os
+import shlex
 import subprocess
 from dataclasses import dataclass
 from typing import Dict, List, Optional
@@ -25,10 +32,15 @@ from datetime import datetime
 from enum import Enum
 
 from .checkpoint_engine import CheckpointEngine, CheckpointLevel, RollbackResult
+from .journal import atomic_write_json
+from .gate_runner import DEFAULT_TIMEOUT_SECONDS, GateCommand, GateCommandRunner
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Replaced by the (shell-quoted) files a gate command should check
+FILES_PLACEHOLDER = "{files}"
+
 
 class QualityGateType(Enum):
     """Quality gate types"""
@@ -48,6 +60,7 @@ class QualityGateResult:
     warnings: List[str] = None
     execution_time_seconds: float = 0.0
     message: str = ""
+    cached: bool = False
 
     def __post_init__(self):
         if self.errors is None:
@@ -82,6 +95,18 @@ class QualityGatesIntegration:
         self.gate_history_file = checkpoint_engine.storage_base / "quality_gate_history.json"
         self.gate_history = self._load_gate_history()
 
+        # Passing results: cache key -> {"gate", "timestamp", "execution_time"}
+        self.result_cache_file = checkpoint_engine.storage_base / "quality_gate_cache.json"
+        self.result_cache = self._load_result_cache()
+
+        # Incremental mode: "<gate>:<command>" -> {path: content hash that passed}
+        self.file_cache_file = checkpoint_engine.storage_base / "quality_gate_file_cache.json"
+        self.file_cache = self._load_file_cache()
+
+        # "<gate>:<command>" -> HEAD at the command's last passing run (its next diff baseline)
+        self.file_baselines_file = checkpoint_engine.storage_base / "quality_gate_baselines.json"
+        self.file_baselines = self._load_file_baselines()
+
         logger.info("Quality Gates Integration initialized")
 
     def _load_gate_history(self) -> Dict:
@@ -106,21 +131,143 @@ class QualityGatesIntegration:
         except Exception as e:
             logger.error(f"Error saving gate history: {e}")
 
+    def _load_result_cache(self) -> Dict:
+        """Load cached passing gate results"""
+        if self.result_cache_file.exists():
+            try:
+                with open(self.result_cache_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Error loading gate result cache: {e}")
+
+        return {}
+
+    def _save_result_cache(self):
+        """Save cached passing gate results"""
+        try:
+            atomic_write_json(self.result_cache_file, self.result_cache, fsync=False)
+        except Exception as e:
+            logger.error(f"Error saving gate result cache: {e}")
+
+    def _result_cache_key(self, gate_type: QualityGateType, commands: List[GateCommand]) -> Optional[str]:
+        """
+        Cache key of a gate run: gate type, command set, working tree
+        fingerprint, and the git index tree and HEAD (gates such as
+        ``git diff --cached`` or ``git log`` depend on them too).
+
+        Returns:
+            Key, or None if result caching is disabled, the tree cannot be
+            fingerprinted or git state is unavailable
+        """
+        if not self.config.get("cache_results", True):
+            return None
+
+        try:
+            fingerprint = self.checkpoint_engine.working_tree_fingerprint()
+            index_tree = self._git_output(["git", "write-tree"])
+            head = self._git_output(["git", "rev-parse", "HEAD"])
+        except Exception as e:
+            logger.warning(f"Could not fingerprint working tree and git state, gate result not cached: {e}")
+            return None
+
+        key_data = json.dumps([
+            gate_type.value, sorted(command.command for command in commands), fingerprint, index_tree, head
+        ])
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+    def _git_output(self, git_command: List[str]) -> str:
+        """Run a git command in the project and return its output (raises on failure)"""
+        result = subprocess.run(
+            git_command,
+            cwd=self.checkpoint_engine.framework_root,
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"{' '.join(git_command)} failed")
+        return result.stdout.strip()
+
+    def _cache_passing_result(self, cache_key: str, gate_type: QualityGateType, execution_time: float):
+        """Remember a passing gate run"""
+        self.result_cache[cache_key] = {
+            "gate": gate_type.value,
+            "timestamp": datetime.now().isoformat(),
+            "execution_time": execution_time
+        }
+
+        # Keep only the most recent entries (dicts preserve insertion order)
+        max_entries = self.config.get("cache_max_entries", 200)
+        for stale_key in list(self.result_cache)[:-max_entries]:
+            del self.result_cache[stale_key]
+
+        self._save_result_cache()
+
+    def _load_file_cache(self) -> Dict:
+        """Load per-file passing results of incremental gate commands"""
+        if self.file_cache_file.exists():
+            try:
+                with open(self.file_cache_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Error loading gate file cache: {e}")
+
+        return {}
+
+    def _save_file_cache(self):
+        """Save per-file passing results of incremental gate commands"""
+        try:
+            atomic_write_json(self.file_cache_file, self.file_cache, fsync=False)
+        except Exception as e:
+            logger.error(f"Error saving gate file cache: {e}")
+
+    def _load_file_baselines(self) -> Dict:
+        """Load the revisions incremental gate commands last passed at"""
+        if self.file_baselines_file.exists():
+            try:
+                with open(self.file_baselines_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Error loading gate baselines: {e}")
+
+        return {}
+
+    def _save_file_baselines(self):
+        """Save the revisions incremental gate commands last passed at"""
+        try:
+            atomic_write_json(self.file_baselines_file, self.file_baselines, fsync=False)
+        except Exception as e:
+            logger.error(f"Error saving gate baselines: {e}")
+
+    def clear_result_cache(self):
+        """Forget all cached gate passes (whole gates and individual files)"""
+        self.result_cache = {}
+        self._save_result_cache()
+        self.file_cache = {}
+        self._save_file_cache()
+        self.file_baselines = {}
+        self._save_file_baselines()
+
     def execute_quality_gate(
         self,
         gate_type: QualityGateType,
         gate_command: Optional[str] = None,
         description: Optional[str] = None,
-        rollback_on_failure: Optional[bool] = None
+        rollback_on_failure: Optional[bool] = None,
+        force: bool = False
     ) -> QualityGateResult:
         """
         Execute quality gate with checkpoint integration.
 
+        A gate that already passed with the same commands on an identical
+        working tree is not run again; its cached pass is returned.
+
         Args:
             gate_type: Type of quality gate
             gate_command: Command to execute (optional)
             description: Gate description
             rollback_on_failure: Whether to rollback on failure (default from config)
+            force: Run the gate even if a cached pass exists
 
         Returns:
             QualityGateResult with execution details
@@ -132,6 +279,35 @@ class QualityGatesIntegration:
         errors = []
         warnings = []
 
+        commands = [self._gate_command(gate_command)] if gate_command else self._standard_gate_commands(gate_type)
+        cache_key = self._result_cache_key(gate_type, commands)
+        if force:
+            # A forced run also rechecks files that passed before
+            for command in commands:
+                self.file_cache.pop(self._file_cache_key(gate_type, command.command), None)
+
+        if cache_key and not force and cache_key in self.result_cache:
+            execution_time = (datetime.now() - start_time).total_seconds()
+            cached_at = self.result_cache[cache_key]["timestamp"]
+            self._record_gate_execution(
+                gate_type=gate_type,
+                success=True,
+                checkpoint_id=None,
+                execution_time=execution_time,
+                errors=[],
+                cached=True
+            )
+
+            message = f"✅ Quality gate '{gate_type.value}' passed (cached result from {cached_at}, tree unchanged)"
+            logger.info(message)
+            return QualityGateResult(
+                gate_type=gate_type.value,
+                success=True,
+                execution_time_seconds=execution_time,
+                message=message,
+                cached=True
+            )
+
         # Create checkpoint before gate if enabled
         if self.config.get("auto_checkpoint_before_gates", True):
             checkpoint_id = self._create_pre_gate_checkpoint(gate_type, description)
@@ -141,14 +317,14 @@ class QualityGatesIntegration:
         # Execute quality gate
         gate_success = False
         try:
-            if gate_command:
-                # Execute custom gate command
-                gate_success, gate_errors = self._execute_gate_command(gate_command)
+            if commands:
+                gate_success, gate_errors = self._execute_commands(
+                    gate_type, self._expand_file_commands(gate_type, commands, force)
+                )
                 errors.extend(gate_errors)
             else:
-                # Execute standard gate
-                gate_success, gate_errors = self._execute_standard_gate(gate_type)
-                errors.extend(gate_errors)
+                # No standard gate defined, pass by default
+                gate_success = True
 
         except Exception as e:
             logger.error(f"Error executing quality gate: {e}")
@@ -158,6 +334,9 @@ class QualityGatesIntegration:
         # Calculate execution time
         execution_time = (datetime.now() - start_time).total_seconds()
 
+        if gate_success and cache_key:
+            self._cache_passing_result(cache_key, gate_type, execution_time)
+
         # Handle failure
         if not gate_success:
             # Determine rollback policy
@@ -214,47 +393,233 @@ class QualityGatesIntegration:
 
         return checkpoint_id
 
-    def _execute_gate_command(self, command: str) -> tuple[bool, List[str]]:
+    def _create_gate_runner(self) -> GateCommandRunner:
+        """Create a command runner from configuration"""
+        return GateCommandRunner(
+            max_workers=self.config.get("max_parallel_commands"),
+            fail_fast=self.config.get("fail_fast", False),
+            # {files} paths are relative to the project root
+            cwd=str(self.checkpoint_engine.framework_root)
+        )
+
+    def _gate_command(self, entry) -> GateCommand:
         """
-        Execute custom gate command.
+        Build a gate command from a configuration entry.
 
         Args:
-            command: Shell command to execute
+            entry: Command string, or {"command": ..., "timeout": seconds, "files": glob or globs}
+        """
+        default_timeout = self.config.get("command_timeout_seconds", DEFAULT_TIMEOUT_SECONDS)
+        if isinstance(entry, dict):
+            patterns = entry.get("files", [])
+            return GateCommand(
+                command=entry["command"],
+                timeout=entry.get("timeout", default_timeout),
+                file_patterns=[patterns] if isinstance(patterns, str) else list(patterns)
+            )
+        return GateCommand(command=entry, timeout=default_timeout)
 
-        Returns:
-            (success, errors)
+    @staticmethod
+    def _file_cache_key(gate_type: QualityGateType, command: str) -> str:
+        return f"{gate_type.value}:{command}"
+
+    def _diff_baseline(self, gate_type: QualityGateType, cache_key: str) -> Optional[str]:
+        """
+        Revision a command's candidate files are diffed against: the push
+        target for pre-push gates, otherwise HEAD at the command's last
+        passing run (None if there is none yet).
+        """
+        if gate_type == QualityGateType.PRE_PUSH:
+            for ref in ("@{push}", "@{upstream}"):
+                try:
+                    return self._git_output(["git", "rev-parse", "--verify", "--quiet", ref])
+                except Exception:
+                    continue
+        return self.file_baselines.get(cache_key)
+
+    def _changed_files(self, gate_type: QualityGateType, baseline: Optional[str]) -> List[str]:
+        """
+        Files changed according to git: the staged diff for pre-commit gates,
+        otherwise the working tree diff against ``baseline`` plus untracked
+        files.
+
+        Falls back to all project files without a baseline or outside a git
+        repository (the file cache still skips the ones that already passed).
+        Checkpoint storage and ``exclude_patterns`` are filtered out either way.
         """
+        if gate_type == QualityGateType.PRE_COMMIT:
+            git_commands = [["git", "diff", "--cached", "--name-only", "-z", "--diff-filter=ACMR"]]
+        elif baseline is None:
+            return self.checkpoint_engine._list_snapshot_files()
+        else:
+            git_commands = [
+                ["git", "diff", baseline, "--name-only", "-z", "--diff-filter=ACMR", "--"],
+                ["git", "ls-files", "-z", "--others", "--exclude-standard"]
+            ]
+
+        files = set()
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+            for git_command in git_commands:
+                result = subprocess.run(
+                    git_command,
+                    cwd=self.checkpoint_engine.framework_root,
+                    capture_output=True,
+                    timeout=60
+                )
+                if result.returncode != 0:
+                    raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+                files.update(p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p)
+        except Exception as e:
+            logger.debug(f"git diff unavailable, checking all project files: {e}")
+            return self.checkpoint_engine._list_snapshot_files()
+
+        return sorted(self.checkpoint_engine._filter_snapshot_paths(files))
+
+    def _expand_file_commands(
+        self, gate_type: QualityGateType, commands: List[GateCommand], force: bool = False
+    ) -> List[GateCommand]:
+        """
+        Substitute the {files} placeholder of gate commands.
+
+        In incremental mode (default) a command gets the files changed since
+        its baseline (see ``_diff_baseline``) whose current content has not
+        passed it before; otherwise, and on forced runs, all project files.
+        Files are split into batches of ``incremental_batch_size``, one
+        command each. Outside a forced run, a command left without files is
+        skipped. Content hashes are taken here, before the run, so a file
+        edited while the command runs is not recorded as passed.
+        """
+        if not any(FILES_PLACEHOLDER in command.command for command in commands):
+            return commands
 
-            if result.returncode == 0:
-                return True, []
+        engine = self.checkpoint_engine
+        incremental = self.config.get("incremental", True) and not force
+        batch_size = max(1, self.config.get("incremental_batch_size", 100))
+        try:
+            revision = self._git_output(["git", "rev-parse", "HEAD"])
+        except Exception:
+            revision = None
+
+        # baseline -> candidate files (commands usually share a baseline)
+        candidates_by_baseline: Dict[Optional[str], List[str]] = {}
+        file_hashes: Dict[str, Optional[str]] = {}
+
+        def current_hash(rel_path: str) -> Optional[str]:
+            if rel_path not in file_hashes:
+                file_hashes[rel_path] = engine._current_file_hash(rel_path)
+            return file_hashes[rel_path]
+
+        expanded = []
+        for command in commands:
+            if FILES_PLACEHOLDER not in command.command:
+                expanded.append(command)
+                continue
+
+            cache_key = self._file_cache_key(gate_type, command.command)
+            if incremental:
+                baseline = self._diff_baseline(gate_type, cache_key)
+                if baseline not in candidates_by_baseline:
+                    candidates_by_baseline[baseline] = self._changed_files(gate_type, baseline)
+                candidates = candidates_by_baseline[baseline]
             else:
-                errors = result.stderr.strip().split("\n") if result.stderr else ["Command failed"]
-                return False, errors
+                if "all" not in candidates_by_baseline:
+                    candidates_by_baseline["all"] = engine._list_snapshot_files()
+                candidates = candidates_by_baseline["all"]
+
+            passed = self.file_cache.get(cache_key, {}) if incremental else {}
+            files = []
+            for rel_path in candidates:
+                if command.file_patterns and not any(fnmatch.fnmatch(rel_path, p) for p in command.file_patterns):
+                    continue
+                if passed and passed.get(rel_path) == current_hash(rel_path):
+                    continue
+                if os.path.isfile(os.path.join(str(engine.framework_root), rel_path)):
+                    files.append(rel_path)
+
+            if not files and not force:
+                logger.info(f"No changed files for gate command, skipping: {command.command}")
+                continue
+
+            for start in range(0, max(len(files), 1), batch_size):
+                batch = files[start:start + batch_size]
+                expanded.append(GateCommand(
+                    command=command.command.replace(FILES_PLACEHOLDER, " ".join(shlex.quote(f) for f in batch)),
+                    timeout=command.timeout,
+                    file_patterns=command.file_patterns,
+                    files=batch,
+                    template=command.command,
+                    file_hashes={rel_path: current_hash(rel_path) for rel_path in batch},
+                    revision=revision
+                ))
+
+        return expanded
+
+    def _execute_commands(self, gate_type: QualityGateType, commands: List[GateCommand]) -> tuple[bool, List[str]]:
+        """
+        Run gate commands concurrently.
 
-        except subprocess.TimeoutExpired:
-            return False, ["Quality gate command timed out (5 minutes)"]
-        except Exception as e:
-            return False, [f"Error executing gate command: {str(e)}"]
+        Files checked by a passing {files} command are recorded with their
+        content hash from before the run, so they are not checked again
+        until they change. A {files} command whose batches all pass records
+        the HEAD its files were selected at as its next diff baseline.
 
-    def _execute_standard_gate(self, gate_type: QualityGateType) -> tuple[bool, List[str]]:
+        Returns:
+            (success, errors)
         """
-        Execute standard quality gate.
+        results = self._create_gate_runner().run(commands)
+
+        errors = []
+        cancelled = 0
+        passed_files = False
+        # "<gate>:<command>" -> revision, for {files} commands with no failed batch
+        baselines: Dict[str, Optional[str]] = {}
+        failed_templates = set()
+        for command, result in zip(commands, results):
+            if command.template is not None:
+                if result.success:
+                    baselines.setdefault(self._file_cache_key(gate_type, command.template), command.revision)
+                else:
+                    failed_templates.add(self._file_cache_key(gate_type, command.template))
+
+            if result.cancelled:
+                cancelled += 1
+            elif not result.success:
+                errors.extend(result.errors)
+            elif command.files:
+                passed = self.file_cache.setdefault(self._file_cache_key(gate_type, command.template), {})
+                for rel_path in command.files:
+                    blob_hash = (command.file_hashes or {}).get(rel_path)
+                    if blob_hash:
+                        passed[rel_path] = blob_hash
+                passed_files = True
+
+        if cancelled:
+            logger.info(f"Cancelled {cancelled} gate commands after a failure (fail-fast)")
+
+        if passed_files:
+            self._save_file_cache()
+
+        new_baselines = {
+            key: revision for key, revision in baselines.items()
+            if revision and key not in failed_templates and self.file_baselines.get(key) != revision
+        }
+        if new_baselines:
+            self.file_baselines.update(new_baselines)
+            self._save_file_baselines()
+
+        return all(result.success for result in results), errors
+
+    def _standard_gate_commands(self, gate_type: QualityGateType) -> List[GateCommand]:
+        """
+        Get the commands of a standard quality gate.
 
         Args:
             gate_type: Type of quality gate
 
         Returns:
-            (success, errors)
+            Gate commands (empty if no standard gate is defined)
         """
-        # Map gate types to standard commands
+        # Map gate types to standard commands (overridable per gate in config)
         gate_commands = {
             QualityGateType.PRE_COMMIT: [
                 "git diff --check",  # Check for whitespace errors
@@ -268,17 +633,8 @@ class QualityGatesIntegration:
             ]
         }
 
-        commands = gate_commands.get(gate_type, [])
-        if not commands:
-            return True, []  # No standard gate defined, pass by default
-
-        errors = []
-        for cmd in commands:
-            success, cmd_errors = self._execute_gate_command(cmd)
-            if not success:
-                errors.extend(cmd_errors)
-
-        return len(errors) == 0, errors
+        commands = self.config.get("gate_commands", {}).get(gate_type.value, gate_commands.get(gate_type, []))
+        return [self._gate_command(entry) for entry in commands]
 
     def _record_gate_execution(
         self,
@@ -286,7 +642,8 @@ class QualityGatesIntegration:
         success: bool,
         checkpoint_id: Optional[str],
         execution_time: float,
-        errors: List[str]
+        errors: List[str],
+        cached: bool = False
     ):
         """Record quality gate execution in history"""
         gate_name = gate_type.value
@@ -307,7 +664,8 @@ class QualityGatesIntegration:
             "success": success,
             "checkpoint_id": checkpoint_id,
             "execution_time": execution_time,
-            "error_count": len(errors)
+            "error_count": len(errors),
+            "cached": cached
         })
 
         # Update statistics
@@ -363,25 +721,28 @@ class QualityGatesIntegration:
 
         return stats
 
-    def pre_commit_gate(self, description: Optional[str] = None) -> QualityGateResult:
+    def pre_commit_gate(self, description: Optional[str] = None, force: bool = False) -> QualityGateResult:
         """Execute pre-commit quality gate"""
         return self.execute_quality_gate(
             gate_type=QualityGateType.PRE_COMMIT,
-            description=description
+            description=description,
+            force=force
         )
 
-    def pre_push_gate(self, description: Optional[str] = None) -> QualityGateResult:
+    def pre_push_gate(self, description: Optional[str] = None, force: bool = False) -> QualityGateResult:
         """Execute pre-push quality gate"""
         return self.execute_quality_gate(
             gate_type=QualityGateType.PRE_PUSH,
-            description=description
+            description=description,
+            force=force
         )
 
-    def pre_deploy_gate(self, description: Optional[str] = None) -> QualityGateResult:
+    def pre_deploy_gate(self, description: Optional[str] = None, force: bool = False) -> QualityGateResult:
         """Execute pre-deploy quality gate"""
         return self.execute_quality_gate(
             gate_type=QualityGateType.PRE_DEPLOY,
-            description=description
+            description=description,
+            force=force
         )
 
 
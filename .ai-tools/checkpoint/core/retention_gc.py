@@ -0,0 +1,634 @@
+#!/usr/bin/env python3
+"""
+Retention Garbage Collector for Advanced Checkpoint System
+
+Enforces checkpoint retention policies off the caller's critical path and
+reclaims blob store space no longer referenced by any checkpoint manifest.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Victim selection by count, age and total byte quota
+- Single index transaction per collection pass
+- Mark-and-sweep of unreferenced blobs (with grace period)
+- Packing of cold checkpoint files into packfiles
+- Recompression of cold blobs with a project-trained dictionary
+- Background execution with coalesced requests
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .compression_dictionary import train_dictionary
+from .file_lock import FileLock
+from .journal import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+# Levels evicted first when the byte quota is exceeded
+QUOTA_EVICTION_ORDER = ["agent_execution", "quality_gate", "commit_preparation", "manual"]
+
+# Per-checkpoint files that are moved into packfiles (storage-relative key format)
+PACKED_FILE_KEYS = ("metadata/{}.json", "checkpoints/{}.dat.gz")
+
+# Packs whose live records fall below this fraction are rewritten
+REPACK_LIVE_RATIO = 0.5
+
+# Project files sampled to train the cold compression dictionary
+DICTIONARY_SAMPLE_FILES = 1000
+DICTIONARY_SAMPLE_MAX_BYTES = 128 * 1024
+
+
+class RetentionGC:
+    """
+    Retention policy enforcement and blob garbage collection.
+
+    Configuration (``storage`` section):
+    - ``max_checkpoint_size_mb``: total byte quota for checkpoint storage (optional)
+    - ``background_gc``: run collections in a background thread (default True)
+    - ``gc_interval_seconds``: minimum interval between quota checks (default 300)
+    - ``gc_grace_seconds``: never sweep blobs younger than this (default 3600)
+    - ``pack_after_hours``: pack checkpoint files older than this (default 24, null disables)
+    - ``pack_min_checkpoints``: minimum number of cold checkpoints per new pack (default 50)
+    - ``pack_max_mb``: maximum size of a new pack (default 256)
+    - ``recompress_after_hours``: recompress blobs stored longer ago than this (default 24, null disables)
+    - ``cold_compression_level``: zlib level of recompressed blobs (default 9)
+    - ``dictionary_retrain_hours``: retrain the cold dictionary once it is older than this (default 168, null disables)
+    - ``dictionary_retrain_growth``: retrain once the project has grown by this fraction of files (default 0.5)
+    """
+
+    def __init__(self, checkpoint_engine):
+        """
+        Initialize retention GC.
+
+        Args:
+            checkpoint_engine: CheckpointEngine instance
+        """
+        self.checkpoint_engine = checkpoint_engine
+        self.storage_config = checkpoint_engine.config["storage"]
+        self.levels_config = checkpoint_engine.config.get("checkpointLevels", {})
+
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+        self._thread: Optional[threading.Thread] = None
+        self._full_requested = False
+        self._last_run = 0.0
+        self._last_maintenance = 0.0
+        self._maintenance_lock = FileLock(checkpoint_engine.storage_base / ".maintenance.lock")
+        # Dictionary cold blobs are currently compressed with, and what it was trained on
+        self.dictionary_state_file = checkpoint_engine.storage_base / "dictionary_state.json"
+
+        self.last_result: Dict = {}
+
+    def maybe_schedule(self, level_value: str):
+        """
+        Schedule a collection if the given level violates its retention policy
+        or a periodic quota check is due; otherwise schedule periodic
+        maintenance (packing and recompression).
+        """
+        now = time.time()
+        interval = self.storage_config.get("gc_interval_seconds", 300)
+        quota_due = self.storage_config.get("max_checkpoint_size_mb") and now - self._last_run >= interval
+
+        if quota_due or self._level_needs_collection(level_value):
+            self.schedule()
+        elif self._maintenance_enabled() and now - self._last_maintenance >= interval:
+            self.schedule(full=False)
+
+    def _maintenance_enabled(self) -> bool:
+        return (
+            self.storage_config.get("pack_after_hours", 24) is not None
+            or self.storage_config.get("recompress_after_hours", 24) is not None
+        )
+
+    def _level_needs_collection(self, level_value: str) -> bool:
+        """Cheap in-memory check of count and age policies for one level"""
+        level_config = self.levels_config.get(level_value, {})
+        retention_count = level_config.get("retention_count", 100)
+        retention_days = level_config.get("retention_days")
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat() if retention_days else None
+
+        count = 0
+        for cp_data in list(self.checkpoint_engine.checkpoint_index["checkpoints"].values()):
+            if cp_data["level"] != level_value:
+                continue
+            count += 1
+            if count > retention_count or (cutoff and cp_data["timestamp"] < cutoff):
+                return True
+
+        return False
+
+    def schedule(self, full: bool = True):
+        """
+        Run a collection in the background (or inline if disabled, except
+        on the checkpoint writer thread).
+
+        Args:
+            full: Full collection; False only runs maintenance
+        """
+        # Never collect on the writer thread: checkpoints queued behind the one
+        # being committed hold the GC lock shared, and only the writer releases
+        # them, so the sweep's exclusive lock would wait forever
+        inline = not self.storage_config.get("background_gc", True)
+        if inline and not self.checkpoint_engine.checkpoint_writer.on_writer_thread():
+            self.run() if full else self.maintain()
+            return
+
+        with self._lock:
+            self._full_requested = self._full_requested or full
+            if self._running:
+                # Coalesce with the collection already in flight
+                self._pending = True
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run_loop, name="checkpoint-gc", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None):
+        """Wait for a background collection to finish"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run_loop(self):
+        """Background worker: run until no further collection is requested"""
+        while True:
+            with self._lock:
+                full = self._full_requested
+                self._full_requested = False
+            try:
+                self.run() if full else self.maintain()
+            except Exception as e:
+                logger.error(f"Error during checkpoint garbage collection: {e}")
+
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+
+    def run(self) -> Dict:
+        """
+        Run one collection pass.
+
+        Returns:
+            Statistics (checkpoints_deleted, blobs_deleted, bytes_freed, duration_seconds)
+        """
+        engine = self.checkpoint_engine
+        start = time.time()
+
+        # Decide on the latest index, including other processes' checkpoints
+        engine.refresh_index()
+        victims = self._select_policy_victims()
+
+        # Mark: blob references of every surviving checkpoint
+        survivors = [cp_id for cp_id in list(engine.checkpoint_index["checkpoints"]) if cp_id not in victims]
+        refcounts = self._count_references(survivors)
+
+        objects = {blob_hash: (size, mtime) for blob_hash, size, mtime in engine.blob_store.iter_objects()}
+
+        quota_mb = self.storage_config.get("max_checkpoint_size_mb")
+        if quota_mb:
+            victims.update(self._select_quota_victims(survivors, refcounts, objects, quota_mb * 1024 * 1024))
+
+        bytes_freed = 0
+        if victims:
+            bytes_freed += engine._delete_checkpoints(sorted(victims))
+
+        marked_ids = set(survivors).difference(victims)
+        blobs_deleted, blob_bytes = self._sweep(refcounts, objects, marked_ids, start)
+        bytes_freed += blob_bytes + self._sweep_orphan_files(start)
+
+        maintenance = self.maintain()
+        bytes_freed += maintenance["bytes_freed"]
+
+        self._last_run = time.time()
+        self.last_result = {
+            "checkpoints_deleted": len(victims),
+            "blobs_deleted": blobs_deleted,
+            "checkpoints_packed": maintenance["checkpoints_packed"],
+            "blobs_recompressed": maintenance["blobs_recompressed"],
+            "bytes_saved_by_recompression": maintenance["bytes_saved"],
+            "bytes_freed": bytes_freed,
+            "duration_seconds": self._last_run - start
+        }
+
+        if victims or blobs_deleted:
+            logger.info(
+                f"Checkpoint GC: removed {len(victims)} checkpoints and {blobs_deleted} blobs "
+                f"({bytes_freed / 1024 / 1024:.1f} MB freed)"
+            )
+
+        return self.last_result
+
+    def maintain(self) -> Dict:
+        """
+        Run storage maintenance: pack cold checkpoint files and recompress
+        cold blobs.
+
+        Returns:
+            Statistics of pack() and recompress()
+        """
+        self._last_maintenance = time.time()
+        result = self.pack()
+        result.update(self.recompress())
+        return result
+
+    def pack(self) -> Dict:
+        """
+        Move files of cold checkpoints into a packfile and rewrite packs that
+        mostly hold deleted checkpoints.
+
+        Returns:
+            Statistics (checkpoints_packed, packs_rewritten, bytes_freed)
+        """
+        result = {"checkpoints_packed": 0, "packs_rewritten": 0, "bytes_freed": 0}
+        if self.storage_config.get("pack_after_hours", 24) is None:
+            return result
+
+        # One maintenance job at a time across processes
+        with self._maintenance_lock.exclusive():
+            result["checkpoints_packed"] = self._pack_cold_checkpoints()
+            result["packs_rewritten"], result["bytes_freed"] = self._repack_sparse_packs()
+
+        if result["checkpoints_packed"] or result["packs_rewritten"]:
+            logger.info(
+                f"Checkpoint packer: packed {result['checkpoints_packed']} checkpoints, "
+                f"rewrote {result['packs_rewritten']} packs"
+            )
+        return result
+
+    def recompress(self) -> Dict:
+        """
+        Recompress blobs first stored more than ``recompress_after_hours`` ago
+        at ``cold_compression_level`` with the project's preset dictionary.
+        New blobs are written with a fast level to keep checkpoint creation cheap.
+
+        Returns:
+            Statistics (blobs_recompressed, bytes_saved)
+        """
+        result = {"blobs_recompressed": 0, "bytes_saved": 0}
+        recompress_after_hours = self.storage_config.get("recompress_after_hours", 24)
+        if recompress_after_hours is None:
+            return result
+
+        blob_store = self.checkpoint_engine.blob_store
+        cutoff = time.time() - recompress_after_hours * 3600
+        level = self.storage_config.get("cold_compression_level", 9)
+
+        with self._maintenance_lock.exclusive():
+            candidates = [
+                blob_hash for blob_hash, suffix, _, mtime in blob_store.iter_object_files()
+                if suffix == "" and mtime < cutoff
+            ]
+            if not candidates:
+                return result
+
+            dictionary_id = self._current_dictionary()
+
+            for blob_hash in candidates:
+                try:
+                    result["bytes_saved"] += blob_store.recompress(blob_hash, dictionary_id, level)
+                    result["blobs_recompressed"] += 1
+                except FileNotFoundError:
+                    # Swept by a collection in the meantime
+                    continue
+                except Exception as e:
+                    logger.warning(f"Could not recompress blob {blob_hash}: {e}")
+
+        if result["blobs_recompressed"]:
+            logger.info(
+                f"Checkpoint recompression: {result['blobs_recompressed']} blobs, "
+                f"{result['bytes_saved'] / 1024 / 1024:.1f} MB saved"
+            )
+        return result
+
+    def _current_dictionary(self) -> str:
+        """
+        Get the dictionary to recompress with, training a new one if there is
+        none yet, it is older than ``dictionary_retrain_hours`` or the project
+        has grown by ``dictionary_retrain_growth`` since it was trained.
+        Dictionaries are never deleted, so blobs compressed with older ones
+        stay readable.
+        """
+        blob_store = self.checkpoint_engine.blob_store
+        files = self.checkpoint_engine._list_snapshot_files()
+        retrain_hours = self.storage_config.get("dictionary_retrain_hours", 168)
+        retrain_growth = self.storage_config.get("dictionary_retrain_growth", 0.5)
+
+        state = {}
+        try:
+            with open(self.dictionary_state_file, 'r') as f:
+                state = json.load(f)
+            blob_store.load_dictionary(state["dictionary_id"])
+        except Exception:
+            state = {}
+
+        if state:
+            aged = retrain_hours is not None and time.time() - state["trained_at"] >= retrain_hours * 3600
+            grown = len(files) > state["sample_files"] * (1 + retrain_growth)
+            if not aged and not grown:
+                return state["dictionary_id"]
+
+        dictionary_id = blob_store.save_dictionary(train_dictionary(self._dictionary_samples(files)))
+        atomic_write_json(self.dictionary_state_file, {
+            "dictionary_id": dictionary_id,
+            "trained_at": time.time(),
+            "sample_files": len(files)
+        }, fsync=False)
+        if dictionary_id != state.get("dictionary_id"):
+            logger.info(f"Trained cold compression dictionary {dictionary_id} on {len(files)} project files")
+        return dictionary_id
+
+    def _dictionary_samples(self, files: List[str]) -> Iterator[bytes]:
+        """Sample project files for dictionary training"""
+        engine = self.checkpoint_engine
+        step = max(1, len(files) // DICTIONARY_SAMPLE_FILES)
+        for rel_path in files[::step]:
+            path = engine.framework_root / rel_path
+            try:
+                if path.stat().st_size <= DICTIONARY_SAMPLE_MAX_BYTES:
+                    yield path.read_bytes()
+            except OSError:
+                continue
+
+    def _pack_cold_checkpoints(self) -> int:
+        """
+        Pack metadata and manifest files of checkpoints older than
+        ``pack_after_hours``. Recent checkpoints stay loose.
+
+        Returns:
+            Number of checkpoints packed
+        """
+        engine = self.checkpoint_engine
+        cutoff = (datetime.now() - timedelta(hours=self.storage_config.get("pack_after_hours", 24))).isoformat()
+
+        loose = set()
+        with os.scandir(engine.metadata_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    loose.add(entry.name[:-len(".json")])
+
+        index = engine.checkpoint_index["checkpoints"]
+        candidates = sorted(
+            cp_id for cp_id in loose
+            if cp_id in index and index[cp_id]["timestamp"] < cutoff
+        )
+        if not candidates or len(candidates) < self.storage_config.get("pack_min_checkpoints", 50):
+            return 0
+
+        max_bytes = self.storage_config.get("pack_max_mb", 256) * 1024 * 1024
+        packed_ids: List[str] = []
+
+        def records() -> Iterator[Tuple[str, bytes]]:
+            written = 0
+            for cp_id in candidates:
+                if written >= max_bytes:
+                    # The rest goes into the next pack
+                    return
+                cp_records = []
+                for key_format in PACKED_FILE_KEYS:
+                    key = key_format.format(cp_id)
+                    try:
+                        with open(engine.storage_base / key, 'rb') as f:
+                            cp_records.append((key, f.read()))
+                    except FileNotFoundError:
+                        continue
+                if not cp_records:
+                    continue
+                packed_ids.append(cp_id)
+                for key, data in cp_records:
+                    written += len(data)
+                    yield key, data
+
+        if engine.pack_store.write_pack(records()) is None:
+            return 0
+
+        # The pack is durable; the loose copies can go
+        for cp_id in packed_ids:
+            for key_format in PACKED_FILE_KEYS:
+                try:
+                    os.unlink(engine.storage_base / key_format.format(cp_id))
+                except FileNotFoundError:
+                    pass
+
+        return len(packed_ids)
+
+    def _repack_sparse_packs(self) -> Tuple[int, int]:
+        """
+        Rewrite packs dominated by records of deleted checkpoints.
+
+        Returns:
+            (packs_rewritten, bytes_freed)
+        """
+        engine = self.checkpoint_engine
+        index = engine.checkpoint_index["checkpoints"]
+
+        sparse = []
+        for pack_name, entries in engine.pack_store.list_packs():
+            total = sum(length for _, length in entries.values())
+            live = sum(
+                length for key, (_, length) in entries.items()
+                if self._pack_key_checkpoint(key) in index
+            )
+            if total and live / total < REPACK_LIVE_RATIO:
+                sparse.append((pack_name, entries))
+
+        if not sparse:
+            return 0, 0
+
+        def live_records() -> Iterator[Tuple[str, bytes]]:
+            for pack_name, entries in sparse:
+                with open(engine.pack_store.packs_dir / f"{pack_name}.pack", 'rb') as f:
+                    for key, (offset, length) in entries.items():
+                        if self._pack_key_checkpoint(key) not in index:
+                            continue
+                        f.seek(offset)
+                        yield key, f.read(length)
+
+        engine.pack_store.write_pack(live_records())
+
+        freed = 0
+        for pack_name, _ in sparse:
+            freed += engine.pack_store.remove_pack(pack_name)
+        return len(sparse), freed
+
+    @staticmethod
+    def _pack_key_checkpoint(key: str) -> str:
+        """Get the checkpoint ID of a packed file key"""
+        name = key.split("/", 1)[-1]
+        return name.split(".", 1)[0]
+
+    def _select_policy_victims(self) -> Set[str]:
+        """Select checkpoints violating per-level count or age policies"""
+        by_level: Dict[str, List] = {}
+        for cp_id, cp_data in list(self.checkpoint_engine.checkpoint_index["checkpoints"].items()):
+            by_level.setdefault(cp_data["level"], []).append((cp_data["timestamp"], cp_id))
+
+        victims = set()
+        for level_value, entries in by_level.items():
+            level_config = self.levels_config.get(level_value, {})
+            retention_count = level_config.get("retention_count", 100)
+            retention_days = level_config.get("retention_days")
+
+            entries.sort(reverse=True)
+            victims.update(cp_id for _, cp_id in entries[retention_count:])
+
+            if retention_days:
+                cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+                victims.update(cp_id for timestamp, cp_id in entries if timestamp < cutoff)
+
+        return victims
+
+    def _count_references(self, checkpoint_ids: List[str]) -> Dict[str, int]:
+        """Count how many manifests reference each blob"""
+        refcounts: Dict[str, int] = {}
+        for cp_id in checkpoint_ids:
+            manifest = self.checkpoint_engine._load_manifest(cp_id)
+            if manifest is None:
+                continue
+            for blob_hash in self.checkpoint_engine._manifest_blob_hashes(manifest):
+                refcounts[blob_hash] = refcounts.get(blob_hash, 0) + 1
+        return refcounts
+
+    def _select_quota_victims(
+        self,
+        survivors: List[str],
+        refcounts: Dict[str, int],
+        objects: Dict[str, tuple],
+        quota_bytes: int
+    ) -> Set[str]:
+        """
+        Select additional checkpoints to bring storage under the byte quota.
+
+        Lower-priority levels are evicted first, oldest first. The newest
+        checkpoint is always kept. ``refcounts`` is updated in place.
+        """
+        engine = self.checkpoint_engine
+        total = sum(size for size, _ in objects.values()) + self._loose_files_size()
+        if total <= quota_bytes:
+            return set()
+
+        index = engine.checkpoint_index["checkpoints"]
+        newest = max(survivors, key=lambda cp_id: index[cp_id]["timestamp"], default=None)
+        priority = {level: rank for rank, level in enumerate(QUOTA_EVICTION_ORDER)}
+        candidates = sorted(
+            (cp_id for cp_id in survivors if cp_id != newest),
+            key=lambda cp_id: (priority.get(index[cp_id]["level"], 0), index[cp_id]["timestamp"])
+        )
+
+        victims = set()
+        for cp_id in candidates:
+            if total <= quota_bytes:
+                break
+            victims.add(cp_id)
+            manifest = engine._load_manifest(cp_id)
+            for blob_hash in engine._manifest_blob_hashes(manifest or {}):
+                refcounts[blob_hash] -= 1
+                if refcounts[blob_hash] == 0:
+                    total -= objects.get(blob_hash, (0, 0))[0]
+            total -= self._checkpoint_files_size(cp_id)
+
+        logger.info(f"Storage quota exceeded - evicting {len(victims)} additional checkpoints")
+        return victims
+
+    def _sweep(self, refcounts: Dict[str, int], objects: Dict[str, tuple], marked_ids: Set[str], started_at: float) -> tuple:
+        """
+        Delete blobs no longer referenced by any manifest.
+
+        Blobs younger than the grace period are kept as a second line of
+        defence for content whose checkpoint has not been indexed yet.
+
+        Returns:
+            (blobs_deleted, bytes_freed)
+        """
+        engine = self.checkpoint_engine
+        grace_cutoff = started_at - self.storage_config.get("gc_grace_seconds", 3600)
+        candidates = [
+            blob_hash for blob_hash, (_, mtime) in objects.items()
+            if refcounts.get(blob_hash, 0) <= 0 and mtime < grace_cutoff
+        ]
+        if not candidates:
+            return 0, 0
+
+        deleted = 0
+        freed = 0
+        # The exclusive GC lock waits out uncommitted snapshots in every process;
+        # the snapshot lock keeps captures in this process from reusing a blob mid-sweep
+        with engine._gc_lock.exclusive(), engine._snapshot_lock:
+            # Checkpoints committed since marking may reference candidates again
+            engine.refresh_index()
+            protected = set()
+            for cp_id in list(engine.checkpoint_index["checkpoints"]):
+                if cp_id not in marked_ids:
+                    protected.update(engine._manifest_blob_hashes(engine._load_manifest(cp_id) or {}))
+            # Snapshots captured but not yet committed by the writer
+            for manifest in list(engine._pending_manifests.values()):
+                protected.update(engine._manifest_blob_hashes(manifest or {}))
+
+            for blob_hash in candidates:
+                if blob_hash in protected:
+                    continue
+                freed += engine.blob_store.delete(blob_hash)
+                deleted += 1
+
+        return deleted, freed
+
+    def _sweep_orphan_files(self, started_at: float) -> int:
+        """
+        Delete metadata and manifest files of checkpoints missing from the index
+        (left behind by an interrupted delete).
+
+        Returns:
+            Number of bytes freed
+        """
+        engine = self.checkpoint_engine
+        grace_cutoff = started_at - self.storage_config.get("gc_grace_seconds", 3600)
+        known = engine.checkpoint_index["checkpoints"]
+        freed = 0
+
+        for directory, suffix in ((engine.metadata_dir, ".json"), (engine.checkpoints_dir, ".dat.gz")):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or not entry.name.endswith(suffix):
+                        continue
+                    checkpoint_id = entry.name[:-len(suffix)]
+                    st = entry.stat()
+                    if checkpoint_id not in known and st.st_mtime < grace_cutoff:
+                        try:
+                            os.unlink(entry.path)
+                            freed += st.st_size
+                        except OSError:
+                            pass
+
+        return freed
+
+    def _loose_files_size(self) -> int:
+        """Total size of metadata and manifest files (loose and packed)"""
+        engine = self.checkpoint_engine
+        total = engine.pack_store.total_size()
+        for directory in (engine.metadata_dir, engine.checkpoints_dir):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        total += entry.stat().st_size
+        return total
+
+    def _checkpoint_files_size(self, checkpoint_id: str) -> int:
+        """Size of a checkpoint's own metadata and manifest files"""
+        engine = self.checkpoint_engine
+        total = 0
+        for key_format in PACKED_FILE_KEYS:
+            key = key_format.format(checkpoint_id)
+            try:
+                total += (engine.storage_base / key).stat().st_size
+            except OSError:
+                total += engine.pack_store.length(key)
+        return total
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Search Index for Advanced Checkpoint System
+
+Token inverted index over checkpoint searchable text for semantic rewind.
+Answers description queries without reading checkpoint metadata files.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Token postings with BM25 ranking
+- Trigram vocabulary index for fuzzy term matching
+- Exact phrase boost
+- Incremental add/remove
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Minimum trigram similarity for a fuzzy term expansion
+FUZZY_MIN_SIMILARITY = 0.4
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    """Get padded character trigrams of a token"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    Inverted index of checkpoint searchable text.
+    """
+
+    def __init__(self):
+        """Initialize empty index"""
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_terms: Dict[str, Counter] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.doc_texts: Dict[str, str] = {}
+        self.doc_timestamps: Dict[str, str] = {}
+        self.trigram_index: Dict[str, Set[str]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_terms)
+
+    def add(self, doc_id: str, text: str, timestamp: str = ""):
+        """Index a checkpoint's searchable text"""
+        if doc_id in self.doc_terms:
+            self.remove(doc_id)
+
+        tokens = tokenize(text)
+        terms = Counter(tokens)
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = len(tokens)
+        # Normalized, space-padded token text for exact phrase checks
+        self.doc_texts[doc_id] = f" {' '.join(tokens)} "
+        self.doc_timestamps[doc_id] = timestamp
+        self.total_length += len(tokens)
+
+        for term, count in terms.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                for gram in trigrams(term):
+                    self.trigram_index.setdefault(gram, set()).add(term)
+            self.postings[term][doc_id] = count
+
+    def remove(self, doc_id: str):
+        """Remove a checkpoint from the index"""
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        self.doc_texts.pop(doc_id, None)
+        self.doc_timestamps.pop(doc_id, None)
+        self.total_length -= self.doc_lengths.pop(doc_id, 0)
+
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+                for gram in trigrams(term):
+                    vocab = self.trigram_index.get(gram)
+                    if vocab is not None:
+                        vocab.discard(term)
+                        if not vocab:
+                            del self.trigram_index[gram]
+
+    def _expand_term(self, term: str, fuzzy: bool) -> Dict[str, float]:
+        """Map a query term to indexed terms with match weights"""
+        expansions = {}
+        if term in self.postings:
+            expansions[term] = 1.0
+
+        if fuzzy:
+            query_grams = trigrams(term)
+            candidates = Counter()
+            for gram in query_grams:
+                for candidate in self.trigram_index.get(gram, ()):
+                    candidates[candidate] += 1
+
+            for candidate, shared in candidates.items():
+                if candidate == term:
+                    continue
+                similarity = shared / (len(query_grams) + len(trigrams(candidate)) - shared)
+                if similarity >= FUZZY_MIN_SIMILARITY:
+                    expansions[candidate] = max(expansions.get(candidate, 0.0), similarity)
+
+        return expansions
+
+    def search(
+        self,
+        query: str,
+        fuzzy: bool = True,
+        min_coverage: float = 0.3,
+        limit: int = 10
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank checkpoints against a query.
+
+        Args:
+            query: Free-text query
+            fuzzy: Expand query terms with trigram-similar indexed terms
+            min_coverage: Minimum fraction of query terms a result must match
+            limit: Maximum number of results
+
+        Returns:
+            List of (checkpoint_id, score), best first (newest first on ties)
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms or not self.doc_terms:
+            return []
+
+        doc_count = len(self.doc_terms)
+        avg_length = self.total_length / doc_count if doc_count else 0.0
+        scores: Dict[str, float] = {}
+        matched: Dict[str, int] = {}
+
+        for term in query_terms:
+            term_docs: Dict[str, float] = {}
+            for indexed_term, weight in self._expand_term(term, fuzzy).items():
+                docs = self.postings[indexed_term]
+                idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, tf in docs.items():
+                    length = self.doc_lengths[doc_id]
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) if avg_length else tf + BM25_K1
+                    score = weight * idf * tf * (BM25_K1 + 1) / norm
+                    # Best expansion counts once per query term
+                    term_docs[doc_id] = max(term_docs.get(doc_id, 0.0), score)
+
+            for doc_id, score in term_docs.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+
+        phrase = f" {' '.join(tokenize(query))} "
+        results = []
+        for doc_id, score in scores.items():
+            if matched[doc_id] / len(query_terms) < min_coverage:
+                continue
+            if phrase in self.doc_texts[doc_id]:
+                # Exact phrase outranks any partial match
+                score += 1000.0
+            results.append((doc_id, score))
+
+        results.sort(key=lambda item: (item[1], self.doc_timestamps.get(item[0], "")), reverse=True)
+        return results[:limit]
+
+    def best_match(self, query: str, fuzzy: bool = True) -> Optional[str]:
+        """Get the best matching checkpoint ID"""
+        results = self.search(query, fuzzy=fuzzy, limit=1)
+        return results[0][0] if results else None
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Stat Cache for Advanced Checkpoint System
+
+Persistent index of (size, mtime_ns, inode) -> content hash for tracked files.
+Lets incremental snapshots rehash only files whose stat tuple changed.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Stat-first change detection (no content reads for unchanged files)
+- Racy-timestamp protection for files modified around save time
+- Atomic persistence (temp file + rename)
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .journal import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+# Files modified this close to the last save are always rehashed, since
+# coarse filesystem timestamps cannot distinguish edits inside the window.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class StatCache:
+    """
+    Persistent stat index for tracked files.
+
+    Entries map a relative path to ``[size, mtime_ns, inode, hash]``.
+    """
+
+    def __init__(self, cache_file: Path):
+        """
+        Initialize stat cache.
+
+        Args:
+            cache_file: JSON file holding the persisted index
+        """
+        self.cache_file = Path(cache_file)
+        self.entries: Dict[str, list] = {}
+        self.saved_at_ns = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Load persisted entries"""
+        if not self.cache_file.exists():
+            return
+
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            self.entries = data.get("entries", {})
+            self.saved_at_ns = data.get("saved_at_ns", 0)
+        except Exception as e:
+            logger.warning(f"Error loading stat cache, starting fresh: {e}")
+            self.entries = {}
+            self.saved_at_ns = 0
+
+    def lookup(self, path: str, st: os.stat_result) -> Optional[str]:
+        """
+        Get cached hash if the file's stat tuple is unchanged.
+
+        Args:
+            path: Relative file path
+            st: Current stat result for the file
+
+        Returns:
+            Cached content hash, or None if the file must be rehashed
+        """
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+
+        size, mtime_ns, inode, blob_hash = entry
+        if size != st.st_size or mtime_ns != st.st_mtime_ns or inode != st.st_ino:
+            return None
+
+        # Racy entry: modified too close to the last save to be trusted.
+        # Mark dirty so the next save moves the window past it.
+        if mtime_ns >= self.saved_at_ns - RACY_WINDOW_NS:
+            self._dirty = True
+            return None
+
+        return blob_hash
+
+    def update(self, path: str, st: os.stat_result, blob_hash: str):
+        """Record the stat tuple and hash of a file"""
+        entry = [st.st_size, st.st_mtime_ns, st.st_ino, blob_hash]
+        if self.entries.get(path) != entry:
+            self.entries[path] = entry
+            self._dirty = True
+
+    def retain(self, paths: Iterable[str]):
+        """Drop entries for files no longer tracked"""
+        keep = set(paths)
+        stale = [path for path in self.entries if path not in keep]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self._dirty = True
+
+    def save(self):
+        """Persist entries atomically"""
+        if not self._dirty:
+            return
+
+        saved_at_ns = time.time_ns()
+        data = {
+            "version": 1,
+            "saved_at_ns": saved_at_ns,
+            "entries": self.entries
+        }
+
+        try:
+            # A lost cache only costs rehashing, so skip fsync
+            atomic_write_json(self.cache_file, data, fsync=False)
+            self.saved_at_ns = saved_at_ns
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Error saving stat cache: {e}")
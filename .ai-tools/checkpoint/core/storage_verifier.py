@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Storage Verifier for Advanced Checkpoint System
+
+Scrubs checkpoint storage: checks that every checkpoint's metadata and
+manifest are readable and that every referenced blob exists and still
+matches its content hash, so corruption is found before a rollback needs
+the data.
+
+Part of Framework v3.7.0 - Advanced Checkpoint System
+
+Features:
+- Parallel blob hashing on a thread pool (hashing and decompression release the GIL)
+- Incremental passes: verified checkpoints and blobs are journaled and not rehashed
+- Resumes an interrupted pass from the journal
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from .file_lock import FileLock
+from .journal import AppendOnlyJournal
+
+logger = logging.getLogger(__name__)
+
+# Verified blobs are journaled in batches of this size
+JOURNAL_BATCH_SIZE = 500
+
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+@dataclass
+class VerificationReport:
+    """Result of a storage verification pass"""
+    checkpoints_checked: int = 0
+    checkpoints_skipped: int = 0
+    blobs_checked: int = 0
+    blobs_skipped: int = 0
+    missing_metadata: List[str] = field(default_factory=list)
+    missing_manifests: List[str] = field(default_factory=list)
+    corrupted_checkpoints: List[str] = field(default_factory=list)
+    missing_blobs: List[str] = field(default_factory=list)
+    corrupted_blobs: List[str] = field(default_factory=list)
+    affected_checkpoints: List[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if no problems were found"""
+        return not (
+            self.missing_metadata or self.missing_manifests or self.corrupted_checkpoints
+            or self.missing_blobs or self.corrupted_blobs
+        )
+
+
+class StorageVerifier:
+    """
+    Integrity scrubber for checkpoint storage.
+
+    Checkpoint files and blobs are immutable, so once verified they are only
+    hashed again by a full pass or when a blob's object file changes (for
+    example after recompression). Every pass still checks that all blobs
+    referenced by any checkpoint exist.
+    """
+
+    def __init__(self, checkpoint_engine):
+        """
+        Initialize storage verifier.
+
+        Args:
+            checkpoint_engine: CheckpointEngine instance
+        """
+        self.checkpoint_engine = checkpoint_engine
+        self.journal = AppendOnlyJournal(checkpoint_engine.storage_base / "verified.journal")
+        # One verification pass at a time across processes (they share the journal)
+        self._lock = FileLock(checkpoint_engine.storage_base / ".verify.lock")
+
+    def _load_verified(self) -> Tuple[Set[str], Dict[str, list]]:
+        """Replay the journal into verified checkpoint IDs and blob identities"""
+        checkpoints: Set[str] = set()
+        blobs: Dict[str, list] = {}
+        for record in self.journal.replay():
+            checkpoints.update(record.get("checkpoints", []))
+            blobs.update(record.get("blobs", {}))
+        return checkpoints, blobs
+
+    def run(self, full: bool = False, workers: Optional[int] = None) -> VerificationReport:
+        """
+        Run a verification pass.
+
+        Args:
+            full: Re-verify everything instead of only new checkpoints and blobs
+            workers: Hashing threads (default: one per CPU)
+
+        Returns:
+            VerificationReport
+        """
+        with self._lock.exclusive():
+            return self._run(full, workers)
+
+    def _run(self, full: bool, workers: Optional[int]) -> VerificationReport:
+        engine = self.checkpoint_engine
+        report = VerificationReport()
+        start = time.time()
+
+        if full:
+            self.journal.truncate()
+        verified_checkpoints, verified_blobs = self._load_verified()
+
+        # Blobs must not be swept while they are being checked
+        with engine._gc_lock.shared():
+            engine.refresh_index()
+            checkpoint_ids = list(engine.checkpoint_index["checkpoints"])
+
+            # blob hash -> checkpoints referencing it
+            references: Dict[str, List[str]] = {}
+            git_references: Dict[str, List[str]] = {}
+            newly_verified = []
+            for checkpoint_id in checkpoint_ids:
+                if checkpoint_id in verified_checkpoints:
+                    # Its blobs may have been deleted since, so they are still checked for existence
+                    report.checkpoints_skipped += 1
+                    manifest = engine._load_manifest(checkpoint_id) or {}
+                    self._add_references(checkpoint_id, manifest, references, git_references)
+                    continue
+                report.checkpoints_checked += 1
+                manifest = self._verify_checkpoint_files(checkpoint_id, report)
+                if manifest is None:
+                    continue
+                self._add_references(checkpoint_id, manifest, references, git_references)
+                newly_verified.append(checkpoint_id)
+
+            objects = {
+                blob_hash: [suffix, size, mtime]
+                for blob_hash, suffix, size, mtime in engine.blob_store.iter_object_files()
+            }
+
+            # Every referenced blob must exist; only new or changed objects are hashed again
+            to_hash = []
+            for blob_hash in references:
+                if blob_hash not in objects:
+                    report.missing_blobs.append(blob_hash)
+                elif not full and verified_blobs.get(blob_hash) == objects[blob_hash]:
+                    report.blobs_skipped += 1
+                else:
+                    to_hash.append(blob_hash)
+
+            self._hash_blobs(to_hash, objects, workers, report)
+
+            if git_references:
+                missing = engine.git_backend.missing_objects(git_references)
+                report.missing_blobs.extend(sorted(missing))
+                references.update({oid: git_references[oid] for oid in missing})
+
+        bad_blobs = set(report.missing_blobs) | set(report.corrupted_blobs)
+        affected = {checkpoint_id for blob_hash in bad_blobs for checkpoint_id in references.get(blob_hash, [])}
+        report.affected_checkpoints = sorted(affected)
+
+        # Checkpoints with damaged blobs are checked again next time
+        good = [checkpoint_id for checkpoint_id in newly_verified if checkpoint_id not in affected]
+        if good:
+            self.journal.append({"checkpoints": good})
+
+        self._compact_journal(set(checkpoint_ids), objects)
+
+        report.missing_blobs.sort()
+        report.corrupted_blobs.sort()
+        report.duration_seconds = time.time() - start
+
+        if report.ok:
+            logger.info(
+                f"Checkpoint storage verified: {report.checkpoints_checked} checkpoints, "
+                f"{report.blobs_checked} blobs checked ({report.blobs_skipped} already verified)"
+            )
+        else:
+            logger.error(
+                f"Checkpoint storage verification found problems: {len(report.missing_blobs)} missing and "
+                f"{len(report.corrupted_blobs)} corrupted blobs, "
+                f"{len(report.missing_metadata) + len(report.missing_manifests) + len(report.corrupted_checkpoints)} "
+                f"damaged checkpoints, {len(report.affected_checkpoints)} checkpoints affected"
+            )
+
+        return report
+
+    def _add_references(self, checkpoint_id: str, manifest: Dict, references: Dict[str, List[str]],
+                        git_references: Dict[str, List[str]]):
+        """Record the blobs (and git objects) a checkpoint's manifest references"""
+        for blob_hash in self.checkpoint_engine._manifest_blob_hashes(manifest):
+            references.setdefault(blob_hash, []).append(checkpoint_id)
+        for entry in manifest.get("files", {}).values():
+            if "git" in entry:
+                git_references.setdefault(entry["git"], []).append(checkpoint_id)
+
+    def _verify_checkpoint_files(self, checkpoint_id: str, report: VerificationReport) -> Optional[Dict]:
+        """
+        Check a checkpoint's metadata and manifest.
+
+        Returns:
+            The parsed manifest ({} for checkpoints without files), or None if damaged
+        """
+        engine = self.checkpoint_engine
+
+        metadata_bytes = engine._read_metadata_bytes(checkpoint_id)
+        if metadata_bytes is None:
+            report.missing_metadata.append(checkpoint_id)
+            return None
+        try:
+            metadata = json.loads(metadata_bytes)
+        except ValueError:
+            report.corrupted_checkpoints.append(checkpoint_id)
+            return None
+
+        manifest_bytes = engine._read_storage_file(f"checkpoints/{checkpoint_id}.dat.gz")
+        if manifest_bytes is None:
+            if metadata.get("files_count"):
+                report.missing_manifests.append(checkpoint_id)
+                return None
+            return {}
+        try:
+            return json.loads(gzip.decompress(manifest_bytes))
+        except Exception:
+            report.corrupted_checkpoints.append(checkpoint_id)
+            return None
+
+    def _hash_blobs(self, blob_hashes: List[str], objects: Dict[str, list], workers: Optional[int],
+                    report: VerificationReport):
+        """Hash blobs in parallel and journal the verified ones in batches"""
+        if not blob_hashes:
+            return
+
+        batch = {}
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 4) as executor:
+            for blob_hash, intact in zip(blob_hashes, executor.map(self._blob_intact, blob_hashes)):
+                report.blobs_checked += 1
+                if intact is None:
+                    report.missing_blobs.append(blob_hash)
+                elif not intact:
+                    report.corrupted_blobs.append(blob_hash)
+                else:
+                    batch[blob_hash] = objects[blob_hash]
+                    if len(batch) >= JOURNAL_BATCH_SIZE:
+                        # An interrupted pass resumes after the last batch
+                        self.journal.append({"blobs": batch}, sync=False)
+                        batch = {}
+
+        if batch:
+            self.journal.append({"blobs": batch})
+
+    def _blob_intact(self, blob_hash: str) -> Optional[bool]:
+        """
+        Check a blob's content against its hash.
+
+        Returns:
+            True if intact, False if corrupted, None if missing
+        """
+        digest = hashlib.sha256()
+        try:
+            with self.checkpoint_engine.blob_store.open_blob(blob_hash) as f:
+                for block in iter(lambda: f.read(READ_BLOCK_SIZE), b""):
+                    digest.update(block)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Blob {blob_hash} unreadable: {e}")
+            return False
+        return digest.hexdigest() == blob_hash
+
+    def _compact_journal(self, live_checkpoints: Set[str], objects: Dict[str, list]):
+        """Rewrite the journal once most of its records are stale"""
+        checkpoints, blobs = self._load_verified()
+        live_blobs = {blob_hash: identity for blob_hash, identity in blobs.items() if objects.get(blob_hash) == identity}
+        live = checkpoints & live_checkpoints
+        if self.journal.entry_count <= 1 or len(live) + len(live_blobs) >= (len(checkpoints) + len(blobs)) // 2:
+            return
+
+        self.journal.truncate()
+        self.journal.append({"checkpoints": sorted(live), "blobs": live_blobs})
@@ -0,0 +1,46 @@
+"""
+Shared fixtures for the Advanced Checkpoint System tests.
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+# The checkpoint package lives in .ai-tools/, which is not an installed package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from checkpoint import CheckpointEngine  # noqa: E402
+
+logging.disable(logging.INFO)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Empty project directory"""
+    root = tmp_path / "project"
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def make_engine(tmp_path, project):
+    """Create an engine on the test project with storage outside of it"""
+    engines = []
+
+    def factory(storage=None, **config):
+        config_data = {"enabled": True, **config}
+        config_data["storage"] = {"base_path": str(tmp_path / "storage"), **(storage or {})}
+        config_path = tmp_path / f"checkpoint-config-{len(engines)}.json"
+        config_path.write_text(json.dumps(config_data))
+        engine = CheckpointEngine(config_path=str(config_path), framework_root=project)
+        engines.append(engine)
+        return engine
+
+    yield factory
+
+    for engine in engines:
+        engine.flush(timeout=10)
+        engine.retention_gc.wait(timeout=10)
@@ -0,0 +1,18 @@
+"""
+Tests for blob storage.
+"""
+
+from checkpoint import CheckpointLevel
+
+
+def test_empty_file_with_chunking_for_every_size(make_engine, project):
+    engine = make_engine(storage={"chunking_threshold_mb": 0})
+    (project / "__init__.py").write_bytes(b"")
+    (project / "main.py").write_text("print('hello')\n")
+
+    checkpoint_id = engine.create_checkpoint(level=CheckpointLevel.MANUAL, label="empty file")
+    (project / "__init__.py").write_text("changed\n")
+
+    result = engine.rollback_to_checkpoint(checkpoint_id, create_rollback_checkpoint=False)
+    assert result.success
+    assert (project / "__init__.py").read_bytes() == b""
@@ -0,0 +1,18 @@
+"""
+Tests for checkpoint index lookups.
+"""
+
+from checkpoint import CheckpointCategory, CheckpointLevel
+
+
+def test_find_checkpoint_by_category_returns_most_recent(make_engine, project):
+    engine = make_engine()
+    checkpoint_ids = []
+    for step in range(3):
+        (project / "main.py").write_text(f"value = {step}\n")
+        checkpoint_ids.append(engine.create_checkpoint(level=CheckpointLevel.MANUAL, label=f"step {step}"))
+
+    category = CheckpointCategory(engine.get_checkpoint_metadata(checkpoint_ids[-1]).category)
+    assert {engine.get_checkpoint_metadata(cp_id).category for cp_id in checkpoint_ids} == {category.value}
+
+    assert engine.find_checkpoint_by_category(category) == checkpoint_ids[-1]
@@ -0,0 +1,32 @@
+"""
+Tests for the agent file conflict index.
+"""
+
+from checkpoint.core.conflict_index import FileConflictIndex
+
+
+def test_sibling_files_are_a_directory_overlap():
+    index = FileConflictIndex()
+    index.add("backend-engineer", ["src/api/x.py"])
+
+    overlaps = index.find_overlaps("frontend-engineer", ["src/api/y.py"])
+
+    assert overlaps["files"] == {}
+    assert overlaps["directories"] == {"backend-engineer": {"src/api/y.py"}}
+
+
+def test_same_file_is_not_also_a_sibling_overlap():
+    index = FileConflictIndex()
+    index.add("backend-engineer", ["src/api/x.py"])
+
+    overlaps = index.find_overlaps("frontend-engineer", ["src/api/x.py", "src/web/app.py", "README.md"])
+
+    assert overlaps["files"] == {"backend-engineer": {"src/api/x.py"}}
+    assert overlaps["directories"] == {}
+
+
+def test_root_level_files_do_not_overlap():
+    index = FileConflictIndex()
+    index.add("backend-engineer", ["setup.py"])
+
+    assert index.find_overlaps("frontend-engineer", ["README.md"]) == {"files": {}, "directories": {}}
@@ -0,0 +1,44 @@
+"""
+Tests for the in-memory tier of recent checkpoint contents.
+"""
+
+from checkpoint import CheckpointLevel
+from checkpoint.core.memory_tier import MemoryTier
+
+
+def test_new_checkpoint_is_never_demoted_to_make_room():
+    tier = MemoryTier(max_bytes=8000, max_checkpoints=5)
+    tier.add_checkpoint("old", {"a": b"a" * 900})
+    tier.add_checkpoint("new", {f"h{i}": bytes([i]) * 900 for i in range(20)})
+
+    assert list(tier.checkpoints) == ["new"]
+    assert 0 < tier.total_bytes <= tier.max_bytes
+
+
+def test_capture_promotes_changed_files_within_budget(make_engine, project):
+    engine = make_engine(storage={"memory_tier_mb": 0.01, "memory_tier_min_available_mb": 0})
+    tier = engine.memory_tier
+    contents = {f"file_{i}.txt": bytes([65 + i]) * 1000 for i in range(20)}
+    for name, data in contents.items():
+        (project / name).write_bytes(data)
+
+    checkpoint_id = engine.create_checkpoint(level=CheckpointLevel.MANUAL, label="many files")
+
+    # 20 KB changed against a 10 KB tier: the checkpoint keeps what fits
+    assert list(tier.checkpoints) == [checkpoint_id]
+    assert 0 < tier.total_bytes <= tier.max_bytes
+    held = {data for data in contents.values() if tier.get(engine.blob_store.hash_bytes(data)) == data}
+    assert len(held) == len(tier.checkpoints[checkpoint_id])
+
+
+def test_capture_with_tier_disabled_handles_empty_files(make_engine, project):
+    engine = make_engine(storage={"memory_tier_mb": 0})
+    (project / "pkg").mkdir()
+    (project / "pkg" / "__init__.py").write_bytes(b"")
+    (project / "pkg" / "main.py").write_text("print('hello')\n")
+
+    checkpoint_id = engine.create_checkpoint(level=CheckpointLevel.MANUAL, label="empty file")
+
+    assert checkpoint_id is not None
+    assert engine._load_manifest(checkpoint_id)["files"]["pkg/__init__.py"]["size"] == 0
+    assert not engine.memory_tier.checkpoints
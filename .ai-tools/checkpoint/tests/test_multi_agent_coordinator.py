@@ -0,0 +1,33 @@
+"""
+Tests for multi-agent conflict handling.
+"""
+
+import pytest
+
+from checkpoint import MultiAgentCoordinator
+
+
+def _coordinator(engine, strategy):
+    return MultiAgentCoordinator(engine, {
+        "state_save_debounce_seconds": 0,
+        "conflict_detection": {"conflict_resolution": strategy}
+    })
+
+
+@pytest.mark.parametrize("strategy", ["abort", "manual"])
+def test_sibling_files_do_not_block_an_agent(make_engine, project, strategy):
+    coordinator = _coordinator(make_engine(), strategy)
+    coordinator.post_agent_execution_checkpoint("backend-engineer", modified_files=["src/api/x.py"])
+    coordinator.post_agent_execution_checkpoint("frontend-engineer", modified_files=["src/api/y.py"])
+
+    assert coordinator.pre_agent_execution_checkpoint("frontend-engineer") is not None
+    assert [conflict.conflict_type for conflict in coordinator.detected_conflicts] == ["directory_overlap"]
+
+
+@pytest.mark.parametrize("strategy", ["abort", "manual"])
+def test_same_file_still_blocks_an_agent(make_engine, project, strategy):
+    coordinator = _coordinator(make_engine(), strategy)
+    coordinator.post_agent_execution_checkpoint("backend-engineer", modified_files=["src/api/x.py"])
+    coordinator.post_agent_execution_checkpoint("frontend-engineer", modified_files=["src/api/x.py"])
+
+    assert coordinator.pre_agent_execution_checkpoint("frontend-engineer") is None
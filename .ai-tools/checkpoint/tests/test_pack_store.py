@@ -0,0 +1,62 @@
+"""
+Tests for packed checkpoint files.
+"""
+
+from checkpoint import CheckpointEngine, CheckpointLevel
+from checkpoint.core.pack_store import PackStore
+
+
+def _packed_engine(make_engine, project, count=3):
+    engine = make_engine(storage={"pack_after_hours": 0, "pack_min_checkpoints": 1, "background_gc": False})
+    checkpoint_ids = []
+    for step in range(count):
+        (project / "module.py").write_text(f"value = {step}\n")
+        checkpoint_ids.append(engine.create_checkpoint(level=CheckpointLevel.MANUAL, label=f"step {step}"))
+    engine.retention_gc.pack()
+    assert f"metadata/{checkpoint_ids[0]}.json" in engine.pack_store
+    return engine, checkpoint_ids
+
+
+def test_deleted_packed_checkpoint_stays_deleted(make_engine, project):
+    engine, checkpoint_ids = _packed_engine(make_engine, project)
+    deleted = checkpoint_ids[0]
+
+    engine._delete_checkpoint(deleted)
+
+    assert engine.get_checkpoint_metadata(deleted) is None
+    assert not engine.rollback_to_checkpoint(deleted, dry_run=True).success
+    assert engine.pack_store.read(f"metadata/{deleted}.json") is None
+
+    # A full reload (another process, or a new one) must not resurrect it
+    engine.pack_store._load_indexes()
+    assert engine.pack_store.read(f"checkpoints/{deleted}.dat.gz") is None
+    reopened = PackStore(engine.pack_store.packs_dir)
+    assert reopened.read(f"metadata/{deleted}.json") is None
+    assert reopened.read(f"metadata/{checkpoint_ids[1]}.json") is not None
+
+    fresh = CheckpointEngine(config_path=engine.config_path, framework_root=project)
+    assert fresh.get_checkpoint_metadata(deleted) is None
+    assert fresh.get_checkpoint_metadata(checkpoint_ids[1]) is not None
+
+
+def test_repack_drops_tombstones(make_engine, project):
+    engine, checkpoint_ids = _packed_engine(make_engine, project)
+    engine._delete_checkpoints(checkpoint_ids)
+    assert engine.pack_store.tombstones
+
+    engine.retention_gc.pack()
+
+    assert not engine.pack_store.list_packs()
+    assert not engine.pack_store.tombstones
+    assert PackStore(engine.pack_store.packs_dir).tombstones == set()
+
+
+def test_miss_does_not_reload_unchanged_packs(make_engine, project, monkeypatch):
+    engine, _ = _packed_engine(make_engine, project)
+    engine.pack_store.read("metadata/missing.json")
+
+    reloads = []
+    monkeypatch.setattr(engine.pack_store, "_load_indexes", lambda: reloads.append(1))
+    for _ in range(10):
+        assert engine.pack_store.read("metadata/missing.json") is None
+    assert not reloads
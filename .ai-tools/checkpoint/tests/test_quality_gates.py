@@ -0,0 +1,115 @@
+"""
+Tests for quality gate result caching and incremental file checks.
+"""
+
+import subprocess
+
+from checkpoint.core.quality_gates_integration import QualityGatesIntegration, QualityGateType
+
+
+def _git(project, *args):
+    subprocess.run(["git", *args], cwd=project, check=True, capture_output=True)
+
+
+def _git_project(project):
+    _git(project, "init", "-q")
+    _git(project, "config", "user.email", "dev@example.com")
+    _git(project, "config", "user.name", "dev")
+    (project / "main.py").write_text("print('hello')\n")
+    _git(project, "add", "main.py")
+    _git(project, "commit", "-q", "-m", "initial")
+
+
+def _gates(engine):
+    return QualityGatesIntegration(engine, {"auto_checkpoint_before_gates": False})
+
+
+def test_cached_pass_is_invalidated_by_staging_and_commits(make_engine, project):
+    _git_project(project)
+    (project / "notes.txt").write_text("todo\n")
+    gates = _gates(make_engine())
+
+    assert not gates.execute_quality_gate(QualityGateType.PRE_COMMIT, "true").cached
+    assert gates.execute_quality_gate(QualityGateType.PRE_COMMIT, "true").cached
+
+    # Same working tree, different index
+    _git(project, "add", "notes.txt")
+    assert not gates.execute_quality_gate(QualityGateType.PRE_COMMIT, "true").cached
+
+    # Same working tree and index, different HEAD
+    _git(project, "commit", "-q", "-m", "notes")
+    assert not gates.execute_quality_gate(QualityGateType.PRE_COMMIT, "true").cached
+    assert gates.execute_quality_gate(QualityGateType.PRE_COMMIT, "true").cached
+
+
+def test_results_are_not_cached_outside_git(make_engine, project):
+    (project / "main.py").write_text("print('hello')\n")
+    gates = _gates(make_engine())
+
+    assert not gates.execute_quality_gate(QualityGateType.PRE_COMMIT, "true").cached
+    assert not gates.execute_quality_gate(QualityGateType.PRE_COMMIT, "true").cached
+
+
+def test_changed_files_skip_storage_and_excluded_paths(make_engine, project):
+    _git_project(project)
+    engine = make_engine(storage={"base_path": "checkpoint-storage", "exclude_patterns": ["*.log"]})
+    (project / "main.py").write_text("print('changed')\n")
+    (project / "debug.log").write_text("noise\n")
+    engine.create_checkpoint(description="storage is written inside the project")
+
+    changed = _gates(engine)._changed_files(QualityGateType.PRE_PUSH, "HEAD")
+
+    assert changed == ["main.py"]
+
+
+def test_file_edited_during_gate_is_checked_again(make_engine, project):
+    _git_project(project)
+    gates = _gates(make_engine())
+    (project / "main.py").write_text("print('changed')\n")
+    command = "echo '# edited by the check' >> {files}"
+
+    assert gates.execute_quality_gate(QualityGateType.PRE_PUSH, command).success
+
+    expanded = gates._expand_file_commands(QualityGateType.PRE_PUSH, [gates._gate_command(command)])
+    assert [gate_command.files for gate_command in expanded] == [["main.py"]]
+
+
+def test_committed_files_are_checked_without_a_baseline(make_engine, project):
+    _git_project(project)
+    (project / "bad.py").write_text("BAD = True\n")
+    _git(project, "add", "bad.py")
+    _git(project, "commit", "-q", "-m", "bad")
+    gates = _gates(make_engine())
+    command = "! grep -l BAD {files}"
+
+    assert not gates.execute_quality_gate(QualityGateType.PRE_PUSH, command).success
+    assert not gates.execute_quality_gate(QualityGateType.PRE_PUSH, command, force=True).success
+
+
+def test_files_committed_since_last_pass_are_checked(make_engine, project):
+    _git_project(project)
+    gates = _gates(make_engine())
+    command = "! grep -l BAD {files}"
+
+    assert gates.execute_quality_gate(QualityGateType.PRE_DEPLOY, command).success
+
+    (project / "bad.py").write_text("BAD = True\n")
+    _git(project, "add", "bad.py")
+    _git(project, "commit", "-q", "-m", "bad")
+
+    assert not gates.execute_quality_gate(QualityGateType.PRE_DEPLOY, command).success
+
+
+def test_forced_run_never_skips_a_file_command(make_engine, project):
+    _git_project(project)
+    marker = project.parent / "ran"
+    gates = QualityGatesIntegration(make_engine(), {
+        "auto_checkpoint_before_gates": False,
+        "gate_commands": {"pre-deploy": [{"command": f"touch {marker} {{files}}", "files": "*.rs"}]}
+    })
+
+    # No matching file: skipped normally, run anyway when forced
+    assert gates.execute_quality_gate(QualityGateType.PRE_DEPLOY).success
+    assert not marker.exists()
+    assert gates.execute_quality_gate(QualityGateType.PRE_DEPLOY, force=True).success
+    assert marker.exists()
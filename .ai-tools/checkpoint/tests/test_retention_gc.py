@@ -0,0 +1,69 @@
+"""
+Tests for retention GC scheduling.
+"""
+
+import os
+
+from checkpoint import CheckpointLevel
+
+
+def test_inline_gc_does_not_deadlock_the_writer(make_engine, project):
+    """Inline GC must not sweep on the writer thread while queued checkpoints hold the GC lock"""
+    engine = make_engine(
+        storage={"background_gc": False, "gc_grace_seconds": 0},
+        checkpointLevels={"agent_execution": {"retention_count": 1}}
+    )
+
+    handles = []
+    for step in range(4):
+        (project / "module.py").write_text(f"value = {step}\n" * 100)
+        handles.append(engine.create_checkpoint_async(
+            level=CheckpointLevel.AGENT_EXECUTION,
+            label=f"step {step}",
+            agent_type="backend-engineer"
+        ))
+
+    assert engine.flush(timeout=30)
+    engine.retention_gc.wait(timeout=30)
+    assert all(handle.result(timeout=1) for handle in handles)
+    assert len(engine.checkpoint_index["checkpoints"]) == 1
+
+
+def test_max_checkpoint_size_mb_is_the_storage_quota(make_engine, project):
+    engine = make_engine(storage={"background_gc": False, "gc_grace_seconds": 0, "max_checkpoint_size_mb": 0.05})
+
+    checkpoint_ids = []
+    for step in range(4):
+        # Incompressible, so every checkpoint adds ~20 KB of blobs
+        (project / "data.bin").write_bytes(os.urandom(20 * 1024))
+        checkpoint_ids.append(engine.create_checkpoint(level=CheckpointLevel.MANUAL, label=f"step {step}"))
+
+    engine.run_retention_gc()
+
+    remaining = set(engine.checkpoint_index["checkpoints"])
+    assert checkpoint_ids[-1] in remaining
+    assert len(remaining) < len(checkpoint_ids)
+
+
+def test_cold_dictionary_is_retrained_as_the_project_grows(make_engine, project):
+    engine = make_engine(storage={"recompress_after_hours": 0, "dictionary_retrain_growth": 0.5})
+    header = "".join(f"# shared license header line {line}\n" for line in range(20))
+    for i in range(4):
+        (project / f"module_{i}.py").write_text(f"{header}value = {i}\n")
+    first_checkpoint = engine.create_checkpoint(level=CheckpointLevel.MANUAL, label="small project")
+
+    assert engine.retention_gc.recompress()["blobs_recompressed"] > 0
+    first_dictionary = engine.retention_gc._current_dictionary()
+
+    imports = "".join(f"from project.shared import helper_{line}\n" for line in range(20))
+    for i in range(4, 12):
+        (project / f"module_{i}.py").write_text(f"{header}{imports}value = {i}\n")
+    engine.create_checkpoint(level=CheckpointLevel.MANUAL, label="grown project")
+
+    assert engine.retention_gc.recompress()["blobs_recompressed"] > 0
+    assert engine.retention_gc._current_dictionary() != first_dictionary
+
+    # Blobs compressed with the old dictionary stay readable
+    manifest = engine._load_manifest(first_checkpoint)
+    with engine._open_manifest_entry(manifest["files"]["module_0.py"]) as f:
+        assert f.read() == (project / "module_0.py").read_bytes()
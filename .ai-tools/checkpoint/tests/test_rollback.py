@@ -0,0 +1,30 @@
+"""
+Tests for rollback file restoration.
+"""
+
+from checkpoint import CheckpointLevel
+
+
+def test_large_files_are_snapshotted_and_restored(make_engine, project):
+    """max_checkpoint_size_mb is a storage quota, never a reason to leave files out of a checkpoint"""
+    engine = make_engine(
+        storage={"max_checkpoint_size_mb": 0.001},
+        rollbackPolicies={"delete_files_not_in_checkpoint": True, "validate_before_rollback": False}
+    )
+    (project / "main.py").write_text("print('hello')\n")
+    (project / "data.bin").write_bytes(b"\0" * 4096)
+
+    checkpoint_id = engine.create_checkpoint(level=CheckpointLevel.MANUAL, label="before")
+    assert "data.bin" in engine._load_manifest(checkpoint_id)["files"]
+    (project / "data.bin").write_bytes(b"\1" * 4096)
+    (project / "new.py").write_text("added later\n")
+
+    dry_run = engine.rollback_to_checkpoint(checkpoint_id, dry_run=True)
+    assert "data.bin" in dry_run.changed_files
+    assert "new.py" in dry_run.changed_files
+
+    result = engine.rollback_to_checkpoint(checkpoint_id, create_rollback_checkpoint=False)
+    assert result.success
+    assert (project / "data.bin").read_bytes() == b"\0" * 4096
+    assert not (project / "new.py").exists()
+    assert (project / "main.py").read_text() == "print('hello')\n"
@@ -0,0 +1,35 @@
+"""
+Tests for checkpoint storage verification.
+"""
+
+import os
+
+from checkpoint import CheckpointLevel
+
+
+def test_incremental_verify_finds_blob_deleted_after_verification(make_engine, project):
+    engine = make_engine()
+    (project / "main.py").write_text("print('hello')\n")
+    checkpoint_id = engine.create_checkpoint(level=CheckpointLevel.MANUAL, label="before")
+
+    first = engine.verify()
+    assert first.ok and first.checkpoints_checked == 1
+
+    blob_hash = engine._load_manifest(checkpoint_id)["files"]["main.py"]["hash"]
+    engine.blob_store.delete(blob_hash)
+
+    second = engine.verify()
+    assert second.checkpoints_skipped == 1
+    assert second.missing_blobs == [blob_hash]
+    assert second.affected_checkpoints == [checkpoint_id]
+
+
+def test_relative_storage_path_is_relative_to_framework_root(make_engine, project, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = make_engine(storage={"base_path": "checkpoint-storage"})
+
+    assert engine.storage_base == project / "checkpoint-storage"
+    (project / "main.py").write_text("print('hello')\n")
+    engine.create_checkpoint(level=CheckpointLevel.MANUAL, label="before")
+    assert not os.path.exists(tmp_path / "checkpoint-storage")
+    assert engine.verify().ok
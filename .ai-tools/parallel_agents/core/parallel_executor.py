@@ -538,12 +538,12 @@ class ParallelExecutor:
         try:
             from ..checkpoint.core.checkpoint_engine import CheckpointLevel
 
-            checkpoint_id = self.checkpoint_engine.create_checkpoint(
+            checkpoint_id = self.checkpoint_engine.create_checkpoint_async(
                 level=CheckpointLevel.AGENT_EXECUTION,
                 label=label,
                 description=f"Before parallel execution of {len(tasks)} agents: {', '.join(agent_types[:3])}{'...' if len(agent_types) > 3 else ''}",
                 tags=["parallel", "pre-execution"] + agent_types
-            )
+            ).checkpoint_id
 
             logger.info(f"Created pre-execution checkpoint: {checkpoint_id}")
             return checkpoint_id
@@ -562,12 +562,12 @@ class ParallelExecutor:
         try:
             from ..checkpoint.core.checkpoint_engine import CheckpointLevel
 
-            checkpoint_id = self.checkpoint_engine.create_checkpoint(
+            checkpoint_id = self.checkpoint_engine.create_checkpoint_async(
                 level=CheckpointLevel.AGENT_EXECUTION,
                 label=label,
                 description=f"After parallel execution: {result.completed_tasks}/{result.total_tasks} successful",
                 tags=["parallel", "post-execution", "success" if result.success else "partial-failure"]
-            )
+            ).checkpoint_id
 
             logger.info(f"Created post-execution checkpoint: {checkpoint_id}")
             return checkpoint_id
@@ -586,12 +586,12 @@ class ParallelExecutor:
         try:
             from ..checkpoint.core.checkpoint_engine import CheckpointLevel
 
-            checkpoint_id = self.checkpoint_engine.create_checkpoint(
+            checkpoint_id = self.checkpoint_engine.create_checkpoint_async(
                 level=CheckpointLevel.QUALITY_GATE,
                 label=label,
                 description=f"{position.title()} pipeline stage: {stage_name}",
                 tags=["pipeline", "stage", stage_name, position]
-            )
+            ).checkpoint_id
 
             logger.info(f"Created stage checkpoint: {checkpoint_id}")
             return checkpoint_id